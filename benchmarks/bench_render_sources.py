@@ -0,0 +1,102 @@
+#!/usr/bin/env -S uv run python
+"""
+Microbenchmark: render-path reads through SQLAlchemy ORM vs the raw asyncpg fast path.
+
+Requires a migrated DB with bench-bundle@1.0.0 (see benchmarks/seed_for_load.py).
+Example:
+  uv run python benchmarks/bench_render_sources.py
+  ITERATIONS=5000 uv run python benchmarks/bench_render_sources.py
+
+Each iteration does what one render does:
+- bundle:   bundle by (bundle_id, semver) + templates by ids
+            (DbBundleSource/DbTemplateSource vs Pg*)
+- compiled: compiled row by bundle_hash (the path RendererService uses)
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+
+import asyncpg
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from hnh_rest.services.prompts.renderer import ASSEMBLY_ORDER, compute_bundle_hash
+from hnh_rest.services.prompts.sources import (
+    DbBundleSource,
+    DbTemplateSource,
+    PgBundleSource,
+    PgTemplateSource,
+)
+from hnh_rest.services.prompts.sources.pg import init_connection
+from hnh_rest.settings import settings
+
+BUNDLE_ID = os.environ.get("BUNDLE_ID", "bench-bundle")
+SEMVER = os.environ.get("SEMVER", "1.0.0")
+ITERATIONS = int(os.environ.get("ITERATIONS", "2000"))
+
+
+async def timed(name: str, step: Callable[[], Awaitable[None]]) -> None:
+    """Run step ITERATIONS times after a warm-up and print its throughput."""
+    for _ in range(min(100, ITERATIONS)):  # warm up pools and statement caches
+        await step()
+    t0 = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await step()
+    elapsed = time.perf_counter() - t0
+    ops = ITERATIONS / elapsed
+    print(f"{name:<16} {ops:>10.0f} ops/s {1e6 / ops:>10.1f} us/op")
+
+
+async def main() -> int:
+    """Time each read path; returns the process exit code."""
+    engine = create_async_engine(str(settings.db_url), pool_size=1)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    pool = await asyncpg.create_pool(
+        str(settings.db_dsn), min_size=1, max_size=1, init=init_connection
+    )
+    bundle_hash = compute_bundle_hash(BUNDLE_ID, SEMVER)
+
+    async with session_factory() as session:
+        if await DbBundleSource(session).get_bundle(BUNDLE_ID, SEMVER) is None:
+            print(
+                f"Bundle {BUNDLE_ID}@{SEMVER} not found; "
+                "run benchmarks/seed_for_load.py first.",
+                file=sys.stderr,
+            )
+            return 1
+
+    async def orm_bundle() -> None:
+        async with session_factory() as session:
+            bundle = await DbBundleSource(session).get_bundle(BUNDLE_ID, SEMVER)
+            await DbTemplateSource(session).get_templates_by_ids(
+                [getattr(bundle, a) for a in ASSEMBLY_ORDER]
+            )
+
+    async def pg_bundle() -> None:
+        bundle = await PgBundleSource(pool).get_bundle(BUNDLE_ID, SEMVER)
+        await PgTemplateSource(pool).get_templates_by_ids(
+            [getattr(bundle, a) for a in ASSEMBLY_ORDER]
+        )
+
+    async def orm_compiled() -> None:
+        async with session_factory() as session:
+            await DbBundleSource(session).get_compiled(bundle_hash)
+
+    async def pg_compiled() -> None:
+        await PgBundleSource(pool).get_compiled(bundle_hash)
+
+    try:
+        await timed("orm bundle", orm_bundle)
+        await timed("asyncpg bundle", pg_bundle)
+        await timed("orm compiled", orm_compiled)
+        await timed("asyncpg compiled", pg_compiled)
+    finally:
+        await pool.close()
+        await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -5,6 +5,8 @@ from pathlib import Path
 import uvicorn
 from hnh_rest.gunicorn_runner import GunicornApplication
 from hnh_rest.settings import settings
+
+
 def set_multiproc_dir() -> None:
     """
     Sets mutiproc_dir env variable.
@@ -52,11 +54,13 @@ def main() -> None:
             host=settings.host,
             port=settings.port,
             workers=settings.workers_count,
+            preload=settings.gunicorn_preload,
             factory=True,
             accesslog="-",
             loglevel=settings.log_level.value.lower(),
             access_log_format='%r "-" %s "-" %Tf',
         ).run()
 
+
 if __name__ == "__main__":
     main()
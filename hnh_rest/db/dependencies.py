@@ -1,8 +1,12 @@
+import time
 from typing import AsyncGenerator
 
+from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 
+from hnh_rest.settings import settings
+
 
 async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
@@ -18,3 +22,80 @@ async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]
     finally:
         await session.commit()
         await session.close()
+
+
+async def get_db_write_session(
+    request: Request,
+    session: AsyncSession = Depends(get_db_session),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get primary session for registry writes.
+
+    Records the time of the write, so reads in this worker
+    stay on the primary until replicas have caught up.
+
+    :param request: current request.
+    :param session: primary database session.
+    :yield: database session.
+    """
+    try:
+        yield session
+    finally:
+        request.app.state.db_last_write_at = time.monotonic()
+
+
+async def get_db_primary_read_session(
+    request: Request,
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get read-only session on the primary.
+
+    The session is bound to an AUTOCOMMIT engine, so reads
+    send no BEGIN, COMMIT or ROLLBACK. It checks out a
+    connection only on its first query and is closed without
+    commit, so a request that never queries never touches
+    the pool.
+
+    :param request: current request.
+    :yield: database session.
+    """
+    session: AsyncSession = request.app.state.db_read_session_factory()
+
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def get_db_read_session(
+    request: Request,
+    primary: AsyncSession = Depends(get_db_primary_read_session),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get session for read-only work.
+
+    Rotates through replica session factories. Falls back
+    to the read-only primary session when no replicas are
+    configured or a registry write happened within
+    ``db_read_after_write_seconds`` (read-your-writes).
+    Sessions are lazy: nothing is checked out until the
+    first query.
+
+    :param request: current request.
+    :param primary: read-only primary database session.
+    :yield: database session.
+    """
+    replicas = getattr(request.app.state, "db_replica_session_factories", None)
+    last_write_at = getattr(request.app.state, "db_last_write_at", float("-inf"))
+    if (
+        replicas is None
+        or time.monotonic() - last_write_at < settings.db_read_after_write_seconds
+    ):
+        yield primary
+        return
+
+    session: AsyncSession = next(replicas)()
+    try:
+        yield session
+    finally:
+        await session.close()
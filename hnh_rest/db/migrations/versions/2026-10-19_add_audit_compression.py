@@ -0,0 +1,49 @@
+"""optional zstd audit text storage: prompt_audit_dictionary and compressed prompt_audit_content columns
+
+Revision ID: 4e5f6a7b8c9d
+Revises: 3d4e5f6a7b8c
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "4e5f6a7b8c9d"
+down_revision = "3d4e5f6a7b8c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "prompt_audit_dictionary",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.alter_column("prompt_audit_content", "rendered_prompt", nullable=True)
+    op.add_column("prompt_audit_content", sa.Column("rendered_prompt_zstd", sa.LargeBinary(), nullable=True))
+    op.add_column(
+        "prompt_audit_content",
+        sa.Column("dictionary_id", sa.Integer(), sa.ForeignKey("prompt_audit_dictionary.id"), nullable=True),
+    )
+    op.create_check_constraint(
+        "ck_prompt_audit_content_one_form",
+        "prompt_audit_content",
+        "(rendered_prompt IS NULL) <> (rendered_prompt_zstd IS NULL)",
+    )
+    op.create_check_constraint(
+        "ck_prompt_audit_content_dictionary",
+        "prompt_audit_content",
+        "(rendered_prompt_zstd IS NULL) = (dictionary_id IS NULL)",
+    )
+
+
+def downgrade() -> None:
+    # Compressed texts cannot be restored in SQL; downgrade only with compression disabled and no compressed rows.
+    op.drop_constraint("ck_prompt_audit_content_dictionary", "prompt_audit_content", type_="check")
+    op.drop_constraint("ck_prompt_audit_content_one_form", "prompt_audit_content", type_="check")
+    op.drop_column("prompt_audit_content", "dictionary_id")
+    op.drop_column("prompt_audit_content", "rendered_prompt_zstd")
+    op.alter_column("prompt_audit_content", "rendered_prompt", nullable=False)
+    op.drop_table("prompt_audit_dictionary")
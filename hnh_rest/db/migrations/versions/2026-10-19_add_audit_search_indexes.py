@@ -0,0 +1,44 @@
+"""audit search: composite (filter, created_at, id) indexes on prompt_audit replace the single-column hash indexes
+
+Revision ID: 7b8c9d0e1f2a
+Revises: 6a7b8c9d0e1f
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+revision = "7b8c9d0e1f2a"
+down_revision = "6a7b8c9d0e1f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_prompt_audit_bundle_hash_created_at_id", "prompt_audit", ["bundle_hash", "created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_prompt_audit_personality_hash_created_at_id",
+        "prompt_audit",
+        ["personality_hash", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_prompt_audit_versions_created_at_id",
+        "prompt_audit",
+        ["engine_version", "adapter_version", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index("ix_prompt_audit_created_at_id", "prompt_audit", ["created_at", "id"], unique=False)
+    # Leading-column prefixes of the composite indexes.
+    op.drop_index("ix_prompt_audit_personality_hash", table_name="prompt_audit")
+    op.drop_index("ix_prompt_audit_bundle_hash", table_name="prompt_audit")
+
+
+def downgrade() -> None:
+    op.create_index("ix_prompt_audit_bundle_hash", "prompt_audit", ["bundle_hash"], unique=False)
+    op.create_index("ix_prompt_audit_personality_hash", "prompt_audit", ["personality_hash"], unique=False)
+    op.drop_index("ix_prompt_audit_created_at_id", table_name="prompt_audit")
+    op.drop_index("ix_prompt_audit_versions_created_at_id", table_name="prompt_audit")
+    op.drop_index("ix_prompt_audit_personality_hash_created_at_id", table_name="prompt_audit")
+    op.drop_index("ix_prompt_audit_bundle_hash_created_at_id", table_name="prompt_audit")
@@ -0,0 +1,86 @@
+"""deduplicated audit text: prompt_audit_content per (bundle_hash, personality_hash, prompt_checksum), events without text
+
+Revision ID: 3d4e5f6a7b8c
+Revises: 2c3d4e5f6a7b
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import xxhash
+
+revision = "3d4e5f6a7b8c"
+down_revision = "2c3d4e5f6a7b"
+branch_labels = None
+depends_on = None
+
+_BATCH = 1000
+
+
+def _checksum(rendered_prompt: str) -> str:
+    # xxh3_128 of the text, as the application computes it at write time; fixed here for this revision.
+    return xxhash.xxh3_128(rendered_prompt.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    op.create_table(
+        "prompt_audit_content",
+        sa.Column("bundle_hash", sa.String(64), primary_key=True),
+        sa.Column("personality_hash", sa.String(64), primary_key=True),
+        sa.Column("prompt_checksum", sa.String(64), primary_key=True),
+        sa.Column("rendered_prompt", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.add_column("prompt_audit", sa.Column("prompt_checksum", sa.String(64), nullable=True))
+
+    # Every distinct text is kept: a pair audited with different texts (an engine change, inline templates
+    # reusing an id@semver) gets one content row per text, and each event references its own.
+    op.execute("CREATE TEMPORARY TABLE prompt_audit_checksum (rendered_prompt text NOT NULL, prompt_checksum text NOT NULL)")
+    bind = op.get_bind()
+    # Keyset pages rather than a streamed result: a server-side cursor left open on prompt_audit blocks the
+    # ALTER TABLE below. Each page is fetched in full, so no cursor outlives its statement.
+    first = sa.text("SELECT DISTINCT rendered_prompt FROM prompt_audit ORDER BY rendered_prompt LIMIT :n")
+    after = sa.text(
+        "SELECT DISTINCT rendered_prompt FROM prompt_audit WHERE rendered_prompt > :after "
+        "ORDER BY rendered_prompt LIMIT :n"
+    )
+    batch = bind.execute(first, {"n": _BATCH}).scalars().all()
+    while batch:
+        bind.execute(
+            sa.text("INSERT INTO prompt_audit_checksum (rendered_prompt, prompt_checksum) VALUES (:text, :checksum)"),
+            [{"text": text, "checksum": _checksum(text)} for text in batch],
+        )
+        batch = bind.execute(after, {"after": batch[-1], "n": _BATCH}).scalars().all()
+    op.execute(
+        "UPDATE prompt_audit a SET prompt_checksum = t.prompt_checksum FROM prompt_audit_checksum t "
+        "WHERE t.rendered_prompt = a.rendered_prompt"
+    )
+    op.execute("DROP TABLE prompt_audit_checksum")
+    op.execute(
+        "INSERT INTO prompt_audit_content (bundle_hash, personality_hash, prompt_checksum, rendered_prompt, created_at) "
+        "SELECT DISTINCT ON (bundle_hash, personality_hash, prompt_checksum) "
+        "bundle_hash, personality_hash, prompt_checksum, rendered_prompt, created_at "
+        "FROM prompt_audit ORDER BY bundle_hash, personality_hash, prompt_checksum, created_at"
+    )
+    op.alter_column("prompt_audit", "prompt_checksum", nullable=False)
+    op.create_foreign_key(
+        "prompt_audit_content_fkey",
+        "prompt_audit",
+        "prompt_audit_content",
+        ["bundle_hash", "personality_hash", "prompt_checksum"],
+        ["bundle_hash", "personality_hash", "prompt_checksum"],
+    )
+    op.drop_column("prompt_audit", "rendered_prompt")
+
+
+def downgrade() -> None:
+    op.add_column("prompt_audit", sa.Column("rendered_prompt", sa.Text(), nullable=True))
+    op.execute(
+        "UPDATE prompt_audit a SET rendered_prompt = c.rendered_prompt FROM prompt_audit_content c "
+        "WHERE c.bundle_hash = a.bundle_hash AND c.personality_hash = a.personality_hash "
+        "AND c.prompt_checksum = a.prompt_checksum"
+    )
+    op.alter_column("prompt_audit", "rendered_prompt", nullable=False)
+    op.drop_constraint("prompt_audit_content_fkey", "prompt_audit", type_="foreignkey")
+    op.drop_column("prompt_audit", "prompt_checksum")
+    op.drop_table("prompt_audit_content")
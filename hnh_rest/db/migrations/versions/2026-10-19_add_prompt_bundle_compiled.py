@@ -0,0 +1,57 @@
+"""add prompt_bundle_compiled (denormalized render rows) and backfill
+
+Revision ID: c7d8e9f0a1b2
+Revises: b5f6a1b2c3d4
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import xxhash
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision = "c7d8e9f0a1b2"
+down_revision = "b5f6a1b2c3d4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    compiled = op.create_table(
+        "prompt_bundle_compiled",
+        sa.Column("bundle_hash", sa.String(64), primary_key=True),
+        sa.Column("bundle_pk", UUID(as_uuid=True), nullable=False),
+        sa.Column("segments", JSONB, nullable=False),
+        sa.Column("tags", JSONB, nullable=False, server_default=sa.text("'[]'::jsonb")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["bundle_pk"], ["prompt_bundle.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("bundle_pk"),
+    )
+
+    # Backfill existing bundles. The hash must match the renderer: xxh3_128("bundle_id:semver").
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT b.id, b.bundle_id, b.semver, b.tags, "
+            "s.content AS system, p.content AS personality, a.content AS activity, t.content AS task "
+            "FROM prompt_bundle b "
+            "JOIN prompt_template s ON s.id = b.system_template_id "
+            "JOIN prompt_template p ON p.id = b.personality_template_id "
+            "JOIN prompt_template a ON a.id = b.activity_template_id "
+            "JOIN prompt_template t ON t.id = b.task_template_id"
+        )
+    )
+    backfill = [
+        {
+            "bundle_hash": xxhash.xxh3_128(f"{row.bundle_id}:{row.semver}".encode()).hexdigest(),
+            "bundle_pk": row.id,
+            "segments": [row.system, row.personality, row.activity, row.task],
+            "tags": row.tags or [],
+        }
+        for row in rows
+    ]
+    if backfill:
+        op.bulk_insert(compiled, backfill)
+
+
+def downgrade() -> None:
+    op.drop_table("prompt_bundle_compiled")
@@ -0,0 +1,39 @@
+"""add prompt_bundle.bundle_hash (reverse lookup from audit hashes) and backfill
+
+Revision ID: f0a1b2c3d4e5
+Revises: e9f0a1b2c3d4
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import xxhash
+
+revision = "f0a1b2c3d4e5"
+down_revision = "e9f0a1b2c3d4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.add_column("prompt_bundle", sa.Column("bundle_hash", sa.String(64), nullable=True))
+
+    # The hash must match the renderer: xxh3_128("bundle_id:semver").
+    rows = bind.execute(sa.text("SELECT id, bundle_id, semver FROM prompt_bundle")).all()
+    if rows:
+        bind.execute(
+            sa.text("UPDATE prompt_bundle SET bundle_hash = :bundle_hash WHERE id = :id"),
+            [
+                {"id": row.id, "bundle_hash": xxhash.xxh3_128(f"{row.bundle_id}:{row.semver}".encode()).hexdigest()}
+                for row in rows
+            ],
+        )
+
+    op.alter_column("prompt_bundle", "bundle_hash", nullable=False)
+    op.create_index("ix_prompt_bundle_bundle_hash", "prompt_bundle", ["bundle_hash"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_prompt_bundle_bundle_hash", table_name="prompt_bundle")
+    op.drop_column("prompt_bundle", "bundle_hash")
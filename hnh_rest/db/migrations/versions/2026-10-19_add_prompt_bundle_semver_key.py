@@ -0,0 +1,36 @@
+"""add prompt_bundle.semver_key (sortable semver for range/channel resolution) and backfill
+
+Revision ID: 0a1b2c3d4e5f
+Revises: f0a1b2c3d4e5
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from hnh_rest.services.prompts.versions import semver_key
+
+revision = "0a1b2c3d4e5f"
+down_revision = "f0a1b2c3d4e5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.add_column("prompt_bundle", sa.Column("semver_key", sa.String(255), nullable=True))
+
+    rows = bind.execute(sa.text("SELECT id, semver FROM prompt_bundle")).all()
+    if rows:
+        bind.execute(
+            sa.text("UPDATE prompt_bundle SET semver_key = :semver_key WHERE id = :id"),
+            [{"id": row.id, "semver_key": semver_key(row.semver)} for row in rows],
+        )
+
+    op.alter_column("prompt_bundle", "semver_key", nullable=False)
+    op.create_index("ix_prompt_bundle_id_semver_key", "prompt_bundle", ["bundle_id", "semver_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_prompt_bundle_id_semver_key", table_name="prompt_bundle")
+    op.drop_column("prompt_bundle", "semver_key")
@@ -0,0 +1,27 @@
+"""add GIN index on prompt_bundle.tags (jsonb_path_ops) for model-routed version lookups
+
+Revision ID: 1b2c3d4e5f6a
+Revises: 0a1b2c3d4e5f
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+revision = "1b2c3d4e5f6a"
+down_revision = "0a1b2c3d4e5f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_prompt_bundle_tags",
+        "prompt_bundle",
+        ["tags"],
+        postgresql_using="gin",
+        postgresql_ops={"tags": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_prompt_bundle_tags", table_name="prompt_bundle")
@@ -0,0 +1,39 @@
+"""add indexes on prompt_bundle template slots (template usage checks)
+
+Revision ID: d8e9f0a1b2c3
+Revises: c7d8e9f0a1b2
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+revision = "d8e9f0a1b2c3"
+down_revision = "c7d8e9f0a1b2"
+branch_labels = None
+depends_on = None
+
+_SLOTS = ("system_template_id", "personality_template_id", "activity_template_id", "task_template_id")
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; it keeps bundle writes unblocked while indexes build.
+    with op.get_context().autocommit_block():
+        for column in _SLOTS:
+            op.create_index(
+                f"ix_prompt_bundle_{column}",
+                "prompt_bundle",
+                [column],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in _SLOTS:
+            op.drop_index(
+                f"ix_prompt_bundle_{column}",
+                table_name="prompt_bundle",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
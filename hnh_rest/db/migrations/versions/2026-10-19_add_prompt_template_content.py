@@ -0,0 +1,81 @@
+"""content-addressed template storage (prompt_template_content) and compiled plan_hash
+
+Revision ID: e9f0a1b2c3d4
+Revises: d8e9f0a1b2c3
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import xxhash
+
+revision = "e9f0a1b2c3d4"
+down_revision = "d8e9f0a1b2c3"
+branch_labels = None
+depends_on = None
+
+
+def _content_hash(content: str) -> str:
+    # Must match renderer.compute_content_hash.
+    return xxhash.xxh3_128(content.encode()).hexdigest()
+
+
+def _plan_hash(segments: list[str]) -> str:
+    # Must match renderer.compute_plan_hash over the content hashes in assembly order.
+    return xxhash.xxh3_128(":".join(_content_hash(s) for s in segments).encode()).hexdigest()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    blobs = op.create_table(
+        "prompt_template_content",
+        sa.Column("content_hash", sa.String(64), primary_key=True),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.add_column("prompt_template", sa.Column("content_hash", sa.String(64), nullable=True))
+
+    rows = bind.execute(sa.text("SELECT id, content FROM prompt_template")).all()
+    hashes = {row.id: _content_hash(row.content) for row in rows}
+    unique = {hashes[row.id]: row.content for row in rows}
+    if unique:
+        op.bulk_insert(blobs, [{"content_hash": h, "content": c} for h, c in unique.items()])
+        bind.execute(
+            sa.text("UPDATE prompt_template SET content_hash = :content_hash WHERE id = :id"),
+            [{"id": id_, "content_hash": h} for id_, h in hashes.items()],
+        )
+
+    op.alter_column("prompt_template", "content_hash", nullable=False)
+    op.create_foreign_key(
+        "prompt_template_content_hash_fkey",
+        "prompt_template",
+        "prompt_template_content",
+        ["content_hash"],
+        ["content_hash"],
+    )
+    op.create_index("ix_prompt_template_content_hash", "prompt_template", ["content_hash"])
+    op.drop_column("prompt_template", "content")
+
+    op.add_column("prompt_bundle_compiled", sa.Column("plan_hash", sa.String(64), nullable=True))
+    compiled = bind.execute(sa.text("SELECT bundle_hash, segments FROM prompt_bundle_compiled")).all()
+    if compiled:
+        bind.execute(
+            sa.text("UPDATE prompt_bundle_compiled SET plan_hash = :plan_hash WHERE bundle_hash = :bundle_hash"),
+            [{"bundle_hash": row.bundle_hash, "plan_hash": _plan_hash(row.segments)} for row in compiled],
+        )
+    op.alter_column("prompt_bundle_compiled", "plan_hash", nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column("prompt_bundle_compiled", "plan_hash")
+
+    op.add_column("prompt_template", sa.Column("content", sa.Text(), nullable=True))
+    op.execute(
+        "UPDATE prompt_template t SET content = c.content "
+        "FROM prompt_template_content c WHERE c.content_hash = t.content_hash"
+    )
+    op.alter_column("prompt_template", "content", nullable=False)
+    op.drop_index("ix_prompt_template_content_hash", table_name="prompt_template")
+    op.drop_constraint("prompt_template_content_hash_fkey", "prompt_template", type_="foreignkey")
+    op.drop_column("prompt_template", "content_hash")
+    op.drop_table("prompt_template_content")
@@ -0,0 +1,47 @@
+"""reconstructive audit storage: render inputs on prompt_audit_content (checked against prompt_checksum)
+
+Revision ID: 5f6a7b8c9d0e
+Revises: 4e5f6a7b8c9d
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision = "5f6a7b8c9d0e"
+down_revision = "4e5f6a7b8c9d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "prompt_audit_content",
+        sa.Column("bundle_pk", UUID(as_uuid=True), sa.ForeignKey("prompt_bundle.id"), nullable=True),
+    )
+    op.add_column("prompt_audit_content", sa.Column("personality_payload", JSONB, nullable=True))
+    op.drop_constraint("ck_prompt_audit_content_one_form", "prompt_audit_content", type_="check")
+    op.create_check_constraint(
+        "ck_prompt_audit_content_one_form",
+        "prompt_audit_content",
+        "num_nonnulls(rendered_prompt, rendered_prompt_zstd, personality_payload) = 1",
+    )
+    op.create_check_constraint(
+        "ck_prompt_audit_content_inputs",
+        "prompt_audit_content",
+        "(personality_payload IS NULL) = (bundle_pk IS NULL)",
+    )
+
+
+def downgrade() -> None:
+    # Reconstructive rows have no stored text; downgrade only with the mode disabled and no such rows.
+    op.drop_constraint("ck_prompt_audit_content_inputs", "prompt_audit_content", type_="check")
+    op.drop_constraint("ck_prompt_audit_content_one_form", "prompt_audit_content", type_="check")
+    op.create_check_constraint(
+        "ck_prompt_audit_content_one_form",
+        "prompt_audit_content",
+        "(rendered_prompt IS NULL) <> (rendered_prompt_zstd IS NULL)",
+    )
+    op.drop_column("prompt_audit_content", "personality_payload")
+    op.drop_column("prompt_audit_content", "bundle_pk")
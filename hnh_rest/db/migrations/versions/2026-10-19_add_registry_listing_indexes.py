@@ -0,0 +1,42 @@
+"""add covering (created_at, id) indexes for keyset listing of templates and bundles
+
+Revision ID: 2c3d4e5f6a7b
+Revises: 1b2c3d4e5f6a
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+revision = "2c3d4e5f6a7b"
+down_revision = "1b2c3d4e5f6a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_prompt_template_created_at_id",
+        "prompt_template",
+        ["created_at", "id"],
+        postgresql_include=["template_id", "semver", "role"],
+    )
+    op.create_index(
+        "ix_prompt_bundle_created_at_id",
+        "prompt_bundle",
+        ["created_at", "id"],
+        postgresql_include=[
+            "bundle_id",
+            "semver",
+            "bundle_hash",
+            "system_template_id",
+            "personality_template_id",
+            "activity_template_id",
+            "task_template_id",
+            "tags",
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_prompt_bundle_created_at_id", table_name="prompt_bundle")
+    op.drop_index("ix_prompt_template_created_at_id", table_name="prompt_template")
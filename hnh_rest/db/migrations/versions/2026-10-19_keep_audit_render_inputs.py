@@ -0,0 +1,49 @@
+"""audit render inputs kept with stored texts: personality_payload no longer implies the text is omitted
+
+Revision ID: 8c9d0e1f2a3b
+Revises: 7b8c9d0e1f2a
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+revision = "8c9d0e1f2a3b"
+down_revision = "7b8c9d0e1f2a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_constraint("ck_prompt_audit_content_inputs", "prompt_audit_content", type_="check")
+    op.drop_constraint("ck_prompt_audit_content_one_form", "prompt_audit_content", type_="check")
+    op.create_check_constraint(
+        "ck_prompt_audit_content_one_form",
+        "prompt_audit_content",
+        "num_nonnulls(rendered_prompt, rendered_prompt_zstd) = 1 "
+        "OR (num_nonnulls(rendered_prompt, rendered_prompt_zstd) = 0 AND bundle_pk IS NOT NULL)",
+    )
+    op.create_check_constraint(
+        "ck_prompt_audit_content_inputs",
+        "prompt_audit_content",
+        "bundle_pk IS NULL OR personality_payload IS NOT NULL",
+    )
+
+
+def downgrade() -> None:
+    # Render inputs of rows that also store their text are dropped; reconstructive rows keep theirs.
+    op.drop_constraint("ck_prompt_audit_content_inputs", "prompt_audit_content", type_="check")
+    op.drop_constraint("ck_prompt_audit_content_one_form", "prompt_audit_content", type_="check")
+    op.execute(
+        "UPDATE prompt_audit_content SET bundle_pk = NULL, personality_payload = NULL "
+        "WHERE rendered_prompt IS NOT NULL OR rendered_prompt_zstd IS NOT NULL"
+    )
+    op.create_check_constraint(
+        "ck_prompt_audit_content_one_form",
+        "prompt_audit_content",
+        "num_nonnulls(rendered_prompt, rendered_prompt_zstd, personality_payload) = 1",
+    )
+    op.create_check_constraint(
+        "ck_prompt_audit_content_inputs",
+        "prompt_audit_content",
+        "(personality_payload IS NULL) = (bundle_pk IS NULL)",
+    )
@@ -0,0 +1,124 @@
+"""range-partition prompt_audit by created_at, with a DEFAULT partition and a BRIN index on created_at
+
+Revision ID: 6a7b8c9d0e1f
+Revises: 5f6a7b8c9d0e
+Create Date: 2026-10-19
+
+"""
+from datetime import datetime, timezone
+from typing import Any
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "6a7b8c9d0e1f"
+down_revision = "5f6a7b8c9d0e"
+branch_labels = None
+depends_on = None
+
+# Fixed for this revision: monthly partitions, created three months ahead. Partition maintenance takes over from
+# here (hnh_rest.db.partitions, audit_partition_interval) and skips periods these partitions already cover.
+_PARTITIONS_AHEAD = 3
+
+_COLUMNS = "id, bundle_hash, personality_hash, prompt_checksum, engine_version, adapter_version, created_at"
+
+
+def _columns() -> list[sa.Column[Any]]:
+    return [
+        sa.Column("id", UUID(as_uuid=True), nullable=False),
+        sa.Column("bundle_hash", sa.String(64), nullable=False),
+        sa.Column("personality_hash", sa.String(64), nullable=False),
+        sa.Column("prompt_checksum", sa.String(64), nullable=False),
+        sa.Column("engine_version", sa.String(64), nullable=True),
+        sa.Column("adapter_version", sa.String(64), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    ]
+
+
+def _content_fkey() -> sa.ForeignKeyConstraint:
+    return sa.ForeignKeyConstraint(
+        ["bundle_hash", "personality_hash", "prompt_checksum"],
+        [
+            "prompt_audit_content.bundle_hash",
+            "prompt_audit_content.personality_hash",
+            "prompt_audit_content.prompt_checksum",
+        ],
+        name="prompt_audit_content_fkey",
+    )
+
+
+def _create_indexes() -> None:
+    op.create_index("ix_prompt_audit_bundle_hash", "prompt_audit", ["bundle_hash"], unique=False)
+    op.create_index("ix_prompt_audit_personality_hash", "prompt_audit", ["personality_hash"], unique=False)
+
+
+def _month_start(moment: datetime) -> datetime:
+    moment = moment.astimezone(timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def _next_month(start: datetime) -> datetime:
+    return datetime(start.year + start.month // 12, start.month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _create_month_partition(start: datetime) -> None:
+    end = _next_month(start)
+    op.execute(
+        f"CREATE TABLE prompt_audit_p{start:%Y%m} PARTITION OF prompt_audit "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def upgrade() -> None:
+    op.rename_table("prompt_audit", "prompt_audit_unpartitioned")
+    op.execute("ALTER TABLE prompt_audit_unpartitioned RENAME CONSTRAINT prompt_audit_pkey TO prompt_audit_unpartitioned_pkey")
+    op.drop_constraint("prompt_audit_content_fkey", "prompt_audit_unpartitioned", type_="foreignkey")
+    op.drop_index("ix_prompt_audit_personality_hash", table_name="prompt_audit_unpartitioned")
+    op.drop_index("ix_prompt_audit_bundle_hash", table_name="prompt_audit_unpartitioned")
+
+    op.create_table(
+        "prompt_audit",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at", name="prompt_audit_pkey"),
+        _content_fkey(),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    # Partitions for every month with existing rows and the next few, then DEFAULT for anything outside them.
+    now = datetime.now(timezone.utc)
+    first = op.get_bind().scalar(sa.text("SELECT min(created_at) FROM prompt_audit_unpartitioned")) or now
+    last = _month_start(now)
+    for _ in range(_PARTITIONS_AHEAD):
+        last = _next_month(last)
+    start = _month_start(first)
+    while start <= last:
+        _create_month_partition(start)
+        start = _next_month(start)
+    op.execute("CREATE TABLE prompt_audit_default PARTITION OF prompt_audit DEFAULT")
+
+    op.execute(f"INSERT INTO prompt_audit ({_COLUMNS}) SELECT {_COLUMNS} FROM prompt_audit_unpartitioned")
+    op.drop_table("prompt_audit_unpartitioned")
+    _create_indexes()
+    op.create_index(
+        "ix_prompt_audit_created_at_brin", "prompt_audit", ["created_at"], unique=False, postgresql_using="brin"
+    )
+
+
+def downgrade() -> None:
+    op.create_table(
+        "prompt_audit_unpartitioned",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", name="prompt_audit_unpartitioned_pkey"),
+    )
+    op.execute(f"INSERT INTO prompt_audit_unpartitioned ({_COLUMNS}) SELECT {_COLUMNS} FROM prompt_audit")
+    op.drop_table("prompt_audit")  # drops every partition with it
+    op.rename_table("prompt_audit_unpartitioned", "prompt_audit")
+    op.execute("ALTER TABLE prompt_audit RENAME CONSTRAINT prompt_audit_unpartitioned_pkey TO prompt_audit_pkey")
+    op.create_foreign_key(
+        "prompt_audit_content_fkey",
+        "prompt_audit",
+        "prompt_audit_content",
+        ["bundle_hash", "personality_hash", "prompt_checksum"],
+        ["bundle_hash", "personality_hash", "prompt_checksum"],
+    )
+    _create_indexes()
@@ -4,19 +4,89 @@ import uuid
 
 import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
 
 from hnh_rest.db.base import Base
+from hnh_rest.db.models.prompt_audit_content import PromptAuditContent
+from hnh_rest.db.partitions import create_default_partition_sql
 
 
 class PromptAudit(Base):
-    """Immutable audit record: bundle_hash, personality_hash, versions, rendered text."""
+    """
+    Immutable audit event: hashes, versions, time.
+
+    The rendered text lives in a shared row, keyed by its checksum. Range-partitioned by
+    created_at (see hnh_rest.db.partitions); the partition key is part of the primary
+    key.
+    """
 
     __tablename__ = "prompt_audit"
 
     id = sa.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    bundle_hash = sa.Column(sa.String(64), nullable=False, index=True)
-    personality_hash = sa.Column(sa.String(64), nullable=False, index=True)
+    bundle_hash = sa.Column(sa.String(64), nullable=False)
+    personality_hash = sa.Column(sa.String(64), nullable=False)
+    prompt_checksum = sa.Column(sa.String(64), nullable=False)
     engine_version = sa.Column(sa.String(64), nullable=True)
     adapter_version = sa.Column(sa.String(64), nullable=True)
-    rendered_prompt = sa.Column(sa.Text(), nullable=False)
-    created_at = sa.Column(sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False)
+    created_at = sa.Column(
+        sa.DateTime(timezone=True), primary_key=True, server_default=sa.func.now()
+    )
+
+    __table_args__ = (
+        sa.ForeignKeyConstraint(
+            ["bundle_hash", "personality_hash", "prompt_checksum"],
+            [
+                "prompt_audit_content.bundle_hash",
+                "prompt_audit_content.personality_hash",
+                "prompt_audit_content.prompt_checksum",
+            ],
+            name="prompt_audit_content_fkey",
+        ),
+        # Audit search: equality filters, then keyset order (created_at, id) — one index
+        # range scan per page. The hash indexes also serve plain lookups by hash and
+        # "latest by bundle_hash".
+        sa.Index(
+            "ix_prompt_audit_bundle_hash_created_at_id",
+            "bundle_hash",
+            "created_at",
+            "id",
+        ),
+        sa.Index(
+            "ix_prompt_audit_personality_hash_created_at_id",
+            "personality_hash",
+            "created_at",
+            "id",
+        ),
+        sa.Index(
+            "ix_prompt_audit_versions_created_at_id",
+            "engine_version",
+            "adapter_version",
+            "created_at",
+            "id",
+        ),
+        sa.Index("ix_prompt_audit_created_at_id", "created_at", "id"),
+        # Time-range scans read few block ranges: rows arrive in created_at order, so a
+        # BRIN stays tiny.
+        sa.Index(
+            "ix_prompt_audit_created_at_brin", "created_at", postgresql_using="brin"
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    content = relationship(PromptAuditContent, lazy="joined", innerjoin=True)
+
+    @property
+    def rendered_prompt(self) -> str | None:
+        """
+        Rendered text from the shared content row (loaded in the same query).
+
+        None unless stored plain.
+        """
+        return self.content.rendered_prompt
+
+
+# Schemas created from metadata (tests) get the DEFAULT partition, so inserts work
+# before any maintenance run.
+sa.event.listen(
+    PromptAudit.__table__, "after_create", sa.DDL(create_default_partition_sql())
+)
@@ -0,0 +1,60 @@
+"""
+PromptAuditContent model — rendered prompt texts, each stored once.
+
+Texts are keyed by (bundle_hash, personality_hash, prompt_checksum).
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from hnh_rest.db.base import Base
+
+
+class PromptAuditContent(Base):
+    """
+    Rendered text of a (bundle_hash, personality_hash) pair, keyed by its checksum.
+
+    bundle_hash covers only bundle_id:semver, so one pair can render different texts
+    (engine changes, inline templates reusing an id@semver), and each is stored once and
+    referenced by its own events. The text is stored plain (rendered_prompt),
+    zstd-compressed with a versioned dictionary (rendered_prompt_zstd), or not at all
+    when its render inputs rebuild it: personality_payload is kept for replay
+    verification against prompt_checksum, and bundle_pk is set when the registry bundle
+    reproduced the text at write time.
+    """
+
+    __tablename__ = "prompt_audit_content"
+
+    bundle_hash = sa.Column(sa.String(64), primary_key=True)
+    personality_hash = sa.Column(sa.String(64), primary_key=True)
+    # xxh3_128 of the rendered text
+    prompt_checksum = sa.Column(sa.String(64), primary_key=True)
+    rendered_prompt = sa.Column(sa.Text(), nullable=True)
+    rendered_prompt_zstd = sa.Column(sa.LargeBinary(), nullable=True)
+    dictionary_id = sa.Column(
+        sa.Integer, sa.ForeignKey("prompt_audit_dictionary.id"), nullable=True
+    )
+    bundle_pk = sa.Column(
+        UUID(as_uuid=True), sa.ForeignKey("prompt_bundle.id"), nullable=True
+    )
+    personality_payload = sa.Column(JSONB, nullable=True)
+    created_at = sa.Column(
+        sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        sa.CheckConstraint(
+            "num_nonnulls(rendered_prompt, rendered_prompt_zstd) = 1 "
+            "OR (num_nonnulls(rendered_prompt, rendered_prompt_zstd) = 0 "
+            "AND bundle_pk IS NOT NULL)",
+            name="ck_prompt_audit_content_one_form",
+        ),
+        sa.CheckConstraint(
+            "(rendered_prompt_zstd IS NULL) = (dictionary_id IS NULL)",
+            name="ck_prompt_audit_content_dictionary",
+        ),
+        sa.CheckConstraint(
+            "bundle_pk IS NULL OR personality_payload IS NOT NULL",
+            name="ck_prompt_audit_content_inputs",
+        ),
+    )
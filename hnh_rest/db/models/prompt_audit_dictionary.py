@@ -0,0 +1,21 @@
+"""PromptAuditDictionary model — zstd dictionaries for compressed audit texts."""
+
+import sqlalchemy as sa
+
+from hnh_rest.db.base import Base
+
+
+class PromptAuditDictionary(Base):
+    """
+    zstd dictionary built from registry templates.
+
+    immutable, so rows compressed with it stay readable.
+    """
+
+    __tablename__ = "prompt_audit_dictionary"
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    data = sa.Column(sa.LargeBinary(), nullable=False)
+    created_at = sa.Column(
+        sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+    )
@@ -9,20 +9,75 @@ from hnh_rest.db.base import Base
 
 
 class PromptBundle(Base):
-    """Immutable bundle of template references; deterministic assembly order."""
+    """
+    Immutable bundle of template references; deterministic assembly order.
+
+    Each template slot is indexed for usage checks.
+    """
 
     __tablename__ = "prompt_bundle"
 
     id = sa.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     bundle_id = sa.Column(sa.String(255), nullable=False, index=True)
     semver = sa.Column(sa.String(64), nullable=False)
-    system_template_id = sa.Column(UUID(as_uuid=True), sa.ForeignKey("prompt_template.id"), nullable=False)
-    personality_template_id = sa.Column(UUID(as_uuid=True), sa.ForeignKey("prompt_template.id"), nullable=False)
-    activity_template_id = sa.Column(UUID(as_uuid=True), sa.ForeignKey("prompt_template.id"), nullable=False)
-    task_template_id = sa.Column(UUID(as_uuid=True), sa.ForeignKey("prompt_template.id"), nullable=False)
+    # sortable with semver precedence (versions.semver_key)
+    semver_key = sa.Column(sa.String(255), nullable=False)
+    # xxh3_128 of "bundle_id:semver"
+    bundle_hash = sa.Column(sa.String(64), nullable=False, unique=True, index=True)
+    system_template_id = sa.Column(
+        UUID(as_uuid=True),
+        sa.ForeignKey("prompt_template.id"),
+        nullable=False,
+        index=True,
+    )
+    personality_template_id = sa.Column(
+        UUID(as_uuid=True),
+        sa.ForeignKey("prompt_template.id"),
+        nullable=False,
+        index=True,
+    )
+    activity_template_id = sa.Column(
+        UUID(as_uuid=True),
+        sa.ForeignKey("prompt_template.id"),
+        nullable=False,
+        index=True,
+    )
+    task_template_id = sa.Column(
+        UUID(as_uuid=True),
+        sa.ForeignKey("prompt_template.id"),
+        nullable=False,
+        index=True,
+    )
     tags = sa.Column(JSONB, nullable=False, server_default=sa.text("'[]'::jsonb"))
-    created_at = sa.Column(sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False)
+    created_at = sa.Column(
+        sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+    )
 
     __table_args__ = (
         sa.UniqueConstraint("bundle_id", "semver", name="uq_prompt_bundle_id_semver"),
+        sa.Index("ix_prompt_bundle_id_semver_key", "bundle_id", "semver_key"),
+        # Keyset listing: listed columns are included, so a page is an index-only scan
+        sa.Index(
+            "ix_prompt_bundle_created_at_id",
+            "created_at",
+            "id",
+            postgresql_include=[
+                "bundle_id",
+                "semver",
+                "bundle_hash",
+                "system_template_id",
+                "personality_template_id",
+                "activity_template_id",
+                "task_template_id",
+                "tags",
+            ],
+        ),
+        # Tag containment (tags @> '["model"]') for model-routed version lookups and
+        # tag-filtered listings
+        sa.Index(
+            "ix_prompt_bundle_tags",
+            "tags",
+            postgresql_using="gin",
+            postgresql_ops={"tags": "jsonb_path_ops"},
+        ),
     )
@@ -0,0 +1,32 @@
+"""PromptBundleCompiled model — render-ready copy of an immutable bundle."""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from hnh_rest.db.base import Base
+
+
+class PromptBundleCompiled(Base):
+    """
+    Bundle hash, template contents in assembly order and tags.
+
+    One primary-key lookup per render. plan_hash identifies the contents alone, so
+    bundles and versions with identical text share rendered prompts.
+    """
+
+    __tablename__ = "prompt_bundle_compiled"
+
+    bundle_hash = sa.Column(sa.String(64), primary_key=True)
+    bundle_pk = sa.Column(
+        UUID(as_uuid=True),
+        sa.ForeignKey("prompt_bundle.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    plan_hash = sa.Column(sa.String(64), nullable=False)
+    # template contents: system, personality, activity, task
+    segments = sa.Column(JSONB, nullable=False)
+    tags = sa.Column(JSONB, nullable=False, server_default=sa.text("'[]'::jsonb"))
+    created_at = sa.Column(
+        sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+    )
@@ -4,12 +4,18 @@ import uuid
 
 import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import relationship
 
 from hnh_rest.db.base import Base
+from hnh_rest.db.models.prompt_template_content import PromptTemplateContent
 
 
 class PromptTemplate(Base):
-    """Versioned prompt template with role, content, and machine-readable constraints."""
+    """
+    Versioned prompt template with role, content, and machine-readable constraints.
+
+    Content lives in a shared blob.
+    """
 
     __tablename__ = "prompt_template"
 
@@ -17,10 +23,33 @@ class PromptTemplate(Base):
     template_id = sa.Column(sa.String(255), nullable=False, index=True)
     semver = sa.Column(sa.String(64), nullable=False)
     role = sa.Column(sa.String(64), nullable=False)  # system | developer | user
-    content = sa.Column(sa.Text(), nullable=False)
+    content_hash = sa.Column(
+        sa.String(64),
+        sa.ForeignKey("prompt_template_content.content_hash"),
+        nullable=False,
+        index=True,
+    )
     constraints = sa.Column(JSONB, nullable=True)  # machine-readable enforcement schema
-    created_at = sa.Column(sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False)
+    created_at = sa.Column(
+        sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+    )
 
     __table_args__ = (
-        sa.UniqueConstraint("template_id", "semver", name="uq_prompt_template_id_semver"),
+        sa.UniqueConstraint(
+            "template_id", "semver", name="uq_prompt_template_id_semver"
+        ),
+        # Keyset listing without content: an index-only scan
+        sa.Index(
+            "ix_prompt_template_created_at_id",
+            "created_at",
+            "id",
+            postgresql_include=["template_id", "semver", "role"],
+        ),
     )
+
+    blob = relationship(PromptTemplateContent, lazy="joined", innerjoin=True)
+
+    @property
+    def content(self) -> str:
+        """Template text from the content blob (loaded in the same query)."""
+        return self.blob.content
@@ -0,0 +1,21 @@
+"""PromptTemplateContent model — content-addressed template text, stored once."""
+
+import sqlalchemy as sa
+
+from hnh_rest.db.base import Base
+
+
+class PromptTemplateContent(Base):
+    """
+    Template text keyed by its xxh3_128 hash.
+
+    Shared by every template version with identical content.
+    """
+
+    __tablename__ = "prompt_template_content"
+
+    content_hash = sa.Column(sa.String(64), primary_key=True)
+    content = sa.Column(sa.Text(), nullable=False)
+    created_at = sa.Column(
+        sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+    )
@@ -0,0 +1,319 @@
+"""
+prompt_audit range partitions — created ahead of time, expired by dropping them.
+
+prompt_audit is partitioned by RANGE (created_at) into monthly or daily partitions named
+prompt_audit_pYYYYMM / prompt_audit_pYYYYMMDD (UTC periods), plus a DEFAULT partition
+that catches rows outside every period so an insert never fails for want of a partition.
+Maintenance keeps the next few periods created and drops partitions older than the
+retention; the partition name encodes its bounds.
+"""
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "prompt_audit"
+DEFAULT_PARTITION = "prompt_audit_default"
+MONTH = "month"
+DAY = "day"
+INTERVALS = (MONTH, DAY)
+
+_PREFIX = f"{PARENT_TABLE}_p"
+# advisory lock held by the one process running a maintenance pass
+_LOCK_KEY = 0x68_6E_68_61_75_64
+# DDL on the parent must not queue behind long reads and block audit inserts
+_LOCK_TIMEOUT = "5s"
+
+
+@dataclass(frozen=True, slots=True)
+class Partition:
+    """One range partition: [start, end) in UTC."""
+
+    name: str
+    start: datetime
+    end: datetime
+
+
+def period_start(moment: datetime, interval: str) -> datetime:
+    """Start of the UTC month or day containing moment."""
+    moment = moment.astimezone(timezone.utc)
+    if interval == MONTH:
+        return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+    if interval == DAY:
+        return datetime(moment.year, moment.month, moment.day, tzinfo=timezone.utc)
+    raise ValueError(f"Unknown partition interval: {interval}")
+
+
+def next_period(start: datetime, interval: str) -> datetime:
+    """Start of the period after the one starting at start."""
+    if interval == DAY:
+        return start + timedelta(days=1)
+    return datetime(
+        start.year + start.month // 12, start.month % 12 + 1, 1, tzinfo=timezone.utc
+    )
+
+
+def partition_for(start: datetime, interval: str) -> Partition:
+    """The partition of the period starting at start."""
+    suffix = start.strftime("%Y%m") if interval == MONTH else start.strftime("%Y%m%d")
+    return Partition(f"{_PREFIX}{suffix}", start, next_period(start, interval))
+
+
+def parse_partition(name: str) -> Partition | None:
+    """
+    Bounds of a partition from its name.
+
+    None for the default partition and foreign tables.
+    """
+    suffix = name.removeprefix(_PREFIX)
+    if suffix == name or not suffix.isdigit() or len(suffix) not in (6, 8):
+        return None
+    interval = MONTH if len(suffix) == 6 else DAY
+    start = datetime.strptime(
+        suffix, "%Y%m" if interval == MONTH else "%Y%m%d"
+    ).replace(tzinfo=timezone.utc)
+    return partition_for(start, interval)
+
+
+def partitions_between(
+    first: datetime, last: datetime, interval: str
+) -> list[Partition]:
+    """Partitions covering every moment from first through last."""
+    partitions = []
+    start = period_start(first, interval)
+    while start <= last:
+        partition = partition_for(start, interval)
+        partitions.append(partition)
+        start = partition.end
+    return partitions
+
+
+def _bounds_sql(partition: Partition) -> str:
+    start, end = partition.start.isoformat(), partition.end.isoformat()
+    return f"FOR VALUES FROM ('{start}') TO ('{end}')"
+
+
+def create_partition_sql(partition: Partition) -> str:
+    """
+    CREATE TABLE ... PARTITION OF for one range partition.
+
+    Indexes and foreign keys are inherited from the parent.
+    """
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition.name} PARTITION OF {PARENT_TABLE} "
+        f"{_bounds_sql(partition)}"
+    )
+
+
+def create_default_partition_sql() -> str:
+    """CREATE TABLE for the DEFAULT partition (rows outside every range partition)."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+        f"PARTITION OF {PARENT_TABLE} DEFAULT"
+    )
+
+
+async def list_partitions(conn: AsyncConnection) -> list[Partition]:
+    """Range partitions of prompt_audit, oldest first."""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    partitions = [
+        p for p in (parse_partition(name) for name in result.scalars()) if p is not None
+    ]
+    return sorted(partitions, key=lambda p: p.start)
+
+
+async def ensure_partitions(
+    conn: AsyncConnection, now: datetime, interval: str, ahead: int
+) -> list[str]:
+    """
+    Create the partitions of the current and the next `ahead` periods.
+
+    Returns the names of those that did not exist yet. A period overlapping an existing
+    partition (e.g. after switching month to day) is skipped. Rows of the period already
+    in the DEFAULT partition are moved into the new partition, which is then attached.
+    """
+    existing = await list_partitions(conn)
+    current = period_start(now, interval)
+    wanted = [current]
+    for _ in range(ahead):
+        wanted.append(next_period(wanted[-1], interval))
+    created = []
+    for start in wanted:
+        partition = partition_for(start, interval)
+        if any(p.start < partition.end and partition.start < p.end for p in existing):
+            continue
+        await _create_partition(conn, partition)
+        existing.append(partition)
+        created.append(partition.name)
+    return created
+
+
+async def _create_partition(conn: AsyncConnection, partition: Partition) -> None:
+    bounds = {"start": partition.start, "end": partition.end}
+    # Table names below are module constants and partition names built from dates, never
+    # user input.
+    stray = await conn.scalar(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "  # noqa: S608
+            "WHERE created_at >= :start AND created_at < :end)"
+        ),
+        bounds,
+    )
+    if not stray:
+        await conn.execute(text(create_partition_sql(partition)))
+        return
+    # Creating the partition would conflict with rows already in DEFAULT: move them,
+    # then attach.
+    await conn.execute(
+        text(
+            f"CREATE TABLE {partition.name} "
+            f"(LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    await conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "  # noqa: S608
+            "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+            f"INSERT INTO {partition.name} SELECT * FROM moved"
+        ),
+        bounds,
+    )
+    await conn.execute(
+        text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {partition.name} "
+            f"{_bounds_sql(partition)}"
+        )
+    )
+
+
+async def drop_expired_partitions(
+    conn: AsyncConnection, now: datetime, retention: timedelta
+) -> list[str]:
+    """
+    Drop every partition whose whole range is older than now - retention.
+
+    Returns their names.
+    """
+    cutoff = now - retention
+    dropped = []
+    for partition in await list_partitions(conn):
+        if partition.end <= cutoff:
+            await conn.execute(text(f"DROP TABLE {partition.name}"))
+            dropped.append(partition.name)
+    return dropped
+
+
+async def purge_unreferenced_contents(conn: AsyncConnection, before: datetime) -> int:
+    """
+    Delete shared audit texts stored before `before` that no audit event references.
+
+    A writer that still believes such a text is stored fails its foreign key and
+    re-sends it.
+    """
+    result = await conn.execute(
+        text(
+            "DELETE FROM prompt_audit_content c "  # noqa: S608 - PARENT_TABLE is a constant
+            "WHERE c.created_at < :before AND NOT EXISTS ("
+            f"SELECT 1 FROM {PARENT_TABLE} a "
+            "WHERE a.bundle_hash = c.bundle_hash "
+            "AND a.personality_hash = c.personality_hash "
+            "AND a.prompt_checksum = c.prompt_checksum)"
+        ),
+        {"before": before},
+    )
+    return result.rowcount
+
+
+class PartitionMaintainer:
+    """
+    Periodic partition maintenance in one transaction under an advisory lock.
+
+    Creates upcoming partitions, then (with a retention) drops expired ones and their
+    texts. A pass is skipped while another worker or node holds the lock, so workers
+    neither race nor queue up to repeat the same DDL.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        interval: str = MONTH,
+        ahead: int = 3,
+        retention: timedelta | None = None,
+        run_interval: float = 3600.0,
+    ) -> None:
+        if interval not in INTERVALS:
+            raise ValueError(f"Unknown partition interval: {interval}")
+        self._engine = engine
+        self._interval = interval
+        self._ahead = ahead
+        self._retention = retention
+        self._run_interval = run_interval
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """
+        Start periodic maintenance on lifespan startup.
+
+        The first run is immediate.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="audit-partitions")
+
+    async def stop(self) -> None:
+        """Stop periodic maintenance (on lifespan shutdown)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def run_once(
+        self, now: datetime | None = None
+    ) -> tuple[list[str], list[str]]:
+        """
+        One maintenance pass; returns (created, dropped) partition names.
+
+        Both are empty when another process holds the maintenance lock.
+        """
+        now = now or datetime.now(timezone.utc)
+        async with self._engine.begin() as conn:
+            locked = await conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _LOCK_KEY}
+            )
+            if not locked.scalar_one():
+                return [], []
+            await conn.execute(text(f"SET LOCAL lock_timeout = '{_LOCK_TIMEOUT}'"))
+            created = await ensure_partitions(conn, now, self._interval, self._ahead)
+            dropped: list[str] = []
+            if self._retention is not None:
+                dropped = await drop_expired_partitions(conn, now, self._retention)
+                if dropped:
+                    await purge_unreferenced_contents(conn, now - self._retention)
+        return created, dropped
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                created, dropped = await self.run_once()
+                if created or dropped:
+                    logger.info(
+                        "Audit partitions created %s, dropped %s", created, dropped
+                    )
+            except Exception as e:
+                # maintenance must outlive a failed pass; retried next interval
+                logger.warning("Audit partition maintenance failed: %s", e)
+            await asyncio.sleep(self._run_interval)
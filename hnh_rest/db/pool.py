@@ -0,0 +1,103 @@
+import time
+import uuid
+from typing import Any
+
+from prometheus_client import Histogram
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.pool.base import ConnectionPoolEntry
+
+from hnh_rest.settings import settings
+
+db_pool_checkout_wait_seconds = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection, by pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+class _TimedCheckoutMixin:
+    """Records how long each connection checkout waits."""
+
+    logging_name: str | None
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        finally:
+            db_pool_checkout_wait_seconds.labels(
+                pool=self.logging_name or "default"
+            ).observe(
+                time.perf_counter() - start,
+            )
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """Async queue pool with checkout wait instrumentation."""
+
+
+class TimedNullPool(_TimedCheckoutMixin, NullPool):
+    """
+    Pool without client-side pooling, with checkout instrumentation.
+
+    Every checkout opens a new connection, so the measured time
+    includes the wait inside a transaction pooler such as PgBouncer.
+    """
+
+
+def _unique_statement_name() -> str:
+    """Unique prepared statement name, so transaction poolers never see a name clash."""
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options(
+    name: str,
+    pool_size: int,
+    max_overflow: int,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Build keyword arguments for ``create_async_engine``.
+
+    Connections come from an instrumented pool labelled with ``name``.
+    In PgBouncer mode, server-side prepared statement caches are turned off,
+    statements get unique names and the client-side pool shrinks
+    to ``db_pgbouncer_pool_size`` (``NullPool`` when it is 0),
+    so the transaction pooler does the pooling.
+
+    :param name: pool name used in logs and metrics.
+    :param pool_size: pool size outside PgBouncer mode.
+    :param max_overflow: pool overflow outside PgBouncer mode.
+    :param kwargs: extra engine arguments.
+    :return: engine keyword arguments.
+    """
+    options: dict[str, Any] = {
+        "echo": settings.db_echo,
+        "pool_logging_name": name,
+        **kwargs,
+    }
+    if not settings.db_pgbouncer_mode:
+        options.update(
+            poolclass=TimedAsyncAdaptedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+        )
+        return options
+
+    options["connect_args"] = {
+        **options.get("connect_args", {}),
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": _unique_statement_name,
+    }
+    if settings.db_pgbouncer_pool_size == 0:
+        options.pop("pool_timeout", None)
+        options["poolclass"] = TimedNullPool
+        return options
+    options.update(
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_size=settings.db_pgbouncer_pool_size,
+        max_overflow=0,
+    )
+    return options
@@ -1,7 +1,9 @@
+import gc
 from typing import Any
 
 from gunicorn.app.base import BaseApplication
 from gunicorn.util import import_app
+from gunicorn.workers.base import Worker
 from uvicorn.workers import UvicornWorker as BaseUvicornWorker
 
 try:
@@ -28,6 +30,66 @@ class UvicornWorker(BaseUvicornWorker):
     }
 
 
+class PreloadedUvicornWorker(UvicornWorker):
+    """
+    Uvicorn worker for preload mode.
+
+    The master process has already built the application,
+    so workers receive an app instance instead of a factory.
+    """
+
+    CONFIG_KWARGS: dict[str, Any] = {  # noqa: RUF012
+        **UvicornWorker.CONFIG_KWARGS,
+        "factory": False,
+    }
+
+
+def warm_up(app: Any) -> None:
+    """
+    Do the one-time work every worker would otherwise repeat.
+
+    Loads all models, configures the SQLAlchemy mapper registry
+    and builds the OpenAPI schema, so the resulting objects
+    live in the master and are shared with workers.
+
+    :param app: FastAPI application built in the master.
+    """
+    from sqlalchemy.orm import configure_mappers  # noqa: PLC0415
+
+    from hnh_rest.db.models import load_all_models  # noqa: PLC0415
+
+    load_all_models()
+    configure_mappers()
+    app.openapi()
+
+
+def report_worker_memory(worker: Worker) -> None:
+    """
+    Report resident memory of a freshly started worker.
+
+    Runs as gunicorn's post_worker_init hook. PSS and shared
+    figures show how much of the preloaded master is still
+    shared through copy-on-write.
+
+    :param worker: gunicorn worker that finished initialization.
+    """
+    # Imported here: prometheus_client must be imported only after
+    # the multiprocess directory is configured.
+    from hnh_rest.web.api.monitoring.metrics import (  # noqa: PLC0415
+        read_process_memory,
+        worker_memory_bytes,
+    )
+
+    memory = read_process_memory()
+    for kind, value in memory.items():
+        worker_memory_bytes.labels(kind=kind).set(value)
+    worker.log.info(
+        "Worker %s memory: %s",
+        worker.pid,
+        " ".join(f"{kind}={value / 2**20:.1f}MiB" for kind, value in memory.items()),
+    )
+
+
 class GunicornApplication(BaseApplication):
     """
     Custom gunicorn application.
@@ -42,12 +104,16 @@ class GunicornApplication(BaseApplication):
         host: str,
         port: int,
         workers: int,
+        preload: bool = False,
         **kwargs: Any,
     ) -> None:
+        worker_class = "PreloadedUvicornWorker" if preload else "UvicornWorker"
         self.options = {
             "bind": f"{host}:{port}",
             "workers": workers,
-            "worker_class": "hnh_rest.gunicorn_runner.UvicornWorker",
+            "worker_class": f"hnh_rest.gunicorn_runner.{worker_class}",
+            "preload_app": preload,
+            "post_worker_init": report_worker_memory,
             **kwargs,
         }
         self.app = app
@@ -74,6 +140,22 @@ class GunicornApplication(BaseApplication):
         function's returns. We return python's path to
         the app's factory.
 
-        :returns: python path to app factory.
+        In preload mode this runs once in the master: the app
+        is built and warmed up, then the garbage collector
+        freezes everything allocated so far, so forked workers
+        share those pages instead of copying them.
+
+        :returns: python path to app factory, or the built app in preload mode.
         """
-        return import_app(self.app)
+        if not self.cfg.preload_app:
+            return import_app(self.app)
+        gc.disable()
+        try:
+            app = import_app(self.app)
+            if self.options.get("factory"):
+                app = app()
+            warm_up(app)
+            gc.freeze()
+        finally:
+            gc.enable()
+        return app
@@ -2,6 +2,15 @@
 
 from hnh_rest.services.prompts.audit.db import DbAuditSink
 from hnh_rest.services.prompts.audit.null import NullAuditSink
-from hnh_rest.services.prompts.audit.service import AuditService
+from hnh_rest.services.prompts.audit.service import AuditRecord, AuditService
+from hnh_rest.services.prompts.audit.spool import AuditSpool
+from hnh_rest.services.prompts.audit.writer import AuditWriter
 
-__all__ = ["AuditService", "DbAuditSink", "NullAuditSink"]
+__all__ = [
+    "AuditRecord",
+    "AuditService",
+    "AuditSpool",
+    "AuditWriter",
+    "DbAuditSink",
+    "NullAuditSink",
+]
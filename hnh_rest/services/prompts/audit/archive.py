@@ -0,0 +1,342 @@
+"""
+Columnar audit archive — closed prompt_audit periods exported to Parquet files.
+
+Each closed partition period becomes one file, <partition name>.parquet, written once: a
+server-side cursor streams the period's events in batches, each batch becomes one row
+group, so memory stays constant whatever the period's size. A period counts as closed
+only a grace period after its end, since write-behind batches, spool replays and replica
+lag still deliver events stamped with their render time. Exports are serialised across
+workers by an advisory lock, and a file is published only if no other process published
+it first. Hashes and versions are dictionary-encoded. Texts are not exported; they are
+shared rows in prompt_audit_content keyed by (bundle_hash, personality_hash,
+prompt_checksum). Requires the ``pyarrow`` package.
+
+CLI: ``python -m hnh_rest.services.prompts.audit.archive [--dir DIR] [--period
+YYYYMM|YYYYMMDD]``
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import sys
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncResult,
+    create_async_engine,
+)
+
+from hnh_rest.db.models.prompt_audit import PromptAudit
+from hnh_rest.db.partitions import (
+    PARENT_TABLE,
+    Partition,
+    list_partitions,
+    parse_partition,
+)
+from hnh_rest.settings import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+# advisory lock serialising exports across workers and nodes
+_LOCK_KEY = 0x68_6E_68_61_72_63
+
+_COLUMNS = (
+    PromptAudit.id,
+    PromptAudit.bundle_hash,
+    PromptAudit.personality_hash,
+    PromptAudit.prompt_checksum,
+    PromptAudit.engine_version,
+    PromptAudit.adapter_version,
+    PromptAudit.created_at,
+)
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError(
+            "The audit archive requires the pyarrow package "
+            "(pip install hnh_rest[archive])"
+        )
+
+
+def archive_schema() -> Any:
+    """
+    Arrow schema of archive files.
+
+    Hashes and versions are dictionary-encoded, timestamps UTC microseconds.
+    """
+    _require_pyarrow()
+    encoded = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("bundle_hash", encoded),
+            ("personality_hash", encoded),
+            ("prompt_checksum", encoded),
+            ("engine_version", encoded),
+            ("adapter_version", encoded),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+def _record_batch(rows: Sequence[Sequence[Any]], schema: Any) -> Any:
+    (
+        ids,
+        bundle_hashes,
+        personality_hashes,
+        checksums,
+        engine_versions,
+        adapter_versions,
+        created,
+    ) = zip(*rows, strict=True)
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array([str(i) for i in ids], pa.string()),
+            pa.array(bundle_hashes, pa.string()).dictionary_encode(),
+            pa.array(personality_hashes, pa.string()).dictionary_encode(),
+            pa.array(checksums, pa.string()).dictionary_encode(),
+            pa.array(engine_versions, pa.string()).dictionary_encode(),
+            pa.array(adapter_versions, pa.string()).dictionary_encode(),
+            pa.array(created, pa.timestamp("us", tz="UTC")),
+        ],
+        schema=schema,
+    )
+
+
+async def _in_thread(func: Any, *args: Any) -> None:
+    """
+    Run func in a worker thread.
+
+    On cancellation, wait for it to finish before the writer is closed.
+    """
+    future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await future
+        raise
+
+
+async def write_parquet(
+    path: Path,
+    batches: AsyncIterator[Sequence[Sequence[Any]]],
+    overwrite: bool = False,
+) -> int:
+    """
+    Write row batches to a Parquet file, one row group per batch.
+
+    Rows are (id, bundle_hash, personality_hash, prompt_checksum, engine_version,
+    adapter_version, created_at); returns the row count. The file appears only once
+    complete, from a temporary file of this process; unless overwrite, FileExistsError
+    if it appeared meanwhile.
+    """
+    _require_pyarrow()
+    schema = archive_schema()
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    written = 0
+    writer = pq.ParquetWriter(tmp, schema, compression="zstd")
+    try:
+        async for rows in batches:
+            if rows:
+                await _in_thread(writer.write_batch, _record_batch(rows, schema))
+                written += len(rows)
+    except BaseException:
+        writer.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    writer.close()
+    if overwrite:
+        tmp.replace(path)
+    else:
+        try:
+            # exclusive create: fails if another process published the file
+            path.hardlink_to(tmp)
+        finally:
+            tmp.unlink()
+    return written
+
+
+async def export_period(
+    conn: AsyncConnection,
+    partition: Partition,
+    directory: Path,
+    batch_size: int,
+    overwrite: bool = False,
+) -> Path | None:
+    """
+    Export the events of one period through a server-side cursor (caller's transaction).
+
+    None if already archived. Holds the export advisory lock until the transaction ends,
+    so concurrent exporters wait, then find the file. The period bounds prune the scan
+    to its partition; rows come in heap order, which is roughly time order.
+    """
+    path = directory / f"{partition.name}.parquet"
+    if path.exists() and not overwrite:
+        return None
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+    if path.exists() and not overwrite:
+        return None
+    directory.mkdir(parents=True, exist_ok=True)
+    created_at = PromptAudit.__table__.c.created_at
+    result: AsyncResult[Any] = await conn.stream(
+        select(*_COLUMNS)
+        .where(created_at >= partition.start, created_at < partition.end)
+        .execution_options(yield_per=batch_size)
+    )
+    try:
+        rows = await write_parquet(path, result.partitions(batch_size), overwrite)
+    except FileExistsError:
+        return None
+    logger.info("Archived %d audit events of %s to %s", rows, partition.name, path)
+    return path
+
+
+async def closed_partitions(
+    conn: AsyncConnection, now: datetime, grace: timedelta
+) -> list[Partition]:
+    """
+    Partitions whose period ended at least grace ago.
+
+    Late events (spool replays, replica lag) are in by then.
+    """
+    return [p for p in await list_partitions(conn) if p.end + grace <= now]
+
+
+class ArchiveExporter:
+    """
+    Periodic export of closed audit periods that have no archive file yet.
+
+    Each period is exported in its own read transaction. Runs against a replica engine
+    when one is configured, so analytics exports never load the primary.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        directory: Path,
+        batch_size: int = 50_000,
+        run_interval: float = 3600.0,
+        grace: timedelta = timedelta(days=1),
+    ) -> None:
+        _require_pyarrow()
+        self._engine = engine
+        self._directory = directory
+        self._batch_size = batch_size
+        self._grace = grace
+        self._run_interval = run_interval
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start periodic export on lifespan startup."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="audit-archive")
+
+    async def stop(self) -> None:
+        """
+        Stop periodic export (on lifespan shutdown).
+
+        A file being written is discarded.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def run_once(self, now: datetime | None = None) -> list[Path]:
+        """Export every closed period not archived yet; returns the files written."""
+        now = now or datetime.now(timezone.utc)
+        async with self._engine.connect() as conn:
+            partitions = await closed_partitions(conn, now, self._grace)
+        written = []
+        for partition in partitions:
+            async with self._engine.connect() as conn, conn.begin():
+                path = await export_period(
+                    conn, partition, self._directory, self._batch_size
+                )
+            if path is not None:
+                written.append(path)
+        return written
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                # export must outlive a failed pass; retried next interval
+                logger.warning("Audit archive export failed: %s", e)
+            await asyncio.sleep(self._run_interval)
+
+
+def archive_engine() -> AsyncEngine:
+    """Engine for exports: the first replica when configured, else the primary."""
+    url = (
+        settings.db_replica_urls[0]
+        if settings.db_replica_urls
+        else str(settings.db_url)
+    )
+    return create_async_engine(url, pool_size=1, max_overflow=0)
+
+
+async def _export(directory: Path, batch_size: int, period: str | None) -> list[Path]:
+    engine = archive_engine()
+    try:
+        if period is None:
+            grace = timedelta(seconds=settings.audit_archive_grace_seconds)
+            return await ArchiveExporter(
+                engine, directory, batch_size, grace=grace
+            ).run_once()
+        partition = parse_partition(f"{PARENT_TABLE}_p{period}")
+        if partition is None:
+            raise SystemExit(f"Invalid period: {period} (expected YYYYMM or YYYYMMDD)")
+        async with engine.connect() as conn, conn.begin():
+            path = await export_period(
+                conn, partition, directory, batch_size, overwrite=True
+            )
+        return [path] if path is not None else []
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Export closed audit periods (or one given period) and print the paths."""
+    parser = argparse.ArgumentParser(
+        description="Export closed prompt_audit periods to Parquet files."
+    )
+    parser.add_argument(
+        "--dir", type=Path, default=settings.audit_archive_dir, help="output directory"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.audit_archive_batch_size,
+        help="rows per row group",
+    )
+    parser.add_argument(
+        "--period",
+        help="export only this period (YYYYMM or YYYYMMDD), replacing an existing file",
+    )
+    args = parser.parse_args(argv)
+    _require_pyarrow()
+    for path in asyncio.run(_export(args.dir, args.batch_size, args.period)):
+        sys.stdout.write(f"{path}\n")
+
+
+if __name__ == "__main__":
+    main()
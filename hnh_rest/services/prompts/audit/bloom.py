@@ -0,0 +1,47 @@
+"""Bloom filter — compact set membership, false positives but no false negatives."""
+
+import math
+
+import xxhash
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    K bit positions per key from one xxh3_128 digest (double hashing). Sized for
+    capacity keys at error_rate; once more than capacity keys were added it clears
+    itself, so the false-positive rate stays bounded in a long-running process.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        self._capacity = capacity
+        self._bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self._hashes = max(1, round(self._bits / capacity * math.log(2)))
+        self._array = bytearray((self._bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, key: str) -> list[int]:
+        digest = xxhash.xxh3_128_intdigest(key.encode())
+        h1, h2 = digest >> 64, digest & 0xFFFFFFFFFFFFFFFF | 1
+        return [(h1 + i * h2) % self._bits for i in range(self._hashes)]
+
+    def add(self, key: str) -> None:
+        """Add key; clears the filter first when it is full."""
+        if self._count >= self._capacity:
+            self.clear()
+        for pos in self._positions(key):
+            self._array[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key)
+        )
+
+    def clear(self) -> None:
+        """Forget every key."""
+        self._array = bytearray(len(self._array))
+        self._count = 0
@@ -0,0 +1,164 @@
+"""
+Optional zstd compression of audit texts with dictionaries built from templates.
+
+Rendered prompts are template texts with small substitutions, so a dictionary made of
+the templates compresses them several-fold. Dictionaries are immutable and versioned by
+id; texts are compressed with the newest one and decompressed with the one they name.
+Requires the ``zstandard`` package.
+"""
+
+from collections.abc import Iterable, Sequence
+from threading import Lock
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hnh_rest.db.models.prompt_audit_dictionary import PromptAuditDictionary
+from hnh_rest.db.models.prompt_template_content import PromptTemplateContent
+
+if TYPE_CHECKING:
+    zstandard: ModuleType | None
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+DICTIONARY_SIZE = 112_640  # zstd's default dictionary size
+
+_decompressors: dict[int, Any] = {}  # dictionary id -> zstandard.ZstdDecompressor
+_lock = Lock()
+
+
+def _require_zstandard() -> ModuleType:
+    if zstandard is None:
+        raise RuntimeError(
+            "Compressed audit storage requires the zstandard package "
+            "(pip install hnh_rest[zstd])"
+        )
+    return zstandard
+
+
+def _make_dictionary(data: bytes) -> Any:
+    zstd = _require_zstandard()
+    return zstd.ZstdCompressionDict(data, dict_type=zstd.DICT_TYPE_AUTO)
+
+
+def build_dictionary(samples: Sequence[bytes], size: int = DICTIONARY_SIZE) -> bytes:
+    """
+    Train a zstd dictionary from samples.
+
+    Too few samples to train on (a small registry) fall back to a raw-content dictionary
+    of the samples themselves, which suits texts that embed the samples verbatim.
+    """
+    zstd = _require_zstandard()
+    try:
+        return zstd.train_dictionary(size, list(samples)).as_bytes()
+    except zstd.ZstdError:
+        return b"".join(samples)[-size:]
+
+
+class AuditCompressor:
+    """
+    Compresses audit texts with one dictionary.
+
+    The dictionary id is stored next to every compressed text.
+    """
+
+    def __init__(self, dictionary_id: int, data: bytes, level: int = 3) -> None:
+        zstd = _require_zstandard()
+        self.dictionary_id = dictionary_id
+        dictionary = _make_dictionary(data)
+        with _lock:
+            _decompressors.setdefault(
+                dictionary_id, zstd.ZstdDecompressor(dict_data=dictionary)
+            )
+        self._compressor = zstd.ZstdCompressor(level=level, dict_data=dictionary)
+
+    def compress(self, text: str) -> bytes:
+        """Zstd frame of the UTF-8 text."""
+        return self._compressor.compress(text.encode())
+
+
+async def train_dictionary(
+    session: AsyncSession, size: int = DICTIONARY_SIZE
+) -> PromptAuditDictionary | None:
+    """
+    Build a new dictionary version from all registry template contents and store it.
+
+    The caller commits. None while the registry has no templates.
+    """
+    result = await session.execute(
+        select(PromptTemplateContent.content).order_by(PromptTemplateContent.created_at)
+    )
+    samples = [content.encode() for content in result.scalars()]
+    if not samples:
+        return None
+    dictionary = PromptAuditDictionary(data=build_dictionary(samples, size))
+    session.add(dictionary)
+    await session.flush()
+    return dictionary
+
+
+async def active_compressor(
+    session: AsyncSession, level: int = 3
+) -> AuditCompressor | None:
+    """
+    Compressor with the newest dictionary.
+
+    Trains the first one if none exists yet (caller commits). None while there is
+    nothing to build a dictionary from; texts are then stored plain.
+    """
+    newest = (
+        select(PromptAuditDictionary.id, PromptAuditDictionary.data)
+        .order_by(PromptAuditDictionary.id.desc())
+        .limit(1)
+    )
+    dictionary = (await session.execute(newest)).one_or_none()
+    if dictionary is None and await train_dictionary(session) is not None:
+        dictionary = (await session.execute(newest)).one_or_none()
+    return (
+        None
+        if dictionary is None
+        else AuditCompressor(dictionary.id, dictionary.data, level)
+    )
+
+
+async def load_dictionaries(
+    session: AsyncSession, dictionary_ids: Iterable[int]
+) -> None:
+    """Load the dictionaries that are not cached in this process yet."""
+    with _lock:
+        missing = {i for i in dictionary_ids if i not in _decompressors}
+    if not missing:
+        return
+    zstd = _require_zstandard()
+    result = await session.execute(
+        select(PromptAuditDictionary.id, PromptAuditDictionary.data).where(
+            PromptAuditDictionary.id.in_(list(missing))
+        )
+    )
+    loaded = {
+        row.id: zstd.ZstdDecompressor(dict_data=_make_dictionary(row.data))
+        for row in result
+    }
+    with _lock:
+        _decompressors.update(loaded)
+
+
+def decompress_text(dictionary_id: int, data: bytes) -> str:
+    """
+    Text of a compressed audit row.
+
+    Its dictionary must be loaded (load_dictionaries).
+    """
+    with _lock:
+        decompressor = _decompressors[dictionary_id]
+    return decompressor.decompress(data).decode()
+
+
+def clear_dictionaries() -> None:
+    """Drop all cached dictionaries."""
+    with _lock:
+        _decompressors.clear()
@@ -1,29 +1,31 @@
-"""DB audit sink — writes to database via AuditService."""
+"""DB audit sink — enqueues records for the write-behind AuditWriter."""
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any
 
-from hnh_rest.services.prompts.audit.service import AuditService
+from hnh_rest.services.prompts.audit.writer import AuditWriter
 
 
 class DbAuditSink:
-    """Audit sink that writes to the database. Wraps AuditService."""
+    """Audit sink writing to the database through the process-wide AuditWriter."""
 
-    def __init__(self, session: AsyncSession) -> None:
-        self._service = AuditService(session)
+    def __init__(self, writer: AuditWriter) -> None:
+        self._writer = writer
 
     async def record(
         self,
         bundle_hash: str,
         personality_hash: str,
         rendered_prompt: str,
+        *,
         engine_version: str | None = None,
         adapter_version: str | None = None,
+        personality_payload: dict[str, Any] | None = None,
     ) -> None:
-        await self._service.create(
+        await self._writer.record(
             bundle_hash=bundle_hash,
             personality_hash=personality_hash,
             rendered_prompt=rendered_prompt,
             engine_version=engine_version,
             adapter_version=adapter_version,
+            personality_payload=personality_payload,
         )
-        await self._service._session.flush()
@@ -0,0 +1,17 @@
+from starlette.requests import Request
+
+from hnh_rest.services.prompts.audit.db import DbAuditSink
+from hnh_rest.services.prompts.protocols import AuditSink
+
+
+def get_audit_sink(request: Request) -> AuditSink:  # pragma: no cover
+    """
+    Returns the audit sink for the current request.
+
+    Records go to the application's AuditWriter queue,
+    so a render never waits for an audit INSERT.
+
+    :param request: current request.
+    :returns: audit sink.
+    """
+    return DbAuditSink(request.app.state.audit_writer)
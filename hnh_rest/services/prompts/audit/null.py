@@ -1,5 +1,7 @@
 """Null audit sink — no-op for inline / test usage."""
 
+from typing import Any
+
 
 class NullAuditSink:
     """Audit sink that does nothing. Does not affect prompt hash."""
@@ -9,8 +11,10 @@ class NullAuditSink:
         bundle_hash: str,
         personality_hash: str,
         rendered_prompt: str,
+        *,
         engine_version: str | None = None,
         adapter_version: str | None = None,
+        personality_payload: dict[str, Any] | None = None,
     ) -> None:
         """No-op."""
         pass
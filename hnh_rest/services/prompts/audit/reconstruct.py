@@ -0,0 +1,84 @@
+"""
+Reconstructive audit storage — rebuild rendered texts from their render inputs.
+
+Rendering is deterministic: a bundle's compiled segments plus the canonical personality
+payload reproduce the prompt byte for byte. Reconstructive rows keep only those inputs
+and a checksum of the original text; a rebuilt text that no longer matches the checksum
+(e.g. after an engine change) is an error, never a guess.
+"""
+
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hnh_rest.db.models.prompt_audit_content import PromptAuditContent
+from hnh_rest.db.models.prompt_bundle_compiled import PromptBundleCompiled
+from hnh_rest.services.prompts.plan_cache import CompiledPlan, get_plan, put_plan
+from hnh_rest.services.prompts.renderer import assemble, compute_content_hash
+
+
+class AuditReconstructionError(RuntimeError):
+    """A reconstructive audit text could not be rebuilt or fails its checksum."""
+
+    def __init__(self, bundle_hash: str, personality_hash: str, reason: str) -> None:
+        self.bundle_hash = bundle_hash
+        self.personality_hash = personality_hash
+        super().__init__(
+            f"Audit text of {bundle_hash}:{personality_hash} "
+            f"cannot be reconstructed: {reason}"
+        )
+
+
+def prompt_checksum(rendered_prompt: str) -> str:
+    """
+    Checksum stored with reconstructive rows.
+
+    xxh3_128 of the text, as for template contents.
+    """
+    return compute_content_hash(rendered_prompt)
+
+
+async def load_plans(session: AsyncSession, bundle_hashes: Iterable[str]) -> None:
+    """
+    Load the compiled plans of texts whose plan is not cached in this process.
+
+    One query at most.
+    """
+    missing = {h for h in bundle_hashes if get_plan(h) is None}
+    if not missing:
+        return
+    result = await session.execute(
+        select(
+            PromptBundleCompiled.bundle_hash,
+            PromptBundleCompiled.plan_hash,
+            PromptBundleCompiled.segments,
+            PromptBundleCompiled.tags,
+        ).where(PromptBundleCompiled.bundle_hash.in_(list(missing)))
+    )
+    for row in result:
+        put_plan(
+            row.bundle_hash,
+            CompiledPlan(row.plan_hash, tuple(row.segments), frozenset(row.tags)),
+        )
+
+
+def reconstruct_text(content: PromptAuditContent) -> str:
+    """
+    Rebuild and verify the text of a reconstructive row.
+
+    Its plan must be loaded (load_plans).
+    """
+    bundle_hash = str(content.bundle_hash)
+    personality_hash = str(content.personality_hash)
+    plan = get_plan(bundle_hash)
+    if plan is None:
+        raise AuditReconstructionError(
+            bundle_hash, personality_hash, "compiled bundle not loaded"
+        )
+    rendered_prompt = assemble(plan.segments, **content.personality_payload)
+    if prompt_checksum(rendered_prompt) != content.prompt_checksum:
+        raise AuditReconstructionError(
+            bundle_hash, personality_hash, "checksum mismatch"
+        )
+    return rendered_prompt
@@ -0,0 +1,327 @@
+"""
+Audit replay verification — re-render audited prompts, compare byte for byte.
+
+Texts are re-rendered with the current code and registry.
+
+Audit texts keep their canonical personality payload and a checksum of the text. Replay
+streams those rows through a server-side cursor in bundle_hash order (the primary key
+order), so each chunk holds runs of rows of the same bundle; every run is re-rendered
+against the bundle's compiled segments, loaded once, through assemble_and_hash, and the
+bundle hash, personality hash and text checksum are compared. Chunks are verified in a
+process pool while the next ones are read. Only mismatches are reported. Texts are
+shared per (bundle_hash, personality_hash, prompt_checksum), so one verified row covers
+every audit event of that text.
+
+CLI: ``python -m hnh_rest.services.prompts.audit.replay [--workers N] [--chunk-size N]
+[--bundle-hash HASH]`` prints mismatches as JSON lines and exits 1 if there is any (for
+cron).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Sequence
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from hnh_rest.db.models.prompt_audit_content import PromptAuditContent
+from hnh_rest.db.models.prompt_bundle import PromptBundle
+from hnh_rest.db.models.prompt_bundle_compiled import PromptBundleCompiled
+from hnh_rest.services.prompts.audit.reconstruct import prompt_checksum
+from hnh_rest.services.prompts.renderer import assemble_and_hash
+from hnh_rest.settings import settings
+
+BUNDLE_HASH = "bundle_hash"
+PERSONALITY_HASH = "personality_hash"
+TEXT = "text"
+RENDER_FAILED = "render_failed"
+BUNDLE_MISSING = "bundle_missing"
+
+
+@dataclass(frozen=True, slots=True)
+class ReplayGroup:
+    """
+    Audit rows of one bundle to verify.
+
+    Each row is (personality_hash, personality_payload, prompt_checksum).
+    """
+
+    bundle_hash: str
+    bundle_id: str
+    semver: str
+    segments: tuple[str, ...]
+    rows: tuple[tuple[str, dict[str, Any], str], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Mismatch:
+    """
+    A stored audit text the current code does not reproduce.
+
+    Reason says which comparison failed.
+    """
+
+    bundle_hash: str
+    personality_hash: str
+    reason: str
+    expected: str
+    actual: str
+
+
+@dataclass(slots=True)
+class ReplayReport:
+    """Outcome of one replay run."""
+
+    verified: int = 0
+    mismatches: list[Mismatch] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def per_minute(self) -> float:
+        """Verifications per minute."""
+        return self.verified * 60 / self.seconds if self.seconds else 0.0
+
+
+def verify_chunk(groups: Sequence[ReplayGroup]) -> tuple[int, list[Mismatch]]:
+    """
+    Re-render every row of the groups and compare; returns (rows verified, mismatches).
+
+    Runs in a worker process.
+    """
+    verified = 0
+    mismatches = []
+    for group in groups:
+        segments = list(group.segments)
+        for personality_hash, payload, checksum in group.rows:
+            verified += 1
+            try:
+                rendered_prompt, b_hash, p_hash = assemble_and_hash(
+                    group.bundle_id, group.semver, segments, **payload
+                )
+            except (TypeError, ValueError) as e:
+                mismatches.append(
+                    Mismatch(
+                        group.bundle_hash,
+                        personality_hash,
+                        RENDER_FAILED,
+                        checksum,
+                        str(e),
+                    )
+                )
+                continue
+            if b_hash != group.bundle_hash:
+                mismatch = Mismatch(
+                    group.bundle_hash,
+                    personality_hash,
+                    BUNDLE_HASH,
+                    group.bundle_hash,
+                    b_hash,
+                )
+            elif p_hash != personality_hash:
+                mismatch = Mismatch(
+                    group.bundle_hash,
+                    personality_hash,
+                    PERSONALITY_HASH,
+                    personality_hash,
+                    p_hash,
+                )
+            elif (actual := prompt_checksum(rendered_prompt)) != checksum:
+                mismatch = Mismatch(
+                    group.bundle_hash, personality_hash, TEXT, checksum, actual
+                )
+            else:
+                continue
+            mismatches.append(mismatch)
+    return verified, mismatches
+
+
+async def load_bundles(
+    conn: AsyncConnection,
+    bundle_hash: str | None = None,
+) -> dict[str, tuple[str, str, tuple[str, ...]]]:
+    """
+    (bundle_id, semver, segments) of every compiled registry bundle by bundle_hash.
+
+    One query.
+    """
+    query = select(
+        PromptBundle.bundle_hash,
+        PromptBundle.bundle_id,
+        PromptBundle.semver,
+        PromptBundleCompiled.segments,
+    ).join(
+        PromptBundleCompiled,
+        PromptBundleCompiled.bundle_hash == PromptBundle.bundle_hash,
+    )
+    if bundle_hash is not None:
+        query = query.where(PromptBundle.bundle_hash == bundle_hash)
+    result = await conn.execute(query)
+    return {
+        row.bundle_hash: (row.bundle_id, row.semver, tuple(row.segments))
+        for row in result
+    }
+
+
+def _groups(
+    rows: Sequence[Any],
+    bundles: dict[str, tuple[str, str, tuple[str, ...]]],
+    report: ReplayReport,
+) -> list[ReplayGroup]:
+    """
+    Split a chunk of rows (in bundle_hash order) into one group per bundle.
+
+    Unknown bundles are mismatches.
+    """
+    groups = []
+    start = 0
+    for end in range(1, len(rows) + 1):
+        if end < len(rows) and rows[end].bundle_hash == rows[start].bundle_hash:
+            continue
+        bundle_hash = rows[start].bundle_hash
+        run = rows[start:end]
+        start = end
+        bundle = bundles.get(bundle_hash)
+        if bundle is None:
+            report.verified += len(run)
+            report.mismatches.extend(
+                Mismatch(
+                    bundle_hash,
+                    r.personality_hash,
+                    BUNDLE_MISSING,
+                    r.prompt_checksum,
+                    "",
+                )
+                for r in run
+            )
+            continue
+        entries = tuple(
+            (r.personality_hash, r.personality_payload, r.prompt_checksum) for r in run
+        )
+        groups.append(ReplayGroup(bundle_hash, *bundle, entries))
+    return groups
+
+
+def _add(report: ReplayReport, outcome: tuple[int, list[Mismatch]]) -> None:
+    report.verified += outcome[0]
+    report.mismatches.extend(outcome[1])
+
+
+async def replay(
+    conn: AsyncConnection,
+    executor: Executor | None = None,
+    chunk_size: int = 5000,
+    bundle_hash: str | None = None,
+    max_pending: int = 4,
+) -> ReplayReport:
+    """
+    Verify every audit text stored with its render inputs (caller's transaction).
+
+    This includes texts the registry bundle did not reproduce when they were written;
+    texts of bundles not in the registry are bundle_missing. Chunks go to executor, at
+    most max_pending at a time; without an executor they are verified inline.
+    """
+    started = time.perf_counter()
+    report = ReplayReport()
+    bundles = await load_bundles(conn, bundle_hash)
+    query = select(
+        PromptAuditContent.bundle_hash,
+        PromptAuditContent.personality_hash,
+        PromptAuditContent.personality_payload,
+        PromptAuditContent.prompt_checksum,
+    ).where(PromptAuditContent.personality_payload.is_not(None))
+    if bundle_hash is not None:
+        query = query.where(PromptAuditContent.bundle_hash == bundle_hash)
+    result = await conn.stream(
+        query.order_by(
+            PromptAuditContent.bundle_hash,
+            PromptAuditContent.personality_hash,
+            PromptAuditContent.prompt_checksum,
+        ).execution_options(yield_per=chunk_size)
+    )
+    loop = asyncio.get_running_loop()
+    pending: set[asyncio.Future[tuple[int, list[Mismatch]]]] = set()
+
+    def collect(done: set[asyncio.Future[tuple[int, list[Mismatch]]]]) -> None:
+        for future in done:
+            _add(report, future.result())
+
+    try:
+        async for rows in result.partitions(chunk_size):
+            groups = _groups(rows, bundles, report)
+            if executor is None:
+                _add(report, verify_chunk(groups))
+                continue
+            pending.add(loop.run_in_executor(executor, verify_chunk, groups))
+            if len(pending) >= max_pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                collect(done)
+        if pending:
+            done, pending = await asyncio.wait(pending)
+            collect(done)
+    finally:
+        for future in pending:
+            future.cancel()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+async def _replay(
+    workers: int, chunk_size: int, bundle_hash: str | None
+) -> ReplayReport:
+    url = (
+        settings.db_replica_urls[0]
+        if settings.db_replica_urls
+        else str(settings.db_url)
+    )
+    engine = create_async_engine(url, pool_size=1, max_overflow=0)
+    executor = ProcessPoolExecutor(workers) if workers > 0 else None
+    try:
+        async with engine.connect() as conn, conn.begin():
+            return await replay(
+                conn, executor, chunk_size, bundle_hash, max_pending=max(2 * workers, 1)
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Verify audited prompts against the current code.
+
+    Print mismatches as JSON lines, exit 1 if any.
+    """
+    parser = argparse.ArgumentParser(
+        description="Re-render audited prompts and report those not reproduced."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (0: inline)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows per chunk")
+    parser.add_argument("--bundle-hash", help="verify only the texts of this bundle")
+    args = parser.parse_args(argv)
+    report = asyncio.run(_replay(args.workers, args.chunk_size, args.bundle_hash))
+    for mismatch in report.mismatches:
+        sys.stdout.write(orjson.dumps(asdict(mismatch)).decode() + "\n")
+    sys.stderr.write(
+        f"verified {report.verified} in {report.seconds:.1f}s "
+        f"({report.per_minute:.0f}/min), {len(report.mismatches)} mismatches\n"
+    )
+    if report.mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
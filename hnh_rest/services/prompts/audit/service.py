@@ -1,18 +1,89 @@
 """AuditService — append-only audit records for rendered prompts (replay support)."""
 
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from hnh_rest.db.models.prompt_audit import PromptAudit
+from hnh_rest.db.models.prompt_audit_content import PromptAuditContent
+from hnh_rest.db.models.prompt_bundle_compiled import PromptBundleCompiled
+from hnh_rest.services.prompts.audit.bloom import BloomFilter
+from hnh_rest.services.prompts.audit.compression import AuditCompressor
+from hnh_rest.services.prompts.audit.reconstruct import prompt_checksum
+from hnh_rest.services.prompts.pagination import Cursor, after_cursor
+from hnh_rest.services.prompts.renderer import assemble
+
+
+@dataclass(frozen=True, slots=True)
+class AuditRecord:
+    """
+    One audit row.
+
+    The id and created_at are fixed at render time, not at write time.
+    personality_payload is the canonical render input, kept with the text for replay
+    (and reconstruction).
+    """
+
+    bundle_hash: str
+    personality_hash: str
+    rendered_prompt: str
+    engine_version: str | None = None
+    adapter_version: str | None = None
+    personality_payload: dict[str, Any] | None = None
+    id: UUID = field(default_factory=uuid.uuid4)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+# (bundle_hash, personality_hash, prompt_checksum) keys of rendered texts already
+# stored, per process. A false positive only costs a retry: the event insert fails its
+# foreign key and is redone with all texts.
+_KNOWN_TEXTS_CAPACITY = 1_000_000
+_known_texts = BloomFilter(_KNOWN_TEXTS_CAPACITY, error_rate=0.001)
+
+
+_EVENT_COLUMNS = (
+    PromptAudit.id,
+    PromptAudit.bundle_hash,
+    PromptAudit.personality_hash,
+    PromptAudit.engine_version,
+    PromptAudit.adapter_version,
+    PromptAudit.created_at,
+)
+
+# AuditRecord fields stored in the shared content row, not in the event row.
+_CONTENT_FIELDS = frozenset({"rendered_prompt", "personality_payload"})
+
+
+def clear_known_texts() -> None:
+    """Forget which rendered texts are stored (tests roll back their audit rows)."""
+    _known_texts.clear()
 
 
 class AuditService:
-    """Create audit records. Records are immutable (append-only)."""
+    """
+    Create audit records.
+
+    Records are immutable (append-only). Texts are stored zstd-compressed with a
+    compressor, else plain; with reconstruct, texts the registry rebuilds exactly are
+    stored only as their render inputs.
+    """
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        compressor: AuditCompressor | None = None,
+        reconstruct: bool = False,
+    ) -> None:
         self._session = session
+        self._compressor = compressor
+        self._reconstruct = reconstruct
 
     async def create(
         self,
@@ -23,19 +94,205 @@ class AuditService:
         adapter_version: str | None = None,
     ) -> PromptAudit:
         """Append an audit record for a render. No update/delete."""
-        record = PromptAudit(
-            bundle_hash=bundle_hash,
-            personality_hash=personality_hash,
-            engine_version=engine_version,
-            adapter_version=adapter_version,
-            rendered_prompt=rendered_prompt,
-        )
-        self._session.add(record)
-        await self._session.flush()
-        await self._session.refresh(record)
-        return record
+        record = AuditRecord(
+            bundle_hash,
+            personality_hash,
+            rendered_prompt,
+            engine_version,
+            adapter_version,
+        )
+        await self.create_many([record])
+        result = await self._session.execute(
+            select(PromptAudit).where(PromptAudit.id == record.id)
+        )
+        return result.scalar_one()
+
+    async def create_many(self, records: Sequence[AuditRecord]) -> None:
+        """
+        Append many audit events with one multi-row INSERT.
+
+        No flush/refresh round trips. Each rendered text is stored once per
+        (bundle_hash, personality_hash, prompt_checksum): a pair that renders a
+        different text (bundle_hash covers only bundle_id:semver) gets its own content
+        row. Texts known to be stored are not sent at all. Ids already present are
+        skipped, so a batch replayed from the spool is never stored twice.
+        """
+        if not records:
+            return
+        checksums = [prompt_checksum(r.rendered_prompt) for r in records]
+        contents = {
+            (r.bundle_hash, r.personality_hash, checksum): r
+            for r, checksum in zip(records, checksums, strict=True)
+        }
+        unknown = {
+            key: r for key, r in contents.items() if ":".join(key) not in _known_texts
+        }
+        try:
+            async with self._session.begin_nested():
+                await self._insert_contents(unknown)
+                await self._insert_events(records, checksums)
+        except IntegrityError:
+            # filter false positive: a text assumed stored is missing
+            await self._insert_contents(contents)
+            await self._insert_events(records, checksums)
+        for key in contents:
+            _known_texts.add(":".join(key))
+
+    async def _insert_contents(
+        self, contents: dict[tuple[str, str, str], AuditRecord]
+    ) -> None:
+        """
+        Insert texts in key order.
+
+        Concurrent writers thus take unique-index locks in the same order.
+        """
+        if not contents:
+            return
+        compiled = await self._compiled(
+            {
+                b
+                for (b, _, _), r in contents.items()
+                if r.personality_payload is not None
+            }
+        )
+        rows = [
+            {
+                "bundle_hash": b_hash,
+                "personality_hash": p_hash,
+                "prompt_checksum": checksum,
+                **self._stored_content(r, compiled.get(b_hash)),
+            }
+            for (b_hash, p_hash, checksum), r in sorted(
+                contents.items(), key=lambda item: item[0]
+            )
+        ]
+        await self._session.execute(
+            insert(PromptAuditContent).values(rows).on_conflict_do_nothing()
+        )
+
+    async def _compiled(
+        self, bundle_hashes: set[str]
+    ) -> dict[str, tuple[UUID, list[str]]]:
+        """
+        (bundle row id, segments) by bundle_hash, for texts stored with render inputs.
+
+        One query per batch.
+        """
+        if not bundle_hashes:
+            return {}
+        result = await self._session.execute(
+            select(
+                PromptBundleCompiled.bundle_hash,
+                PromptBundleCompiled.bundle_pk,
+                PromptBundleCompiled.segments,
+            ).where(PromptBundleCompiled.bundle_hash.in_(list(bundle_hashes)))
+        )
+        return {row.bundle_hash: (row.bundle_pk, row.segments) for row in result}
+
+    def _stored_content(
+        self, record: AuditRecord, compiled: tuple[UUID, list[str]] | None
+    ) -> dict[str, Any]:
+        """
+        Column values of one content row.
+
+        Every row sets every column, as one multi-row INSERT requires. The personality
+        payload is kept whenever the record carries it, for replay verification.
+        bundle_pk is set only if the registry bundle rebuilds the text exactly; in
+        reconstruct mode such a text is not stored at all. Other texts (inline renders,
+        bundles not in the registry) are stored.
+        """
+        row: dict[str, Any] = {
+            "rendered_prompt": None,
+            "rendered_prompt_zstd": None,
+            "dictionary_id": None,
+            "bundle_pk": None,
+            "personality_payload": None,
+        }
+        if record.personality_payload is not None:
+            row["personality_payload"] = record.personality_payload
+            if (
+                compiled is not None
+                and assemble(compiled[1], **record.personality_payload)
+                == record.rendered_prompt
+            ):
+                row["bundle_pk"] = compiled[0]
+                if self._reconstruct:
+                    return row
+        if self._compressor is not None:
+            row["rendered_prompt_zstd"] = self._compressor.compress(
+                record.rendered_prompt
+            )
+            row["dictionary_id"] = self._compressor.dictionary_id
+        else:
+            row["rendered_prompt"] = record.rendered_prompt
+        return row
+
+    async def _insert_events(
+        self, records: Sequence[AuditRecord], checksums: Sequence[str]
+    ) -> None:
+        # The conflict target is the partitioned primary key; created_at is fixed at
+        # render time, so a replayed record conflicts exactly like its first insert.
+        rows = [
+            {k: v for k, v in asdict(r).items() if k not in _CONTENT_FIELDS}
+            | {"prompt_checksum": checksum}
+            for r, checksum in zip(records, checksums, strict=True)
+        ]
+        await self._session.execute(
+            insert(PromptAudit)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["id", "created_at"])
+        )
 
     async def get_by_id(self, id: UUID) -> PromptAudit | None:
         """Get audit record by primary key."""
-        result = await self._session.execute(select(PromptAudit).where(PromptAudit.id == id))
+        result = await self._session.execute(
+            select(PromptAudit).where(PromptAudit.id == id)
+        )
         return result.scalar_one_or_none()
+
+    async def search_page(
+        self,
+        limit: int,
+        cursor: Cursor | None = None,
+        *,
+        bundle_hash: str | None = None,
+        personality_hash: str | None = None,
+        engine_version: str | None = None,
+        adapter_version: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        include_prompt: bool = False,
+    ) -> Sequence[Row[Any] | PromptAudit]:
+        """
+        One keyset page of audit events ordered by (created_at, id).
+
+        Events are filtered by hashes, versions and the time range [created_from,
+        created_to). Hash and version filters use the composite (..., created_at, id)
+        indexes, so a page is one index range scan at any depth. Events come with their
+        content rows (PromptAudit) only with include_prompt; otherwise as rows of the
+        event columns.
+        """
+        stmt = select(PromptAudit) if include_prompt else select(*_EVENT_COLUMNS)
+        page = after_cursor(PromptAudit.created_at, PromptAudit.id, cursor)
+        if page is not None:
+            stmt = stmt.where(page)
+        if cursor is not None:
+            # The row comparison alone does not prune partitions; the redundant bound on
+            # created_at does.
+            stmt = stmt.where(PromptAudit.created_at >= cursor[0])
+        for column, value in (
+            (PromptAudit.bundle_hash, bundle_hash),
+            (PromptAudit.personality_hash, personality_hash),
+            (PromptAudit.engine_version, engine_version),
+            (PromptAudit.adapter_version, adapter_version),
+        ):
+            if value is not None:
+                stmt = stmt.where(column == value)
+        if created_from is not None:
+            stmt = stmt.where(PromptAudit.created_at >= created_from)
+        if created_to is not None:
+            stmt = stmt.where(PromptAudit.created_at < created_to)
+        result = await self._session.execute(
+            stmt.order_by(PromptAudit.created_at, PromptAudit.id).limit(limit)
+        )
+        return result.scalars().all() if include_prompt else result.all()
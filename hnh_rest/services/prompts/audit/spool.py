@@ -0,0 +1,182 @@
+"""AuditSpool — durable local fallback for audit batches the database did not take."""
+
+import asyncio
+import fcntl
+import itertools
+import logging
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Awaitable, Callable
+from uuid import UUID
+
+import orjson
+
+from hnh_rest.services.prompts.audit.service import AuditRecord
+from hnh_rest.services.prompts.metrics import audit_spool_age_seconds, audit_spool_depth
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".ndjson"
+
+
+@dataclass(slots=True)
+class _Segment:
+    path: Path
+    records: int
+    oldest: datetime | None  # created_at of the first record
+
+
+def _encode(records: list[AuditRecord]) -> bytes:
+    return b"".join(orjson.dumps(asdict(r)) + b"\n" for r in records)
+
+
+def _decode(line: bytes) -> AuditRecord:
+    d = orjson.loads(line)
+    d["id"] = UUID(d["id"])
+    d["created_at"] = datetime.fromisoformat(d["created_at"])
+    return AuditRecord(**d)
+
+
+class AuditSpool:
+    """
+    Append-only NDJSON segment files, one directory per worker process.
+
+    Each worker claims its directory with flock. Each appended batch is written and
+    fsynced once (group commit). Segments rotate at segment_max_bytes; drain() replays
+    sealed segments oldest first and deletes each one only after all its records were
+    written. A segment left by a crashed or stopped worker is replayed by the next
+    worker that claims its directory.
+    """
+
+    def __init__(
+        self, directory: Path, segment_max_bytes: int = 16 * 1024 * 1024
+    ) -> None:
+        self._root = directory
+        self._segment_max_bytes = segment_max_bytes
+        self._dir: Path | None = None
+        self._lock_file: IO[bytes] | None = None
+        self._segments: list[_Segment] = []  # oldest first; the last one may be active
+        self._active: IO[bytes] | None = None
+        self._next_seq = 0
+        self._mutex = asyncio.Lock()
+
+    def open(self) -> None:
+        """Claim a worker directory and load the segments left in it. Idempotent."""
+        if self._dir is not None:
+            return
+        self._root.mkdir(parents=True, exist_ok=True)
+        for n in itertools.count():
+            directory = self._root / f"worker-{n}"
+            directory.mkdir(exist_ok=True)
+            # held (with its flock) until close()
+            lock_file = (directory / ".lock").open("ab")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                continue
+            self._dir, self._lock_file = directory, lock_file
+            break
+        for path in sorted(directory.glob(f"*{_SUFFIX}")):
+            data = path.read_bytes()
+            first = data.split(b"\n", 1)[0]
+            oldest = _decode(first).created_at if data.count(b"\n") else None
+            self._segments.append(_Segment(path, data.count(b"\n"), oldest))
+            self._next_seq = int(path.stem) + 1
+        self.update_metrics()
+
+    def close(self) -> None:
+        """
+        Close the active segment and release the worker directory.
+
+        Spooled records stay on disk.
+        """
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self._dir = None
+        self._segments.clear()
+
+    def depth(self) -> int:
+        """Records spooled and not yet replayed."""
+        return sum(s.records for s in self._segments)
+
+    def update_metrics(self) -> None:
+        """Export spool depth and the age of the oldest spooled record."""
+        audit_spool_depth.set(self.depth())
+        oldest = next((s.oldest for s in self._segments if s.oldest is not None), None)
+        age = (
+            0.0
+            if oldest is None
+            else (datetime.now(timezone.utc) - oldest).total_seconds()
+        )
+        audit_spool_age_seconds.set(max(age, 0.0))
+
+    async def append(self, records: list[AuditRecord]) -> None:
+        """Append records durably: one write and one fsync for the whole batch."""
+        if not records:
+            return
+        self.open()
+        async with self._mutex:
+            await asyncio.to_thread(self._append_sync, _encode(records))
+            segment = self._segments[-1]
+            if segment.oldest is None:
+                segment.oldest = records[0].created_at
+            segment.records += len(records)
+        self.update_metrics()
+
+    def _append_sync(self, data: bytes) -> None:
+        if self._dir is None:
+            raise RuntimeError("Audit spool is not open")
+        if self._active is None:
+            path = self._dir / f"{self._next_seq:020d}{_SUFFIX}"
+            self._next_seq += 1
+            self._active = path.open("ab")  # stays open across appends until sealed
+            self._segments.append(_Segment(path, 0, None))
+        self._active.write(data)
+        self._active.flush()
+        os.fsync(self._active.fileno())
+        if self._active.tell() >= self._segment_max_bytes:
+            self._seal()
+
+    def _seal(self) -> None:
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+
+    async def drain(
+        self, write: Callable[[list[AuditRecord]], Awaitable[None]], batch_size: int
+    ) -> int:
+        """
+        Replay every spooled record in spool order through write.
+
+        Records are written batch_size at a time. The active segment is sealed first;
+        appends during the drain go to a new segment. Stops at the first failing write
+        (the failed segment is kept); returns the number of records replayed.
+        """
+        self.open()
+        async with self._mutex:
+            self._seal()
+            sealed = list(self._segments)
+        replayed = 0
+        for segment in sealed:
+            data = await asyncio.to_thread(segment.path.read_bytes)
+            lines = data.split(b"\n")
+            if lines[-1]:
+                logger.error(
+                    "Audit spool %s ends with a torn record; it is skipped",
+                    segment.path,
+                )
+            records = [_decode(line) for line in lines[:-1]]
+            for start in range(0, len(records), batch_size):
+                await write(records[start : start + batch_size])
+            await asyncio.to_thread(segment.path.unlink)
+            self._segments.remove(segment)
+            replayed += len(records)
+            self.update_metrics()
+        return replayed
@@ -0,0 +1,200 @@
+"""
+AuditWriter — write-behind audit.
+
+Renders enqueue records, a background task inserts them in batches.
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from hnh_rest.services.prompts.audit.compression import AuditCompressor
+from hnh_rest.services.prompts.audit.service import AuditRecord, AuditService
+from hnh_rest.services.prompts.audit.spool import AuditSpool
+from hnh_rest.services.prompts.metrics import (
+    audit_queue_full_total,
+    audit_records_dropped_total,
+    audit_records_spooled_total,
+    audit_write_latency_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """
+    In-process audit queue drained by one background task.
+
+    Each batch holds up to batch_size records and is written with one multi-row INSERT
+    in its own transaction. A batch waits at most flush_interval seconds to fill. When
+    max_pending records are queued, record() waits for room (backpressure) instead of
+    growing memory without bound.
+
+    With a spool, a batch whose INSERT fails or exceeds write_timeout is appended to the
+    local spool instead of being lost, and later batches go straight to the spool until
+    a replay succeeds. Every replay_interval seconds the spool is drained back into
+    prompt_audit in order; inserts skip ids already present. Records keep the canonical
+    personality payload, so stored texts can be replay-verified. With a compressor,
+    rendered texts are stored zstd-compressed. With reconstruct, texts of registry
+    bundles are stored only as their render inputs (bundle row id, personality payload)
+    plus a checksum, and rebuilt on read.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        max_pending: int = 10_000,
+        write_timeout: float | None = None,
+        spool: AuditSpool | None = None,
+        replay_interval: float = 5.0,
+        compressor: AuditCompressor | None = None,
+        reconstruct: bool = False,
+    ) -> None:
+        self._session_factory = session_factory
+        self._compressor = compressor
+        self._reconstruct = reconstruct
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._write_timeout = write_timeout
+        self._spool = spool
+        self._replay_interval = replay_interval
+        self._db_available = True
+        self._queue: asyncio.Queue[AuditRecord] = asyncio.Queue(maxsize=max_pending)
+        self._task: asyncio.Task[None] | None = None
+        self._replay_task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the background drain (and spool replay) tasks on lifespan startup."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="audit-writer")
+        if self._spool is not None and self._replay_task is None:
+            self._spool.open()
+            self._replay_task = asyncio.create_task(
+                self._replay(self._spool), name="audit-spool-replay"
+            )
+
+    async def stop(self) -> None:
+        """
+        Write (or spool) every queued record, then stop the background tasks.
+
+        Called on lifespan shutdown.
+        """
+        if self._task is None:
+            while not self._queue.empty():
+                await self._write(self._take_batch([]))
+        else:
+            await self._queue.join()
+        for task in (self._task, self._replay_task):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._task = self._replay_task = None
+        if self._spool is not None:
+            self._spool.close()
+
+    async def record(
+        self,
+        bundle_hash: str,
+        personality_hash: str,
+        rendered_prompt: str,
+        *,
+        engine_version: str | None = None,
+        adapter_version: str | None = None,
+        personality_payload: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Enqueue one audit record (AuditSink protocol).
+
+        Waits only when the queue is full.
+        """
+        await self.enqueue(
+            AuditRecord(
+                bundle_hash=bundle_hash,
+                personality_hash=personality_hash,
+                rendered_prompt=rendered_prompt,
+                engine_version=engine_version,
+                adapter_version=adapter_version,
+                personality_payload=personality_payload,
+            )
+        )
+
+    async def enqueue(self, record: AuditRecord) -> None:
+        """Enqueue a prepared record."""
+        if self._queue.full():
+            audit_queue_full_total.inc()
+        await self._queue.put(record)
+
+    def pending(self) -> int:
+        """Records queued and not yet taken into a batch."""
+        return self._queue.qsize()
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() < self._batch_size - 1:
+                await asyncio.sleep(self._flush_interval)  # let the batch fill
+            batch = self._take_batch(batch)
+            try:
+                await self._write(batch)
+            except Exception:  # the drain task must outlive any failed batch
+                audit_records_dropped_total.inc(len(batch))
+                logger.exception("Audit batch of %d records dropped", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _take_batch(self, batch: list[AuditRecord]) -> list[AuditRecord]:
+        while len(batch) < self._batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _write(self, batch: list[AuditRecord]) -> None:
+        if self._db_available or self._spool is None:
+            try:
+                await self._insert(batch)
+                return
+            except Exception:  # the drain task must outlive any failed batch
+                logger.exception("Audit batch of %d records failed", len(batch))
+                if self._spool is None:
+                    audit_records_dropped_total.inc(len(batch))
+                    return
+                self._db_available = False
+        try:
+            await self._spool.append(batch)
+            audit_records_spooled_total.inc(len(batch))
+        except Exception:  # unwritable spool or a record it cannot serialise
+            audit_records_dropped_total.inc(len(batch))
+            logger.exception("Audit spool append of %d records failed", len(batch))
+
+    async def _insert(self, batch: list[AuditRecord]) -> None:
+        with audit_write_latency_seconds.time():
+            await asyncio.wait_for(self._insert_once(batch), self._write_timeout)
+
+    async def _insert_once(self, batch: list[AuditRecord]) -> None:
+        async with self._session_factory() as session:
+            await AuditService(
+                session, self._compressor, self._reconstruct
+            ).create_many(batch)
+            await session.commit()
+
+    async def _replay(self, spool: AuditSpool) -> None:
+        while True:
+            await asyncio.sleep(self._replay_interval)
+            spool.update_metrics()
+            if spool.depth() == 0:
+                self._db_available = True
+                continue
+            try:
+                replayed = await spool.drain(self._insert, self._batch_size)
+            except Exception as e:  # database still unavailable; retry next interval
+                logger.warning("Audit spool replay failed: %s", e)
+                continue
+            self._db_available = True
+            logger.info("Replayed %d spooled audit records", replayed)
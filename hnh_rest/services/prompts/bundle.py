@@ -1,11 +1,29 @@
 """BundleService — create and read prompt bundles (immutable once created)."""
 
+import uuid
+from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, select, union
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from hnh_rest.db.models.prompt_bundle import PromptBundle
+from hnh_rest.db.models.prompt_bundle_compiled import PromptBundleCompiled
+from hnh_rest.db.models.prompt_template import PromptTemplate
+from hnh_rest.db.models.prompt_template_content import PromptTemplateContent
+from hnh_rest.services.prompts.constraints_cache import get_compiled_constraints
+from hnh_rest.services.prompts.pagination import Cursor, after_cursor
+from hnh_rest.services.prompts.renderer import compute_bundle_hash, compute_plan_hash
+from hnh_rest.services.prompts.versions import invalidate_version_index, semver_key
+
+
+class TemplateNotFoundError(ValueError):
+    """A bundle references a template id that does not exist."""
+
+    def __init__(self, template_id: UUID) -> None:
+        self.template_id = template_id
+        super().__init__(f"Template not found: {template_id}")
 
 
 class BundleService:
@@ -23,29 +41,94 @@ class BundleService:
         activity_template_id: UUID,
         task_template_id: UUID,
         tags: list[str] | None = None,
-    ) -> PromptBundle:
-        """Create a new bundle. Raises if (bundle_id, semver) already exists. Once created, bundle is immutable."""
+    ) -> PromptBundle | None:
+        """
+        Create a new bundle; returns None if (bundle_id, semver) already exists.
+
+        Once created, bundle is immutable. Templates are validated with one IN query;
+        the bundle and its compiled row (contents in assembly order, hashes, tags) that
+        renders read are inserted in one statement.
+        """
         tag_list = tags if tags is not None else []
-        bundle = PromptBundle(
-            bundle_id=bundle_id,
-            semver=semver,
-            system_template_id=system_template_id,
-            personality_template_id=personality_template_id,
-            activity_template_id=activity_template_id,
-            task_template_id=task_template_id,
-            tags=tag_list,
+        bundle_hash = compute_bundle_hash(bundle_id, semver)
+        template_ids = [
+            system_template_id,
+            personality_template_id,
+            activity_template_id,
+            task_template_id,
+        ]
+        result = await self._session.execute(
+            select(
+                PromptTemplate.id,
+                PromptTemplate.template_id,
+                PromptTemplate.semver,
+                PromptTemplate.content_hash,
+                PromptTemplateContent.content,
+                PromptTemplate.constraints,
+            )
+            .join(
+                PromptTemplateContent,
+                PromptTemplateContent.content_hash == PromptTemplate.content_hash,
+            )
+            .where(PromptTemplate.id.in_(template_ids))
         )
-        self._session.add(bundle)
-        await self._session.flush()
-        await self._session.refresh(bundle)
+        templates_map = {row.id: row for row in result}
+        for tid in template_ids:
+            if tid not in templates_map:
+                raise TemplateNotFoundError(tid)
+        for t in templates_map.values():
+            get_compiled_constraints(t.template_id, t.semver, t.constraints)
+
+        # An existing bundle already owns the compiled row for this hash, so both
+        # inserts skip together.
+        bundle_pk = uuid.uuid4()
+        compiled = (
+            insert(PromptBundleCompiled)
+            .values(
+                bundle_hash=bundle_hash,
+                bundle_pk=bundle_pk,
+                plan_hash=compute_plan_hash(
+                    [templates_map[tid].content_hash for tid in template_ids]
+                ),
+                segments=[templates_map[tid].content for tid in template_ids],
+                tags=tag_list,
+            )
+            .on_conflict_do_nothing(index_elements=[PromptBundleCompiled.bundle_hash])
+            .cte("compiled")
+        )
+        result = await self._session.execute(
+            insert(PromptBundle)
+            .values(
+                id=bundle_pk,
+                bundle_id=bundle_id,
+                semver=semver,
+                semver_key=semver_key(semver),
+                bundle_hash=bundle_hash,
+                system_template_id=system_template_id,
+                personality_template_id=personality_template_id,
+                activity_template_id=activity_template_id,
+                task_template_id=task_template_id,
+                tags=tag_list,
+            )
+            .on_conflict_do_nothing()
+            .returning(PromptBundle)
+            .add_cte(compiled)
+        )
+        bundle = result.scalar_one_or_none()
+        if bundle is not None:
+            invalidate_version_index(bundle_id)
         return bundle
 
     async def get_by_id(self, id: UUID) -> PromptBundle | None:
         """Get bundle by primary key."""
-        result = await self._session.execute(select(PromptBundle).where(PromptBundle.id == id))
+        result = await self._session.execute(
+            select(PromptBundle).where(PromptBundle.id == id)
+        )
         return result.scalar_one_or_none()
 
-    async def get_by_bundle_id_semver(self, bundle_id: str, semver: str) -> PromptBundle | None:
+    async def get_by_bundle_id_semver(
+        self, bundle_id: str, semver: str
+    ) -> PromptBundle | None:
         """Get bundle by (bundle_id, semver)."""
         result = await self._session.execute(
             select(PromptBundle).where(
@@ -55,18 +138,86 @@ class BundleService:
         )
         return result.scalar_one_or_none()
 
+    async def get_by_bundle_hashes(
+        self, bundle_hashes: list[str]
+    ) -> dict[str, PromptBundle]:
+        """
+        Resolve bundle hashes (as stored in audits) to bundles in one indexed query.
+
+        Unknown hashes are absent.
+        """
+        if not bundle_hashes:
+            return {}
+        result = await self._session.execute(
+            select(PromptBundle.bundle_hash, PromptBundle).where(
+                PromptBundle.bundle_hash.in_(bundle_hashes)
+            )
+        )
+        return dict(result.tuples().all())
+
+    async def list_page(
+        self,
+        limit: int,
+        cursor: Cursor | None = None,
+        prefix: str | None = None,
+        tag: str | None = None,
+    ) -> Sequence[Row[Any]]:
+        """
+        One keyset page ordered by (created_at, id).
+
+        Optionally only bundle_ids starting with prefix and bundles tagged with tag.
+        Every listed column is in ix_prompt_bundle_created_at_id (index-only scan); a
+        tag filter may use the GIN index on tags instead.
+        """
+        stmt = select(
+            PromptBundle.id,
+            PromptBundle.bundle_id,
+            PromptBundle.semver,
+            PromptBundle.bundle_hash,
+            PromptBundle.system_template_id,
+            PromptBundle.personality_template_id,
+            PromptBundle.activity_template_id,
+            PromptBundle.task_template_id,
+            PromptBundle.tags,
+            PromptBundle.created_at,
+        )
+        page = after_cursor(PromptBundle.created_at, PromptBundle.id, cursor)
+        if page is not None:
+            stmt = stmt.where(page)
+        if prefix:
+            stmt = stmt.where(
+                PromptBundle.bundle_id.startswith(prefix, autoescape=True)
+            )
+        if tag:
+            stmt = stmt.where(PromptBundle.tags.contains([tag]))
+        result = await self._session.execute(
+            stmt.order_by(PromptBundle.created_at, PromptBundle.id).limit(limit)
+        )
+        return result.all()
+
     async def exists(self, bundle_id: str, semver: str) -> bool:
         """Check if a bundle with (bundle_id, semver) exists (for immutability: no overwrite)."""
         return await self.get_by_bundle_id_semver(bundle_id, semver) is not None
 
     async def is_template_used(self, template_id: UUID) -> bool:
         """Check if any bundle references this template (any of the four template slots)."""
+        return template_id in await self.used_template_ids([template_id])
+
+    async def used_template_ids(self, template_ids: list[UUID]) -> set[UUID]:
+        """
+        Return the subset of template_ids referenced by any bundle.
+
+        One query; each slot uses its own index.
+        """
+        if not template_ids:
+            return set()
+        slots = (
+            PromptBundle.system_template_id,
+            PromptBundle.personality_template_id,
+            PromptBundle.activity_template_id,
+            PromptBundle.task_template_id,
+        )
         result = await self._session.execute(
-            select(PromptBundle.id).where(
-                (PromptBundle.system_template_id == template_id)
-                | (PromptBundle.personality_template_id == template_id)
-                | (PromptBundle.activity_template_id == template_id)
-                | (PromptBundle.task_template_id == template_id),
-            ).limit(1)
+            union(*(select(slot).where(slot.in_(template_ids)) for slot in slots))
         )
-        return result.scalar_one_or_none() is not None
+        return set(result.scalars())
@@ -0,0 +1,315 @@
+"""
+RegistryImporter — bulk import of templates and bundles in one transaction.
+
+Rows are inserted with multi-row INSERTs.
+"""
+
+import uuid
+from dataclasses import dataclass
+from typing import Any, Iterator, Sequence
+from uuid import UUID
+
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hnh_rest.db.models.prompt_bundle import PromptBundle
+from hnh_rest.db.models.prompt_bundle_compiled import PromptBundleCompiled
+from hnh_rest.db.models.prompt_template import PromptTemplate
+from hnh_rest.db.models.prompt_template_content import PromptTemplateContent
+from hnh_rest.services.prompts.renderer import (
+    compute_bundle_hash,
+    compute_content_hash,
+    compute_plan_hash,
+)
+from hnh_rest.services.prompts.versions import invalidate_version_index, semver_key
+
+# Rows per INSERT statement; keeps bind parameters under the Postgres limit (32767).
+_INSERT_CHUNK = 1000
+
+TemplateRef = UUID | tuple[str, str]  # template primary key, or (template_id, semver)
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateImportRow:
+    """Template to import, with its line number in the import stream."""
+
+    line: int
+    template_id: str
+    semver: str
+    role: str
+    content: str
+    constraints: dict[str, Any] | None
+
+
+@dataclass(frozen=True, slots=True)
+class BundleImportRow:
+    """
+    Bundle to import.
+
+    Template slots in assembly order, by id or by (template_id, semver).
+    """
+
+    line: int
+    bundle_id: str
+    semver: str
+    templates: tuple[TemplateRef, TemplateRef, TemplateRef, TemplateRef]
+    tags: list[str]
+
+
+@dataclass(slots=True)
+class ImportResult:
+    """Outcome of one import line: created, exists, duplicate, not_found or invalid."""
+
+    line: int
+    kind: str
+    status: str
+    id: UUID | None = None
+    detail: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class _ResolvedTemplate:
+    id: UUID
+    content_hash: str
+    content: str
+
+
+def _chunks(rows: Sequence[dict[str, Any]]) -> Iterator[Sequence[dict[str, Any]]]:
+    for start in range(0, len(rows), _INSERT_CHUNK):
+        yield rows[start : start + _INSERT_CHUNK]
+
+
+def _ref_label(ref: TemplateRef) -> str:
+    return str(ref) if isinstance(ref, UUID) else f"{ref[0]}@{ref[1]}"
+
+
+class RegistryImporter:
+    """
+    Import many templates and bundles in the caller's transaction.
+
+    Templates come first, so bundles can reference templates from the same import by
+    (template_id, semver). Existing (template_id, semver) / (bundle_id, semver) pairs
+    are skipped, never overwritten.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def run(
+        self, templates: list[TemplateImportRow], bundles: list[BundleImportRow]
+    ) -> list[ImportResult]:
+        """Insert all rows; returns one result per row (templates, then bundles)."""
+        results, imported = await self._import_templates(templates)
+        results.extend(await self._import_bundles(bundles, imported))
+        return results
+
+    async def _import_templates(
+        self,
+        rows: list[TemplateImportRow],
+    ) -> tuple[list[ImportResult], dict[tuple[str, str], _ResolvedTemplate]]:
+        results: list[ImportResult] = []
+        first_line: dict[tuple[str, str], int] = {}
+        pending: dict[tuple[str, str], tuple[TemplateImportRow, _ResolvedTemplate]] = {}
+        for row in rows:
+            key = (row.template_id, row.semver)
+            if key in first_line:
+                results.append(
+                    ImportResult(
+                        row.line,
+                        "template",
+                        "duplicate",
+                        detail=f"duplicate of line {first_line[key]}",
+                    )
+                )
+                continue
+            first_line[key] = row.line
+            pending[key] = (
+                row,
+                _ResolvedTemplate(
+                    uuid.uuid4(), compute_content_hash(row.content), row.content
+                ),
+            )
+
+        blobs = {t.content_hash: t.content for _, t in pending.values()}
+        for chunk in _chunks(
+            [{"content_hash": h, "content": c} for h, c in blobs.items()]
+        ):
+            await self._session.execute(
+                insert(PromptTemplateContent).values(chunk).on_conflict_do_nothing()
+            )
+
+        created: set[UUID] = set()
+        values = [
+            {
+                "id": t.id,
+                "template_id": row.template_id,
+                "semver": row.semver,
+                "role": row.role,
+                "content_hash": t.content_hash,
+                "constraints": row.constraints,
+            }
+            for row, t in pending.values()
+        ]
+        for chunk in _chunks(values):
+            result = await self._session.execute(
+                insert(PromptTemplate)
+                .values(chunk)
+                .on_conflict_do_nothing(
+                    index_elements=[PromptTemplate.template_id, PromptTemplate.semver]
+                )
+                .returning(PromptTemplate.id)
+            )
+            created.update(result.scalars())
+
+        imported: dict[tuple[str, str], _ResolvedTemplate] = {}
+        for key, (row, t) in pending.items():
+            if t.id in created:
+                imported[key] = t
+                results.append(ImportResult(row.line, "template", "created", id=t.id))
+            else:
+                results.append(ImportResult(row.line, "template", "exists"))
+        return results, imported
+
+    async def _import_bundles(
+        self,
+        rows: list[BundleImportRow],
+        imported: dict[tuple[str, str], _ResolvedTemplate],
+    ) -> list[ImportResult]:
+        results: list[ImportResult] = []
+        by_id, by_key = await self._lookup_templates(rows, imported)
+        by_key.update(imported)
+
+        first_line: dict[tuple[str, str], int] = {}
+        resolved: list[tuple[BundleImportRow, UUID, list[_ResolvedTemplate]]] = []
+        for row in rows:
+            key = (row.bundle_id, row.semver)
+            if key in first_line:
+                results.append(
+                    ImportResult(
+                        row.line,
+                        "bundle",
+                        "duplicate",
+                        detail=f"duplicate of line {first_line[key]}",
+                    )
+                )
+                continue
+            first_line[key] = row.line
+            slots = [
+                by_id.get(ref) if isinstance(ref, UUID) else by_key.get(ref)
+                for ref in row.templates
+            ]
+            found = [slot for slot in slots if slot is not None]
+            if len(found) < len(slots):
+                missing = [
+                    _ref_label(ref)
+                    for ref, slot in zip(row.templates, slots, strict=True)
+                    if slot is None
+                ]
+                results.append(
+                    ImportResult(
+                        row.line,
+                        "bundle",
+                        "not_found",
+                        detail=f"Template not found: {', '.join(missing)}",
+                    )
+                )
+                continue
+            resolved.append((row, uuid.uuid4(), found))
+
+        created: set[UUID] = set()
+        values = [
+            {
+                "id": bundle_pk,
+                "bundle_id": row.bundle_id,
+                "semver": row.semver,
+                "semver_key": semver_key(row.semver),
+                "bundle_hash": compute_bundle_hash(row.bundle_id, row.semver),
+                "system_template_id": slots[0].id,
+                "personality_template_id": slots[1].id,
+                "activity_template_id": slots[2].id,
+                "task_template_id": slots[3].id,
+                "tags": row.tags,
+            }
+            for row, bundle_pk, slots in resolved
+        ]
+        for chunk in _chunks(values):
+            result = await self._session.execute(
+                insert(PromptBundle)
+                .values(chunk)
+                .on_conflict_do_nothing()
+                .returning(PromptBundle.id)
+            )
+            created.update(result.scalars())
+
+        compiled = [
+            {
+                "bundle_hash": compute_bundle_hash(row.bundle_id, row.semver),
+                "bundle_pk": bundle_pk,
+                "plan_hash": compute_plan_hash([t.content_hash for t in slots]),
+                "segments": [t.content for t in slots],
+                "tags": row.tags,
+            }
+            for row, bundle_pk, slots in resolved
+            if bundle_pk in created
+        ]
+        for chunk in _chunks(compiled):
+            await self._session.execute(insert(PromptBundleCompiled).values(chunk))
+
+        for row, bundle_pk, _ in resolved:
+            if bundle_pk in created:
+                invalidate_version_index(row.bundle_id)
+                results.append(
+                    ImportResult(row.line, "bundle", "created", id=bundle_pk)
+                )
+            else:
+                results.append(ImportResult(row.line, "bundle", "exists"))
+        return results
+
+    async def _lookup_templates(
+        self,
+        rows: list[BundleImportRow],
+        imported: dict[tuple[str, str], _ResolvedTemplate],
+    ) -> tuple[dict[UUID, _ResolvedTemplate], dict[tuple[str, str], _ResolvedTemplate]]:
+        """Load every referenced template not created by this import in one query."""
+        ids = {ref for row in rows for ref in row.templates if isinstance(ref, UUID)}
+        keys = {
+            ref
+            for row in rows
+            for ref in row.templates
+            if not isinstance(ref, UUID) and ref not in imported
+        }
+        if not ids and not keys:
+            return {}, {}
+        conditions = []
+        if ids:
+            conditions.append(PromptTemplate.id.in_(list(ids)))
+        if keys:
+            conditions.append(
+                tuple_(PromptTemplate.template_id, PromptTemplate.semver).in_(
+                    list(keys)
+                )
+            )
+        result = await self._session.execute(
+            select(
+                PromptTemplate.id,
+                PromptTemplate.template_id,
+                PromptTemplate.semver,
+                PromptTemplate.content_hash,
+                PromptTemplateContent.content,
+            )
+            .join(
+                PromptTemplateContent,
+                PromptTemplateContent.content_hash == PromptTemplate.content_hash,
+            )
+            .where(or_(*conditions))
+        )
+        by_id: dict[UUID, _ResolvedTemplate] = {}
+        by_key: dict[tuple[str, str], _ResolvedTemplate] = {}
+        for row in result:
+            t = _ResolvedTemplate(row.id, row.content_hash, row.content)
+            by_id[row.id] = t
+            by_key[(row.template_id, row.semver)] = t
+        for t in imported.values():
+            by_id[t.id] = t
+        return by_id, by_key
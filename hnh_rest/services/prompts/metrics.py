@@ -0,0 +1,44 @@
+"""
+Prometheus metrics recorded inside prompt services (cache, storage).
+
+HTTP-level metrics live in the web layer.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+render_cache_hits_total = Counter(
+    "render_cache_hits_total",
+    "Render cache hits (distributed Redis render cache)",
+)
+render_cache_misses_total = Counter(
+    "render_cache_misses_total",
+    "Render cache misses (distributed Redis render cache)",
+)
+audit_write_latency_seconds = Histogram(
+    "audit_write_latency_seconds",
+    "Time spent writing one audit batch (dedicated audit pool)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+audit_queue_full_total = Counter(
+    "audit_queue_full_total",
+    "Audit records that waited for room in a full write-behind queue (backpressure)",
+)
+audit_records_dropped_total = Counter(
+    "audit_records_dropped_total",
+    "Audit records lost because their batch could be neither inserted nor spooled",
+)
+audit_records_spooled_total = Counter(
+    "audit_records_spooled_total",
+    "Audit records written to the local spool because the database write failed "
+    "or missed its deadline",
+)
+audit_spool_depth = Gauge(
+    "audit_spool_depth",
+    "Audit records in the local spool waiting to be replayed into prompt_audit",
+    multiprocess_mode="livesum",
+)
+audit_spool_age_seconds = Gauge(
+    "audit_spool_age_seconds",
+    "Age of the oldest audit record in the local spool",
+    multiprocess_mode="livemax",
+)
@@ -0,0 +1,49 @@
+"""Keyset pagination on (created_at, id) — opaque cursors and the page predicate."""
+
+import base64
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import orjson
+from sqlalchemy import ColumnElement, literal, tuple_
+
+Cursor = tuple[datetime, UUID]  # (created_at, id) of the last row of the previous page
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Opaque, URL-safe cursor for the row after which the next page starts."""
+    return (
+        base64.urlsafe_b64encode(orjson.dumps([created_at.isoformat(), str(id)]))
+        .rstrip(b"=")
+        .decode()
+    )
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Parse a cursor from encode_cursor; raises ValueError if it is malformed."""
+    try:
+        created_at, id = orjson.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (TypeError, ValueError) as e:
+        # binascii.Error and orjson.JSONDecodeError are ValueErrors
+        raise ValueError("Invalid cursor") from e
+
+
+def after_cursor(
+    created_at: Any, id: Any, cursor: Cursor | None
+) -> ColumnElement[bool] | None:
+    """
+    Row-value predicate (created_at, id) > cursor.
+
+    One range condition on the (created_at, id) index.
+    """
+    if cursor is None:
+        return None
+    # Bind with the columns' types, so created_at stays timestamptz (a bare tuple binds
+    # a naive timestamp).
+    return tuple_(created_at, id) > tuple_(
+        literal(cursor[0], created_at.type), literal(cursor[1], id.type)
+    )
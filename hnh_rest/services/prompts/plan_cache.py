@@ -0,0 +1,51 @@
+"""
+Compiled plan cache — render-ready bundle contents per bundle_hash, per process.
+
+The cache is LRU-bounded.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPlan:
+    """Contents in assembly order, their combined content hash, and the bundle tags."""
+
+    plan_hash: str
+    segments: tuple[str, ...]
+    tags: frozenset[str]
+
+
+_CACHE_MAXSIZE = 1024
+_cache: OrderedDict[str, CompiledPlan] = OrderedDict()
+_lock = Lock()
+
+
+def get_plan(bundle_hash: str) -> CompiledPlan | None:
+    """
+    Return the cached plan for a bundle, or None.
+
+    Bundles are immutable, so plans never go stale.
+    """
+    with _lock:
+        plan = _cache.get(bundle_hash)
+        if plan is not None:
+            _cache.move_to_end(bundle_hash)
+        return plan
+
+
+def put_plan(bundle_hash: str, plan: CompiledPlan) -> None:
+    """Store a plan; LRU eviction when over maxsize."""
+    with _lock:
+        _cache[bundle_hash] = plan
+        _cache.move_to_end(bundle_hash)
+        if len(_cache) > _CACHE_MAXSIZE:
+            _cache.popitem(last=False)
+
+
+def clear_plans() -> None:
+    """Drop all cached plans."""
+    with _lock:
+        _cache.clear()
@@ -4,7 +4,11 @@ from dataclasses import dataclass
 from typing import Any
 
 from hnh_rest.services.prompts.protocols import AuditSink, BundleSource, TemplateSource
-from hnh_rest.services.prompts.renderer import ASSEMBLY_ORDER, assemble_and_hash
+from hnh_rest.services.prompts.renderer import (
+    ASSEMBLY_ORDER,
+    assemble_and_hash,
+    personality_payload,
+)
 
 
 @dataclass
@@ -19,6 +23,7 @@ class RenderResult:
 class PromptGenerator:
     """
     Renders prompts using configurable bundle/template sources and audit sink.
+
     Same deterministic rules and hashes for DB and inline modes.
     """
 
@@ -56,8 +61,13 @@ class PromptGenerator:
 
         parts_content = [templates_map[tid].content for tid in template_ids]
         rendered_prompt, bundle_hash, personality_hash = assemble_and_hash(
-            bundle_id, bundle_version, parts_content,
-            semantic_traits, activity_level, stress, task,
+            bundle_id,
+            bundle_version,
+            parts_content,
+            semantic_traits,
+            activity_level,
+            stress,
+            task,
         )
         await self._audit_sink.record(
             bundle_hash=bundle_hash,
@@ -65,6 +75,9 @@ class PromptGenerator:
             rendered_prompt=rendered_prompt,
             engine_version=engine_version,
             adapter_version=adapter_version,
+            personality_payload=personality_payload(
+                semantic_traits, activity_level, stress, task
+            ),
         )
         return RenderResult(
             rendered_prompt=rendered_prompt,
@@ -89,8 +102,13 @@ class PromptGenerator:
         No DB. Same hash as render_from_bundle for equivalent content.
         """
         rendered_prompt, bundle_hash, personality_hash = assemble_and_hash(
-            bundle_id, semver, parts_content,
-            semantic_traits, activity_level, stress, task,
+            bundle_id,
+            semver,
+            parts_content,
+            semantic_traits,
+            activity_level,
+            stress,
+            task,
         )
         await self._audit_sink.record(
             bundle_hash=bundle_hash,
@@ -98,9 +116,12 @@ class PromptGenerator:
             rendered_prompt=rendered_prompt,
             engine_version=engine_version,
             adapter_version=adapter_version,
+            personality_payload=personality_payload(
+                semantic_traits, activity_level, stress, task
+            ),
         )
         return RenderResult(
             rendered_prompt=rendered_prompt,
             bundle_hash=bundle_hash,
             personality_hash=personality_hash,
-        )
\ No newline at end of file
+        )
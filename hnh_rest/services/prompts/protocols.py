@@ -12,19 +12,42 @@ class TemplateSource(Protocol):
         ...
 
     async def get_templates_by_ids(self, ids: list) -> dict:
-        """Return dict id -> template data (with .content) for batch load. Used when bundle supplies UUIDs."""
+        """
+        Return dict id -> template data (with .content) for batch load.
+
+        Used when bundle supplies UUIDs.
+        """
         ...
 
 
 @runtime_checkable
 class BundleSource(Protocol):
-    """Source of bundle data by (bundle_id, semver). Returned value must have 4 template IDs in order."""
+    """
+    Source of bundle data by (bundle_id, semver).
+
+    Returned value must have 4 template IDs in order.
+    """
 
     async def get_bundle(self, bundle_id: str, semver: str) -> Any:
         """Return bundle data with .bundle_id, .semver, .system_template_id, .personality_template_id, .activity_template_id, .task_template_id."""
         ...
 
 
+@runtime_checkable
+class CompiledBundleSource(Protocol):
+    """Source of compiled bundle rows by bundle_hash (denormalized, render-ready)."""
+
+    async def get_compiled(
+        self, bundle_hash: str
+    ) -> tuple[str, list[str], list[str]] | None:
+        """
+        Return (plan_hash, segments in assembly order, tags).
+
+        None if the bundle does not exist.
+        """
+        ...
+
+
 @runtime_checkable
 class AuditSink(Protocol):
     """Sink for audit records (DB or no-op). Must not affect prompt hash."""
@@ -34,8 +57,14 @@ class AuditSink(Protocol):
         bundle_hash: str,
         personality_hash: str,
         rendered_prompt: str,
+        *,
         engine_version: str | None = None,
         adapter_version: str | None = None,
+        personality_payload: dict[str, Any] | None = None,
     ) -> None:
-        """Record a render for audit/replay. No-op allowed."""
+        """
+        Record a render for audit/replay.
+
+        personality_payload is the canonical render input. No-op allowed.
+        """
         ...
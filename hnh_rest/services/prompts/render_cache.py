@@ -0,0 +1,98 @@
+"""Distributed render cache — rendered prompts shared by all workers via Redis."""
+
+import logging
+import zlib
+
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import RedisError
+
+from hnh_rest.services.prompts.metrics import (
+    render_cache_hits_total,
+    render_cache_misses_total,
+)
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "hnh:render:v2:"
+
+
+class RedisRenderCache:
+    """
+    Rendered prompts in Redis keyed by (plan_hash, personality_hash).
+
+    Bundles and versions with identical template contents share entries. Values are
+    zlib-compressed and expire after a TTL. Redis errors degrade to a miss, never to a
+    failed render.
+    """
+
+    def __init__(
+        self, pool: ConnectionPool, ttl_seconds: int, compress_level: int = 6
+    ) -> None:
+        self._pool = pool
+        self._ttl = ttl_seconds
+        self._level = compress_level
+
+    @staticmethod
+    def _key(plan_hash: str, personality_hash: str) -> str:
+        return f"{_KEY_PREFIX}{plan_hash}:{personality_hash}"
+
+    def _encode(self, rendered_prompt: str) -> bytes:
+        return zlib.compress(rendered_prompt.encode(), self._level)
+
+    @staticmethod
+    def _decode(raw: bytes | None) -> str | None:
+        if raw is None:
+            render_cache_misses_total.inc()
+            return None
+        render_cache_hits_total.inc()
+        return zlib.decompress(raw).decode()
+
+    async def get(self, plan_hash: str, personality_hash: str) -> str | None:
+        """Return the cached prompt or None on miss."""
+        return (await self.get_many([(plan_hash, personality_hash)]))[0]
+
+    async def get_many(self, keys: list[tuple[str, str]]) -> list[str | None]:
+        """
+        Look up many (plan_hash, personality_hash) pairs in one pipelined round trip.
+
+        Order preserved.
+        """
+        if not keys:
+            return []
+        try:
+            async with Redis(connection_pool=self._pool) as redis:
+                pipe = redis.pipeline(transaction=False)
+                for plan_hash, personality_hash in keys:
+                    pipe.get(self._key(plan_hash, personality_hash))
+                raws = await pipe.execute()
+        except RedisError as e:
+            logger.warning("Render cache lookup failed: %s", e)
+            return [None] * len(keys)
+        return [self._decode(raw) for raw in raws]
+
+    async def set(
+        self, plan_hash: str, personality_hash: str, rendered_prompt: str
+    ) -> None:
+        """Store one render with the configured TTL."""
+        await self.set_many([(plan_hash, personality_hash, rendered_prompt)])
+
+    async def set_many(self, entries: list[tuple[str, str, str]]) -> None:
+        """
+        Store many (plan_hash, personality_hash, rendered_prompt) entries.
+
+        One pipelined round trip.
+        """
+        if not entries:
+            return
+        try:
+            async with Redis(connection_pool=self._pool) as redis:
+                pipe = redis.pipeline(transaction=False)
+                for plan_hash, personality_hash, rendered_prompt in entries:
+                    pipe.set(
+                        self._key(plan_hash, personality_hash),
+                        self._encode(rendered_prompt),
+                        ex=self._ttl,
+                    )
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Render cache store failed: %s", e)
@@ -1,17 +1,18 @@
-"""RendererService — deterministic prompt assembly and audit."""
+"""RendererService — deterministic prompt assembly."""
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
 import orjson
 import xxhash
-
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from hnh_rest.db.models.prompt_bundle import PromptBundle
-from hnh_rest.db.models.prompt_template import PromptTemplate
-from hnh_rest.services.prompts.constraints_cache import get_compiled_constraints
+from hnh_rest.db.models.prompt_bundle_compiled import PromptBundleCompiled
+from hnh_rest.services.prompts.plan_cache import CompiledPlan, get_plan, put_plan
+from hnh_rest.services.prompts.protocols import CompiledBundleSource
+from hnh_rest.services.prompts.render_cache import RedisRenderCache
 
 
 class BundleUnsupportedModelError(ValueError):
@@ -43,26 +44,58 @@ class _RenderContext:
     semantic_traits_json: str
 
 
-def _personality_hash(semantic_traits: dict[str, Any], activity_level: float, stress: float, task: str) -> str:
-    """Deterministic hash of personality/render input for replay identity (xxh3_128, non-crypto)."""
-    payload = {
+def personality_payload(
+    semantic_traits: dict[str, Any],
+    activity_level: float,
+    stress: float,
+    task: str,
+) -> dict[str, Any]:
+    """
+    Canonical render input (traits with sorted keys).
+
+    assemble(**payload) rebuilds the prompt from its bundle.
+    """
+    return {
         "semantic_traits": _sort_dict(semantic_traits),
         "activity_level": activity_level,
         "stress": stress,
         "task": task,
     }
+
+
+def _personality_hash(
+    semantic_traits: dict[str, Any], activity_level: float, stress: float, task: str
+) -> str:
+    """Deterministic hash of the render input for replay identity (xxh3_128)."""
+    payload = personality_payload(semantic_traits, activity_level, stress, task)
     canonical = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
     return xxhash.xxh3_128(canonical).hexdigest()
 
 
-def _bundle_hash(bundle_id: str, semver: str) -> str:
+def compute_bundle_hash(bundle_id: str, semver: str) -> str:
     """Deterministic hash identifying the bundle version (xxh3_128, non-crypto)."""
     return xxhash.xxh3_128(f"{bundle_id}:{semver}".encode()).hexdigest()
 
 
+def compute_content_hash(content: str) -> str:
+    """Content address of a template text (xxh3_128, non-crypto)."""
+    return xxhash.xxh3_128(content.encode()).hexdigest()
+
+
+def compute_plan_hash(content_hashes: Sequence[str]) -> str:
+    """
+    Hash of the contents in assembly order.
+
+    Equal for any bundles whose four texts are identical.
+    """
+    return xxhash.xxh3_128(":".join(content_hashes).encode()).hexdigest()
+
+
 def _sort_dict(d: dict[str, Any]) -> dict[str, Any]:
     """Recursively sort dict keys for canonical JSON."""
-    return {k: _sort_dict(v) if isinstance(v, dict) else v for k, v in sorted(d.items())}
+    return {
+        k: _sort_dict(v) if isinstance(v, dict) else v for k, v in sorted(d.items())
+    }
 
 
 def _substitute(content: str, context: _RenderContext) -> str:
@@ -74,23 +107,45 @@ def _substitute(content: str, context: _RenderContext) -> str:
     return content
 
 
-def assemble_and_hash(
+def render_hashes(
     bundle_id: str,
     semver: str,
-    parts_content: list[str],
+    *,
     semantic_traits: dict[str, Any],
     activity_level: float,
     stress: float,
     task: str,
-) -> tuple[str, str, str]:
+) -> tuple[str, str]:
+    """
+    Return (bundle_hash, personality_hash) for a render.
+
+    Needs no templates, so usable as a cache key.
+    """
+    return compute_bundle_hash(bundle_id, semver), _personality_hash(
+        semantic_traits, activity_level, stress, task
+    )
+
+
+def assemble(
+    parts_content: Sequence[str],
+    semantic_traits: dict[str, Any],
+    activity_level: float,
+    stress: float,
+    task: str,
+) -> str:
     """
-    Pure deterministic assembly: 4 content strings in order (system, personality, activity, task),
-    plus payload. Returns (rendered_prompt, bundle_hash, personality_hash).
-    Shared by DB and non-DB paths.
+    Substitute payload into the 4 content strings and join them.
+
+    Contents are in assembly order: system, personality, activity, task.
     """
     if len(parts_content) != 4:
-        raise ValueError("parts_content must have exactly 4 parts (system, personality, activity, task)")
-    traits_json = orjson.dumps(_sort_dict(semantic_traits), option=orjson.OPT_SORT_KEYS).decode()
+        raise ValueError(
+            "parts_content must have exactly 4 parts "
+            "(system, personality, activity, task)"
+        )
+    traits_json = orjson.dumps(
+        _sort_dict(semantic_traits), option=orjson.OPT_SORT_KEYS
+    ).decode()
     context = _RenderContext(
         task=task,
         activity_level=str(activity_level),
@@ -98,17 +153,65 @@ def assemble_and_hash(
         semantic_traits_json=traits_json,
     )
     parts = [_substitute(c, context) for c in parts_content]
-    rendered_prompt = "\n\n".join(parts)
-    b_hash = _bundle_hash(bundle_id, semver)
-    p_hash = _personality_hash(semantic_traits, activity_level, stress, task)
+    return "\n\n".join(parts)
+
+
+def assemble_and_hash(
+    bundle_id: str,
+    semver: str,
+    parts_content: list[str],
+    semantic_traits: dict[str, Any],
+    activity_level: float,
+    stress: float,
+    task: str,
+) -> tuple[str, str, str]:
+    """
+    Pure deterministic assembly of the 4 content strings plus payload.
+
+    Contents are in assembly order: system, personality, activity, task. Returns
+    (rendered_prompt, bundle_hash, personality_hash). Shared by DB and non-DB paths.
+    """
+    rendered_prompt = assemble(
+        parts_content, semantic_traits, activity_level, stress, task
+    )
+    b_hash, p_hash = render_hashes(
+        bundle_id,
+        semver,
+        semantic_traits=semantic_traits,
+        activity_level=activity_level,
+        stress=stress,
+        task=task,
+    )
     return rendered_prompt, b_hash, p_hash
 
 
+@dataclass(frozen=True)
+class RenderInput:
+    """One render request for RendererService.render_many."""
+
+    bundle_id: str
+    semver: str
+    semantic_traits: dict[str, Any]
+    activity_level: float
+    stress: float
+    task: str
+    model_type: str | None = None
+
+
 class RendererService:
-    """Assemble prompts in deterministic order and record audit."""
+    """Assemble prompts in deterministic order; auditing is left to the caller."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        render_cache: RedisRenderCache | None = None,
+        fast_source: CompiledBundleSource | None = None,
+        fallback_session: AsyncSession | None = None,
+    ) -> None:
         self._session = session
+        self._render_cache = render_cache
+        self._fast_source = fast_source
+        self._fallback_session = fallback_session
 
     async def render(
         self,
@@ -119,52 +222,133 @@ class RendererService:
         stress: float,
         task: str,
         model_type: str | None = None,
-        engine_version: str | None = None,
-        adapter_version: str | None = None,
     ) -> tuple[str, str, str]:
         """
-        Load bundle and templates (single query for templates), assemble in fixed order.
-        Order: system → personality → activity → task; parts joined by "\\n\\n".
-        If model_type is provided (non-empty after strip), bundle must have it in tags.
+        Load the compiled bundle (single primary-key lookup), assemble in fixed order.
+
+        Order: system → personality → activity → task; parts joined by "\\n\\n". If
+        model_type is provided (non-empty after strip), bundle must have it in tags.
+        With a render cache and a cached plan, a hit is served without touching the
+        database.
         """
-        bundle = await self._get_bundle(bundle_id, semver)
-        if bundle is None:
-            raise ValueError(f"Bundle not found: {bundle_id}@{semver}")
+        results = await self.render_many(
+            [
+                RenderInput(
+                    bundle_id,
+                    semver,
+                    semantic_traits,
+                    activity_level,
+                    stress,
+                    task,
+                    model_type,
+                )
+            ],
+        )
+        return results[0]
 
-        if model_type is not None and (mt := model_type.strip()):
-            tags_list = bundle.tags if isinstance(bundle.tags, list) else list(bundle.tags or [])
-            if mt not in tags_list:
-                raise BundleUnsupportedModelError(bundle_id, semver, mt)
+    async def render_many(
+        self, inputs: list[RenderInput]
+    ) -> list[tuple[str, str, str]]:
+        """
+        Render several requests.
+
+        Returns (rendered_prompt, bundle_hash, personality_hash) per input, in order.
+        Each distinct bundle's plan comes from the in-process plan cache or one database
+        lookup. Cache lookups and stores are each one pipelined Redis round trip, keyed
+        by plan_hash.
+        """
+        hashes = [
+            render_hashes(
+                i.bundle_id,
+                i.semver,
+                semantic_traits=i.semantic_traits,
+                activity_level=i.activity_level,
+                stress=i.stress,
+                task=i.task,
+            )
+            for i in inputs
+        ]
+        plans: dict[str, CompiledPlan] = {}
+        for inp, (b_hash, _) in zip(inputs, hashes, strict=True):
+            if b_hash not in plans:
+                plans[b_hash] = await self._load_plan(inp.bundle_id, inp.semver, b_hash)
+            _check_model_type(inp, plans[b_hash].tags)
+
+        if self._render_cache is not None:
+            cached = await self._render_cache.get_many(
+                [(plans[b_hash].plan_hash, p_hash) for b_hash, p_hash in hashes]
+            )
+        else:
+            cached = [None] * len(inputs)
+
+        to_store: list[tuple[str, str, str]] = []
+        results: list[tuple[str, str, str]] = []
+        for inp, (b_hash, p_hash), hit in zip(inputs, hashes, cached, strict=True):
+            if hit is not None:
+                results.append((hit, b_hash, p_hash))
+                continue
+            plan = plans[b_hash]
+            rendered_prompt = assemble(
+                plan.segments,
+                inp.semantic_traits,
+                inp.activity_level,
+                inp.stress,
+                inp.task,
+            )
+            to_store.append((plan.plan_hash, p_hash, rendered_prompt))
+            results.append((rendered_prompt, b_hash, p_hash))
 
-        template_ids = [getattr(bundle, attr) for attr in ASSEMBLY_ORDER]
-        templates_map = await self._get_templates_by_ids(template_ids)
-        for tid in template_ids:
-            if tid not in templates_map:
-                raise ValueError(f"Template not found: {tid}")
+        if self._render_cache is not None:
+            await self._render_cache.set_many(to_store)
+        return results
 
-        for t in templates_map.values():
-            get_compiled_constraints(t.template_id, t.semver, t.constraints)
+    async def _load_plan(
+        self, bundle_id: str, semver: str, bundle_hash: str
+    ) -> CompiledPlan:
+        """
+        Return the compiled plan for a bundle.
 
-        parts_content = [templates_map[tid].content for tid in template_ids]
-        return assemble_and_hash(
-            bundle_id, semver, parts_content,
-            semantic_traits, activity_level, stress, task,
+        From the plan cache, else one primary-key lookup of the compiled row. Uses the
+        asyncpg fast path when configured. A miss is retried on the fallback (primary)
+        session, since a replica may lag a fresh bundle.
+        """
+        plan = get_plan(bundle_hash)
+        if plan is not None:
+            return plan
+        if self._fast_source is not None:
+            compiled = await self._fast_source.get_compiled(bundle_hash)
+        else:
+            compiled = await _select_compiled(self._session, bundle_hash)
+        if compiled is None and self._fallback_session is not None:
+            compiled = await _select_compiled(self._fallback_session, bundle_hash)
+        if compiled is None:
+            raise ValueError(f"Bundle not found: {bundle_id}@{semver}")
+        plan_hash, segments, tags = compiled
+        plan = CompiledPlan(
+            plan_hash=plan_hash, segments=tuple(segments), tags=frozenset(tags)
         )
-
-    async def _get_bundle(self, bundle_id: str, semver: str) -> PromptBundle | None:
-        """Load bundle by (bundle_id, semver). Indexed lookup."""
-        result = await self._session.execute(
-            select(PromptBundle).where(
-                PromptBundle.bundle_id == bundle_id,
-                PromptBundle.semver == semver,
-            )
+        put_plan(bundle_hash, plan)
+        return plan
+
+
+async def _select_compiled(
+    session: AsyncSession, bundle_hash: str
+) -> tuple[str, list[str], list[str]] | None:
+    """Primary-key lookup of (plan_hash, segments, tags) in prompt_bundle_compiled."""
+    result = await session.execute(
+        select(
+            PromptBundleCompiled.plan_hash,
+            PromptBundleCompiled.segments,
+            PromptBundleCompiled.tags,
+        ).where(
+            PromptBundleCompiled.bundle_hash == bundle_hash,
         )
-        return result.scalar_one_or_none()
-
-    async def _get_templates_by_ids(self, ids: list) -> dict:
-        """Load multiple templates in one query; avoid N+1."""
-        if not ids:
-            return {}
-        result = await self._session.execute(select(PromptTemplate).where(PromptTemplate.id.in_(ids)))
-        rows = result.scalars().all()
-        return {r.id: r for r in rows}
\ No newline at end of file
+    )
+    row = result.one_or_none()
+    return None if row is None else (row.plan_hash, row.segments, row.tags)
+
+
+def _check_model_type(inp: RenderInput, tags: frozenset[str]) -> None:
+    """Raise if a requested non-empty model_type is not among the bundle's tags."""
+    if inp.model_type is not None and (mt := inp.model_type.strip()) and mt not in tags:
+        raise BundleUnsupportedModelError(inp.bundle_id, inp.semver, mt)
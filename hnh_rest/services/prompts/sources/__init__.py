@@ -1,6 +1,17 @@
 """Prompt sources — DB and inline implementations."""
 
 from hnh_rest.services.prompts.sources.db import DbBundleSource, DbTemplateSource
-from hnh_rest.services.prompts.sources.inline import InlineBundleSource, InlineTemplateSource
+from hnh_rest.services.prompts.sources.inline import (
+    InlineBundleSource,
+    InlineTemplateSource,
+)
+from hnh_rest.services.prompts.sources.pg import PgBundleSource, PgTemplateSource
 
-__all__ = ["DbBundleSource", "DbTemplateSource", "InlineBundleSource", "InlineTemplateSource"]
+__all__ = [
+    "DbBundleSource",
+    "DbTemplateSource",
+    "InlineBundleSource",
+    "InlineTemplateSource",
+    "PgBundleSource",
+    "PgTemplateSource",
+]
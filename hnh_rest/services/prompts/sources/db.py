@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from hnh_rest.db.models.prompt_bundle import PromptBundle
+from hnh_rest.db.models.prompt_bundle_compiled import PromptBundleCompiled
 from hnh_rest.db.models.prompt_template import PromptTemplate
 from hnh_rest.services.prompts.renderer import ASSEMBLY_ORDER
 
@@ -24,6 +25,22 @@ class DbBundleSource:
         )
         return result.scalar_one_or_none()
 
+    async def get_compiled(
+        self, bundle_hash: str
+    ) -> tuple[str, list[str], list[str]] | None:
+        """Load (plan_hash, segments, tags) of a compiled bundle by primary key."""
+        result = await self._session.execute(
+            select(
+                PromptBundleCompiled.plan_hash,
+                PromptBundleCompiled.segments,
+                PromptBundleCompiled.tags,
+            ).where(
+                PromptBundleCompiled.bundle_hash == bundle_hash,
+            )
+        )
+        row = result.one_or_none()
+        return None if row is None else (row.plan_hash, row.segments, row.tags)
+
 
 class DbTemplateSource:
     """Template source that loads from the database."""
@@ -31,7 +48,9 @@ class DbTemplateSource:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
-    async def get_template(self, template_id: str, semver: str) -> PromptTemplate | None:
+    async def get_template(
+        self, template_id: str, semver: str
+    ) -> PromptTemplate | None:
         """Load template by (template_id, semver)."""
         result = await self._session.execute(
             select(PromptTemplate).where(
@@ -45,6 +64,8 @@ class DbTemplateSource:
         """Load multiple templates in one query; avoid N+1."""
         if not ids:
             return {}
-        result = await self._session.execute(select(PromptTemplate).where(PromptTemplate.id.in_(ids)))
+        result = await self._session.execute(
+            select(PromptTemplate).where(PromptTemplate.id.in_(ids))
+        )
         rows = result.scalars().all()
         return {r.id: r for r in rows}
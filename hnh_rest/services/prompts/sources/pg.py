@@ -0,0 +1,125 @@
+"""
+asyncpg fast path for render reads — pooled connections, prepared statements.
+
+Rows are returned as slotted records.
+
+Each query is a fixed SQL string; asyncpg prepares it once per connection and reuses it
+from the connection's statement cache. No SQLAlchemy compilation, ORM hydration or
+greenlet switch.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+import asyncpg
+import orjson
+
+_BUNDLE_SQL = (
+    "SELECT id, bundle_id, semver, system_template_id, personality_template_id, "
+    "activity_template_id, task_template_id, tags "
+    "FROM prompt_bundle WHERE bundle_id = $1 AND semver = $2"
+)
+_COMPILED_SQL = (
+    "SELECT plan_hash, segments, tags FROM prompt_bundle_compiled "
+    "WHERE bundle_hash = $1"
+)
+_TEMPLATE_SQL = (
+    "SELECT t.id, t.template_id, t.semver, c.content, t.constraints "
+    "FROM prompt_template t "
+    "JOIN prompt_template_content c ON c.content_hash = t.content_hash "
+    "WHERE t.template_id = $1 AND t.semver = $2"
+)
+_TEMPLATES_BY_IDS_SQL = (
+    "SELECT t.id, t.template_id, t.semver, c.content, t.constraints "
+    "FROM prompt_template t "
+    "JOIN prompt_template_content c ON c.content_hash = t.content_hash "
+    "WHERE t.id = ANY($1::uuid[])"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class BundleRecord:
+    """Bundle columns the render path reads; 4 template IDs in assembly order."""
+
+    id: UUID
+    bundle_id: str
+    semver: str
+    system_template_id: UUID
+    personality_template_id: UUID
+    activity_template_id: UUID
+    task_template_id: UUID
+    tags: list[str]
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateRecord:
+    """Template columns the render path reads."""
+
+    id: UUID
+    template_id: str
+    semver: str
+    content: str
+    constraints: dict[str, Any] | None
+
+
+async def init_connection(conn: asyncpg.Connection) -> None:
+    """
+    Pool init hook: decode JSONB with orjson.
+
+    Tags, segments and constraints thus arrive as Python objects.
+    """
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=lambda v: orjson.dumps(v).decode(),
+        decoder=orjson.loads,
+        schema="pg_catalog",
+    )
+
+
+class PgBundleSource:
+    """
+    Bundle source over an asyncpg pool (BundleSource protocol).
+
+    Also provides the compiled-row lookup.
+    """
+
+    def __init__(self, pool: asyncpg.Pool) -> None:
+        self._pool = pool
+
+    async def get_bundle(self, bundle_id: str, semver: str) -> BundleRecord | None:
+        """Load bundle by (bundle_id, semver). Indexed lookup."""
+        async with self._pool.acquire() as conn:
+            row = await conn.fetchrow(_BUNDLE_SQL, bundle_id, semver)
+        return None if row is None else BundleRecord(*row)
+
+    async def get_compiled(
+        self, bundle_hash: str
+    ) -> tuple[str, list[str], list[str]] | None:
+        """Load (plan_hash, segments, tags) of a compiled bundle by primary key."""
+        async with self._pool.acquire() as conn:
+            row = await conn.fetchrow(_COMPILED_SQL, bundle_hash)
+        return None if row is None else (row[0], row[1], row[2])
+
+
+class PgTemplateSource:
+    """Template source over an asyncpg pool (TemplateSource protocol)."""
+
+    def __init__(self, pool: asyncpg.Pool) -> None:
+        self._pool = pool
+
+    async def get_template(
+        self, template_id: str, semver: str
+    ) -> TemplateRecord | None:
+        """Load template by (template_id, semver)."""
+        async with self._pool.acquire() as conn:
+            row = await conn.fetchrow(_TEMPLATE_SQL, template_id, semver)
+        return None if row is None else TemplateRecord(*row)
+
+    async def get_templates_by_ids(self, ids: list[UUID]) -> dict[UUID, TemplateRecord]:
+        """Load multiple templates in one query; avoid N+1."""
+        if not ids:
+            return {}
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(_TEMPLATES_BY_IDS_SQL, ids)
+        return {row[0]: TemplateRecord(*row) for row in rows}
@@ -1,11 +1,17 @@
 """TemplateService — CRUD for prompt templates."""
 
-from uuid import UUID
+from typing import Any, Sequence
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, delete, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from hnh_rest.db.models.prompt_template import PromptTemplate
+from hnh_rest.db.models.prompt_template_content import PromptTemplateContent
+from hnh_rest.services.prompts.pagination import Cursor, after_cursor
+from hnh_rest.services.prompts.renderer import compute_content_hash
 
 
 class TemplateService:
@@ -21,26 +27,57 @@ class TemplateService:
         role: str,
         content: str,
         constraints: dict | None = None,
-    ) -> PromptTemplate:
-        """Create a new template. Raises if (template_id, semver) already exists."""
-        template = PromptTemplate(
-            template_id=template_id,
-            semver=semver,
-            role=role,
-            content=content,
-            constraints=constraints,
+    ) -> PromptTemplate | None:
+        """
+        Create a new template in one statement.
+
+        Returns None if (template_id, semver) already exists. Content is stored once per
+        distinct text; a version with unchanged content reuses the existing blob.
+        """
+        content_hash = compute_content_hash(content)
+        blob = (
+            insert(PromptTemplateContent)
+            .values(content_hash=content_hash, content=content)
+            .on_conflict_do_nothing(index_elements=[PromptTemplateContent.content_hash])
+            .cte("blob")
         )
-        self._session.add(template)
-        await self._session.flush()
-        await self._session.refresh(template)
+        result = await self._session.execute(
+            insert(PromptTemplate)
+            .values(
+                id=uuid4(),
+                template_id=template_id,
+                semver=semver,
+                role=role,
+                content_hash=content_hash,
+                constraints=constraints,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[PromptTemplate.template_id, PromptTemplate.semver]
+            )
+            .returning(PromptTemplate)
+            .add_cte(blob)
+        )
+        template = result.scalar_one_or_none()
+        if template is not None:
+            # RETURNING cannot join the blob; its content is known, so attach it without
+            # a query.
+            set_committed_value(
+                template,
+                "blob",
+                PromptTemplateContent(content_hash=content_hash, content=content),
+            )
         return template
 
     async def get_by_id(self, id: UUID) -> PromptTemplate | None:
         """Get template by primary key."""
-        result = await self._session.execute(select(PromptTemplate).where(PromptTemplate.id == id))
+        result = await self._session.execute(
+            select(PromptTemplate).where(PromptTemplate.id == id)
+        )
         return result.scalar_one_or_none()
 
-    async def get_by_template_id_semver(self, template_id: str, semver: str) -> PromptTemplate | None:
+    async def get_by_template_id_semver(
+        self, template_id: str, semver: str
+    ) -> PromptTemplate | None:
         """Get template by (template_id, semver)."""
         result = await self._session.execute(
             select(PromptTemplate).where(
@@ -50,6 +87,46 @@ class TemplateService:
         )
         return result.scalar_one_or_none()
 
+    async def list_page(
+        self,
+        limit: int,
+        cursor: Cursor | None = None,
+        prefix: str | None = None,
+        include_content: bool = False,
+    ) -> Sequence[Row[Any]]:
+        """
+        One keyset page ordered by (created_at, id).
+
+        Optionally only template_ids starting with prefix. Without content the page is
+        an index-only scan of ix_prompt_template_created_at_id; content and constraints
+        are joined only when requested.
+        """
+        stmt: Select[Any] = select(
+            PromptTemplate.id,
+            PromptTemplate.template_id,
+            PromptTemplate.semver,
+            PromptTemplate.role,
+            PromptTemplate.created_at,
+        )
+        if include_content:
+            stmt = stmt.add_columns(
+                PromptTemplateContent.content, PromptTemplate.constraints
+            ).join(
+                PromptTemplateContent,
+                PromptTemplateContent.content_hash == PromptTemplate.content_hash,
+            )
+        page = after_cursor(PromptTemplate.created_at, PromptTemplate.id, cursor)
+        if page is not None:
+            stmt = stmt.where(page)
+        if prefix:
+            stmt = stmt.where(
+                PromptTemplate.template_id.startswith(prefix, autoescape=True)
+            )
+        result = await self._session.execute(
+            stmt.order_by(PromptTemplate.created_at, PromptTemplate.id).limit(limit)
+        )
+        return result.all()
+
     async def delete_by_id(self, id: UUID) -> bool:
         """Delete template by id. Returns True if deleted, False if not found."""
         template = await self.get_by_id(id)
@@ -58,3 +135,18 @@ class TemplateService:
         await self._session.delete(template)
         await self._session.flush()
         return True
+
+    async def delete_many(self, ids: list[UUID]) -> set[UUID]:
+        """
+        Delete templates by id in one statement.
+
+        Returns the ids that existed and were deleted.
+        """
+        if not ids:
+            return set()
+        result = await self._session.execute(
+            delete(PromptTemplate)
+            .where(PromptTemplate.id.in_(ids))
+            .returning(PromptTemplate.id)
+        )
+        return set(result.scalars())
@@ -0,0 +1,353 @@
+"""
+Semver keys, ranges and channels.
+
+A version spec is resolved (optionally by model tag) against an in-memory version index.
+"""
+
+import bisect
+import re
+import time
+from dataclasses import dataclass
+from threading import Lock
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hnh_rest.db.models.prompt_bundle import PromptBundle
+
+# Strict semver: major.minor.patch with optional -prerelease and +build
+SEMVER_PATTERN = re.compile(
+    r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
+    r"(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
+    r"(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
+)
+# Partial versions in ranges: 1, 1.2, 1.2.3, 1.x, 1.2.*
+_PARTIAL_PATTERN = re.compile(
+    r"^(0|[1-9]\d*)(?:\.(0|[1-9]\d*|[xX*]))?(?:\.(0|[1-9]\d*|[xX*]))?$"
+)
+
+STABLE = "stable"  # highest release (no prerelease)
+LATEST = "latest"  # highest version, prereleases included
+_RELEASE = "~"  # sorts after every prerelease encoding
+
+SEMVER_KEY_MAX_LENGTH = 255
+
+
+def _num(n: int) -> str:
+    """Length-prefixed number: string order equals numeric order (up to 99 digits)."""
+    s = str(n)
+    return f"{len(s):02d}{s}"
+
+
+def semver_key(semver: str) -> str:
+    """
+    Sortable key with semver precedence: string order of keys equals version order.
+
+    major.minor.patch are length-prefixed numbers; a release sorts after all its
+    prereleases; prerelease identifiers compare numeric < alphanumeric, shorter prefix
+    first. Build metadata is ignored.
+    """
+    m = SEMVER_PATTERN.match(semver)
+    if m is None:
+        raise ValueError(f"Invalid semver: {semver}")
+    major, minor, patch, prerelease = int(m[1]), int(m[2]), int(m[3]), m[4]
+    core = f"{_num(major)}{_num(minor)}{_num(patch)}"
+    if prerelease is None:
+        return f"{core}{_RELEASE}"
+    # Space separates identifiers: it sorts below every identifier character, so "a" <
+    # "a.b" < "a-b".
+    ids = " ".join(
+        f"0{_num(int(p))}" if p.isdigit() else f"1{p}" for p in prerelease.split(".")
+    )
+    return f"{core}-{ids}"
+
+
+@dataclass(frozen=True, slots=True)
+class VersionRange:
+    """
+    Half-open key range [lower, upper).
+
+    Prereleases only match when the range was written with one.
+    """
+
+    lower: str
+    upper: str | None
+    include_prerelease: bool
+
+
+def _core_key(major: int, minor: int, patch: int) -> str:
+    """Lowest key of major.minor.patch (below its prereleases)."""
+    return f"{_num(major)}{_num(minor)}{_num(patch)}"
+
+
+@dataclass(frozen=True, slots=True)
+class _Bound:
+    """Lower bound of a range: the version parts, how many were given, and its key."""
+
+    major: int
+    minor: int
+    patch: int
+    parts: int
+    has_prerelease: bool
+    lower: str
+
+
+def _parse_bound(spec: str) -> _Bound | None:
+    """
+    Full (1.2.3-rc.1) or partial (1, 1.2, 1.x, 1.2.*) version.
+
+    None if spec is neither.
+    """
+    full = SEMVER_PATTERN.match(spec)
+    if full is not None:
+        major, minor, patch = int(full[1]), int(full[2]), int(full[3])
+        return _Bound(major, minor, patch, 3, full[4] is not None, semver_key(spec))
+    m = _PARTIAL_PATTERN.match(spec)
+    if m is None:
+        return None
+    wildcard = [p is None or p in ("x", "X", "*") for p in (m[2], m[3])]
+    parts = 1 if wildcard[0] else (2 if wildcard[1] else 3)
+    major = int(m[1])
+    minor = 0 if wildcard[0] else int(m[2])
+    patch = 0 if wildcard[1] or wildcard[0] else int(m[3])
+    return _Bound(major, minor, patch, parts, False, _core_key(major, minor, patch))
+
+
+def _caret_upper(bound: _Bound) -> str:
+    """Caret allows changes that do not modify the left-most non-zero part."""
+    if bound.major > 0 or bound.parts == 1:
+        return _core_key(bound.major + 1, 0, 0)
+    if bound.minor > 0 or bound.parts == 2:
+        return _core_key(0, bound.minor + 1, 0)
+    return _core_key(0, 0, bound.patch + 1)
+
+
+def _tilde_upper(bound: _Bound) -> str:
+    """
+    Tilde allows patch changes (minor ones for ~1).
+
+    A partial version, changes in the parts it leaves out.
+    """
+    if bound.parts == 1:
+        return _core_key(bound.major + 1, 0, 0)
+    return _core_key(bound.major, bound.minor + 1, 0)
+
+
+def parse_range(spec: str) -> VersionRange | None:
+    """
+    Parse ^1.2.3, ~1.2, >=1.2.3, 1.x, 1.2, 1 or * into a VersionRange.
+
+    None if spec is not a range. Caret allows changes that do not modify the left-most
+    non-zero part; tilde allows patch changes.
+    """
+    spec = spec.strip()
+    if spec in ("*", "x", "X"):
+        return VersionRange("", None, include_prerelease=False)
+    op = ""
+    for candidate in ("^", "~", ">="):
+        if spec.startswith(candidate):
+            op, spec = candidate, spec[len(candidate) :].strip()
+            break
+
+    bound = _parse_bound(spec)
+    if bound is None:
+        return None
+    if op == ">=":
+        return VersionRange(bound.lower, None, bound.has_prerelease)
+    if op == "^":
+        return VersionRange(bound.lower, _caret_upper(bound), bound.has_prerelease)
+    if op == "~" or bound.parts < 3:
+        return VersionRange(bound.lower, _tilde_upper(bound), bound.has_prerelease)
+    return None  # a bare full version is an exact version, not a range
+
+
+class VersionIndex:
+    """
+    Versions of one bundle_id sorted by semver_key, each with its tags as a frozenset.
+
+    Resolves exact versions, ranges and channels, optionally only among versions tagged
+    with a model.
+    """
+
+    def __init__(self, versions: list[tuple[str, str, frozenset[str]]]) -> None:
+        ordered = sorted(versions, key=lambda v: (v[0], v[1]))
+        self._keys = [key for key, _, _ in ordered]
+        self._semvers = [semver for _, semver, _ in ordered]
+        self._tags = [tags for _, _, tags in ordered]
+        self._exact = {semver: tags for _, semver, tags in ordered}
+
+    def resolve(self, spec: str, model_type: str | None = None) -> str | None:
+        """
+        Return the highest version matching spec, or None.
+
+        With model_type, only versions tagged with it match.
+        """
+        if spec in self._exact:
+            return (
+                spec if model_type is None or model_type in self._exact[spec] else None
+            )
+        if spec == LATEST:
+            return self._highest(
+                VersionRange("", None, include_prerelease=True), model_type
+            )
+        if spec == STABLE:
+            return self._highest(
+                VersionRange("", None, include_prerelease=False), model_type
+            )
+        version_range = parse_range(spec)
+        if version_range is not None:
+            return self._highest(version_range, model_type)
+        if SEMVER_PATTERN.match(spec):
+            return None  # exact version not published
+        return self._highest_prerelease(spec, model_type)
+
+    def _highest(
+        self, version_range: VersionRange, model_type: str | None
+    ) -> str | None:
+        end = (
+            len(self._keys)
+            if version_range.upper is None
+            else bisect.bisect_left(self._keys, version_range.upper)
+        )
+        for i in range(end - 1, -1, -1):
+            key = self._keys[i]
+            if key < version_range.lower:
+                return None
+            if (key.endswith(_RELEASE) or version_range.include_prerelease) and (
+                model_type is None or model_type in self._tags[i]
+            ):
+                return self._semvers[i]
+        return None
+
+    def _highest_prerelease(self, channel: str, model_type: str | None) -> str | None:
+        """
+        Named channel (e.g. beta, rc): highest prerelease of that channel.
+
+        A prerelease belongs to the channel named by its first identifier.
+        """
+        prefix = f"-1{channel}"
+        for i in range(len(self._keys) - 1, -1, -1):
+            key = self._keys[i]
+            core_end = key.find("-")
+            if (
+                core_end != -1
+                and (
+                    key[core_end:] == prefix or key[core_end:].startswith(prefix + " ")
+                )
+                and (model_type is None or model_type in self._tags[i])
+            ):
+                return self._semvers[i]
+        return None
+
+
+_indexes: dict[str, tuple[float, VersionIndex]] = {}
+_lock = Lock()
+
+
+def get_version_index(bundle_id: str) -> VersionIndex | None:
+    """Return the cached index for bundle_id unless it has expired."""
+    with _lock:
+        entry = _indexes.get(bundle_id)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+
+def put_version_index(bundle_id: str, index: VersionIndex, ttl_seconds: float) -> None:
+    """Cache an index for ttl_seconds."""
+    with _lock:
+        _indexes[bundle_id] = (time.monotonic() + ttl_seconds, index)
+
+
+def invalidate_version_index(bundle_id: str) -> None:
+    """Drop the cached index of bundle_id after a new version is published."""
+    with _lock:
+        _indexes.pop(bundle_id, None)
+
+
+def clear_version_indexes() -> None:
+    """Drop all cached indexes."""
+    with _lock:
+        _indexes.clear()
+
+
+class VersionResolver:
+    """
+    Resolve a render's version spec to an exact semver.
+
+    Lookups go through the cached per-bundle version index.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        ttl_seconds: float,
+        fallback_session: AsyncSession | None = None,
+    ) -> None:
+        self._session = session
+        self._ttl = ttl_seconds
+        self._fallback_session = fallback_session
+
+    async def resolve(
+        self, bundle_id: str, spec: str | None, model_type: str | None = None
+    ) -> str | None:
+        """
+        Exact versions pass through without a lookup unless routing by model.
+
+        A missing spec means stable. Ranges and channels load the bundle's versions and
+        tags once per TTL. With model_type, the newest matching version tagged with that
+        model is picked. A miss is retried on the fallback (primary) session, since a
+        replica may lag a fresh version; routed misses query only the versions tagged
+        with the model (GIN index on tags).
+        """
+        if model_type is None and spec is not None and SEMVER_PATTERN.match(spec):
+            return spec
+        spec = spec.strip() if spec else STABLE
+        index = get_version_index(bundle_id)
+        if index is None:
+            index = await self._load(self._session, bundle_id)
+        resolved = index.resolve(spec, model_type)
+        if resolved is None and self._fallback_session is not None:
+            if model_type is None:
+                index = await self._load(self._fallback_session, bundle_id)
+            else:
+                index = await self._load_tagged(
+                    self._fallback_session, bundle_id, model_type
+                )
+            resolved = index.resolve(spec, model_type)
+        return resolved
+
+    async def _load(self, session: AsyncSession, bundle_id: str) -> VersionIndex:
+        result = await session.execute(
+            select(
+                PromptBundle.semver_key, PromptBundle.semver, PromptBundle.tags
+            ).where(
+                PromptBundle.bundle_id == bundle_id,
+            )
+        )
+        index = VersionIndex(
+            [(row.semver_key, row.semver, frozenset(row.tags)) for row in result]
+        )
+        put_version_index(bundle_id, index, self._ttl)
+        return index
+
+    @staticmethod
+    async def _load_tagged(
+        session: AsyncSession, bundle_id: str, model_type: str
+    ) -> VersionIndex:
+        """
+        Versions of bundle_id tagged with model_type (tags @> [model_type]).
+
+        Not cached.
+        """
+        result = await session.execute(
+            select(
+                PromptBundle.semver_key, PromptBundle.semver, PromptBundle.tags
+            ).where(
+                PromptBundle.bundle_id == bundle_id,
+                PromptBundle.tags.contains([model_type]),
+            )
+        )
+        return VersionIndex(
+            [(row.semver_key, row.semver, frozenset(row.tags)) for row in result]
+        )
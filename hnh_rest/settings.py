@@ -10,6 +10,7 @@ from yarl import URL
 
 TEMP_DIR = Path(gettempdir())
 
+
 class LogLevel(enum.StrEnum):
     """Possible log levels."""
 
@@ -35,6 +36,8 @@ class Settings(BaseSettings):
     workers_count: int = 1
     # Enable uvicorn reloading
     reload: bool = False
+    # Build and warm the app once in the gunicorn master, then fork workers
+    gunicorn_preload: bool = False
 
     # Current environment
     environment: str = "dev"
@@ -49,6 +52,71 @@ class Settings(BaseSettings):
     db_echo: bool = False
     db_pool_size: int = 5
     db_max_overflow: int = 10
+    # Run behind a transaction pooler (PgBouncer): no server-side statement
+    # caching, no session-level state, small client-side pools
+    db_pgbouncer_mode: bool = False
+    # Client-side pool size per engine in PgBouncer mode; 0 means NullPool
+    db_pgbouncer_pool_size: int = 0
+    # Dedicated pool for audit writes, isolated from the render path
+    db_audit_pool_size: int = 2
+    db_audit_max_overflow: int = 2
+    # Seconds to wait for a free audit connection
+    db_audit_pool_timeout: float = 5.0
+    # Seconds an audit statement may run
+    db_audit_command_timeout: float = 5.0
+    # Write-behind audit: renders enqueue, a background task inserts batches of up to
+    # this many rows
+    audit_batch_size: int = 500
+    # Seconds a batch waits to fill before it is written
+    audit_flush_interval_seconds: float = 0.05
+    # Queued records before renders wait for room (backpressure)
+    audit_queue_max_size: int = 10000
+    # Deadline for one audit batch INSERT; slower or failed batches are spooled
+    audit_write_timeout_seconds: float = 2.0
+    # Local durable spool (append-only NDJSON segments, one directory per worker).
+    # Enabling it requires audit_spool_dir on persistent storage (e.g. a mounted
+    # volume); a temp dir in a container is not durable
+    audit_spool_enabled: bool = False
+    audit_spool_dir: Optional[Path] = None
+    audit_spool_segment_max_bytes: int = 16 * 1024 * 1024
+    # Seconds between attempts to replay the spool into prompt_audit
+    audit_spool_replay_interval_seconds: float = 5.0
+    # Store audit texts zstd-compressed with a dictionary built from registry templates
+    # (needs zstandard)
+    audit_compression_enabled: bool = False
+    audit_compression_level: int = 3
+    # Store audit texts as render inputs (bundle row id, personality payload) and a
+    # checksum; rebuilt on read
+    audit_reconstruct_enabled: bool = False
+    # prompt_audit range partitions by created_at: "month" or "day", kept created this
+    # many periods ahead
+    audit_partition_interval: str = "month"
+    audit_partitions_ahead: int = 3
+    # Drop audit partitions (and texts no longer referenced) older than this many days;
+    # 0 keeps everything
+    audit_retention_days: int = 0
+    audit_partition_maintenance_interval_seconds: float = 3600.0
+    # Run partition maintenance in this process; a pass is skipped while another
+    # process runs one, so this may be disabled on all but a few processes
+    audit_partition_maintenance_enabled: bool = True
+    # Export closed audit periods to Parquet files for offline analytics (needs
+    # pyarrow); keep the retention longer than a period plus the export interval so
+    # partitions are archived before they are dropped
+    audit_archive_enabled: bool = False
+    audit_archive_dir: Path = TEMP_DIR / "hnh-audit-archive"
+    audit_archive_batch_size: int = 50000
+    audit_archive_interval_seconds: float = 3600.0
+    # A period is exported only this long after its end: events keep their render time,
+    # so write-behind batches, spool replays after an outage and replica lag still add
+    # rows to it; keep it above the write timeout plus the longest spool backlog and
+    # replica lag to tolerate
+    audit_archive_grace_seconds: float = 86400.0
+    # Read replicas (SQLAlchemy URLs) for read-only endpoints and sources
+    db_replica_urls: List[str] = []
+    # Reads stay on the primary for this long after a registry write in the same worker
+    db_read_after_write_seconds: float = 5.0
+    # Raw asyncpg pool with prepared statements for render reads
+    db_fast_path_enabled: bool = False
 
     # Variables for Redis
     redis_host: str = "hnh_rest-redis"
@@ -57,11 +125,18 @@ class Settings(BaseSettings):
     redis_pass: Optional[str] = None
     redis_base: Optional[int] = None
 
+    # Distributed render cache (Redis), keyed by (plan_hash, personality_hash)
+    render_cache_enabled: bool = False
+    render_cache_ttl_seconds: int = 3600
+    render_cache_compress_level: int = 6
+
+    # Per-bundle version index (ranges/channels in render requests), per process
+    version_index_ttl_seconds: float = 30.0
+
     # This variable is used to define
     # multiproc_dir. It's required for [uvi|guni]corn projects.
     prometheus_dir: Path = TEMP_DIR / "prom"
 
-
     @property
     def db_url(self) -> URL:
         """
@@ -77,6 +152,29 @@ class Settings(BaseSettings):
             password=self.db_pass,
             path=f"/{self.db_base}",
         )
+
+    @property
+    def db_dsn(self) -> URL:
+        """
+        Assemble plain PostgreSQL DSN for asyncpg.
+
+        :return: database DSN.
+        """
+        return self.db_url.with_scheme("postgresql")
+
+    @property
+    def db_read_dsn(self) -> URL:
+        """
+        Assemble plain PostgreSQL DSN for read-only asyncpg access.
+
+        Points to the first replica when replicas are configured.
+
+        :return: database DSN.
+        """
+        if not self.db_replica_urls:
+            return self.db_dsn
+        return URL(self.db_replica_urls[0]).with_scheme("postgresql")
+
     @property
     def redis_url(self) -> URL:
         """
@@ -97,11 +195,10 @@ class Settings(BaseSettings):
         )
 
     model_config = SettingsConfigDict(
-        env_file = ".env",
-        env_prefix = "HNH_REST_",
-        env_file_encoding = "utf-8",
+        env_file=".env",
+        env_prefix="HNH_REST_",
+        env_file_encoding="utf-8",
     )
 
 
-
 settings = Settings()
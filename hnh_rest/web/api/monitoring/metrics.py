@@ -0,0 +1,39 @@
+import resource
+from pathlib import Path
+
+from prometheus_client import Gauge
+
+worker_memory_bytes = Gauge(
+    "worker_memory_bytes",
+    "Worker memory right after startup, by kind (rss, pss, shared, private)",
+    ["kind"],
+    multiprocess_mode="liveall",
+)
+
+
+def read_process_memory() -> dict[str, int]:
+    """
+    Read memory usage of the current process.
+
+    On Linux the figures come from /proc/self/smaps_rollup,
+    where PSS splits shared pages between the processes using them.
+    Elsewhere only the peak RSS is available.
+
+    :returns: memory usage in bytes by kind.
+    """
+    try:
+        rollup = Path("/proc/self/smaps_rollup").read_text()
+    except OSError:
+        return {"rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+    fields: dict[str, int] = {}
+    for line in rollup.splitlines()[1:]:
+        name, _, rest = line.partition(":")
+        parts = rest.split()
+        if len(parts) == 2 and parts[1] == "kB":
+            fields[name] = int(parts[0]) * 1024
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
@@ -2,22 +2,26 @@
 
 from __future__ import annotations
 
-import re
-from typing import Any
+from datetime import datetime
+from typing import Annotated, Any, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, Field, model_validator, field_validator
-
-# Strict semver: major.minor.patch with optional -prerelease and +build
-SEMVER_PATTERN = re.compile(
-    r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
-    r"(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
-    r"(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    Field,
+    TypeAdapter,
+    model_validator,
+    field_validator,
 )
 
+from hnh_rest.services.prompts.audit.compression import decompress_text
+from hnh_rest.services.prompts.audit.reconstruct import reconstruct_text
+from hnh_rest.services.prompts.versions import SEMVER_PATTERN
 
 # ---- Constraint structure (machine-readable enforcement schema) ----
 
+
 class ConstraintSchema(BaseModel):
     """Machine-readable persona enforcement constraints. All fields optional."""
 
@@ -30,7 +34,9 @@ class ConstraintSchema(BaseModel):
     model_config = {"extra": "allow"}  # allow future constraint keys
 
 
-def validate_constraint_structure(value: dict[str, Any] | None) -> dict[str, Any] | None:
+def validate_constraint_structure(
+    value: dict[str, Any] | None,
+) -> dict[str, Any] | None:
     """Validate and normalize constraint dict; returns None for empty/None."""
     if value is None or not value:
         return None
@@ -40,6 +46,7 @@ def validate_constraint_structure(value: dict[str, Any] | None) -> dict[str, Any
 
 # ---- Template creation ----
 
+
 def _validate_semver(v: str) -> str:
     """Strict semver format: major.minor.patch[-prerelease][+build]."""
     if not SEMVER_PATTERN.match(v):
@@ -116,8 +123,76 @@ class BundleCreate(BaseModel):
         return _normalize_tags(v)
 
 
+# ---- Bulk import (NDJSON) ----
+
+IMPORT_MAX_ROWS = 50_000
+IMPORT_CHUNK_SIZE = 500
+
+
+def _parse_template_ref(v: Any) -> Any:
+    """
+    Template reference: a UUID, or "template_id@semver".
+
+    The latter may name a template earlier in the same import.
+    """
+    if not isinstance(v, str):
+        return v
+    try:
+        return UUID(v)
+    except ValueError:
+        pass
+    template_id, sep, semver = v.rpartition("@")
+    if not sep or not template_id:
+        raise ValueError("template reference must be a UUID or template_id@semver")
+    return template_id, _validate_semver(semver)
+
+
+TemplateRef = Annotated[UUID | tuple[str, str], BeforeValidator(_parse_template_ref)]
+
+
+class TemplateImport(TemplateCreate):
+    """Import line creating a template: {"kind": "template", ...TemplateCreate}."""
+
+    kind: Literal["template"]
+
+
+class BundleImport(BaseModel):
+    """
+    Import line creating a bundle.
+
+    Template slots are TemplateRefs instead of UUIDs.
+    """
+
+    kind: Literal["bundle"]
+    bundle_id: str = Field(..., min_length=1, max_length=255)
+    semver: str = Field(..., min_length=1, max_length=64)
+    system_template: TemplateRef
+    personality_template: TemplateRef
+    activity_template: TemplateRef
+    task_template: TemplateRef
+    tags: list[str] | None = None
+
+    model_config = {"extra": "forbid"}
+
+    @field_validator("semver")
+    @classmethod
+    def semver_format(cls, v: str) -> str:
+        return _validate_semver(v)
+
+    @field_validator("tags", mode="after")
+    @classmethod
+    def normalize_tags(cls, v: list[str] | None) -> list[str]:
+        return _normalize_tags(v)
+
+
+IMPORT_ROW: TypeAdapter[TemplateImport | BundleImport] = TypeAdapter(
+    Annotated[TemplateImport | BundleImport, Field(discriminator="kind")]
+)
+
+
 # ---- Render request (Personality Adapter contract) ----
 
+
 class SemanticTraits(BaseModel):
     """Semantic traits derived from HnH engine (placeholder for hnh-core integration)."""
 
@@ -128,8 +203,12 @@ class RenderRequest(BaseModel):
     """Request body for POST /v1/prompts/render."""
 
     bundle_id: str = Field(..., min_length=1)
-    bundle_version: str | None = Field(None, alias="semver")
+    # Exact version, range (^1.2, ~1.2.3, 1.x, >=1.0.0) or channel (stable, latest,
+    # beta...). Default: stable.
+    bundle_version: str | None = Field(None, alias="semver", max_length=255)
     model_type: str | None = None
+    # Route by model: newest version matching bundle_version tagged with model_type.
+    model_routing: bool = False
     semantic_traits: dict[str, Any] = Field(default_factory=dict)
     activity_level: float = Field(0.0, ge=0.0, le=1.0)
     stress: float = Field(0.0, ge=0.0, le=1.0)
@@ -138,12 +217,65 @@ class RenderRequest(BaseModel):
     model_config = {"extra": "forbid", "populate_by_name": True}
 
 
+RENDER_BATCH_MAX_ITEMS = 100
+
+
+class RenderBatchRequest(BaseModel):
+    """Request body for POST /v1/prompts/render/batch; items are rendered in order."""
+
+    items: list[RenderRequest] = Field(
+        ..., min_length=1, max_length=RENDER_BATCH_MAX_ITEMS
+    )
+
+    model_config = {"extra": "forbid"}
+
+
+TEMPLATE_DELETE_MAX_IDS = 1000
+
+
+class TemplateBulkDelete(BaseModel):
+    """Request body for POST /v1/prompts/templates:delete."""
+
+    ids: list[UUID] = Field(..., min_length=1, max_length=TEMPLATE_DELETE_MAX_IDS)
+
+    model_config = {"extra": "forbid"}
+
+
+class TemplateBulkDeleteResponse(BaseModel):
+    """
+    Outcome per requested id.
+
+    Deleted, kept because a bundle references it, or not found.
+    """
+
+    deleted: list[UUID]
+    in_use: list[UUID]
+    not_found: list[UUID]
+
+    model_config = {"extra": "forbid", "validate_assignment": False}
+
+
+BUNDLE_RESOLVE_MAX_HASHES = 1000
+
+
+class BundleResolveRequest(BaseModel):
+    """Request body for POST /v1/prompts/bundles:resolve."""
+
+    bundle_hashes: list[str] = Field(
+        ..., min_length=1, max_length=BUNDLE_RESOLVE_MAX_HASHES
+    )
+
+    model_config = {"extra": "forbid"}
+
+
 # ---- Render response ----
 
+
 class RenderResponse(BaseModel):
     """Response for POST /v1/prompts/render; deterministic assembly result + audit refs."""
 
     rendered_prompt: str
+    bundle_version: str
     bundle_hash: str
     personality_hash: str
     engine_version: str | None = None
@@ -152,8 +284,21 @@ class RenderResponse(BaseModel):
     model_config = {"extra": "forbid", "validate_assignment": False}
 
 
+class RenderBatchResponse(BaseModel):
+    """
+    Response for POST /v1/prompts/render/batch.
+
+    One RenderResponse per request item, same order.
+    """
+
+    items: list[RenderResponse]
+
+    model_config = {"extra": "forbid", "validate_assignment": False}
+
+
 # ---- Response DTOs (read) ----
 
+
 class TemplateRead(BaseModel):
     """Template as returned by API (read-only DTO)."""
 
@@ -164,7 +309,11 @@ class TemplateRead(BaseModel):
     content: str
     constraints: dict[str, Any] | None = None
 
-    model_config = {"extra": "forbid", "from_attributes": True, "validate_assignment": False}
+    model_config = {
+        "extra": "forbid",
+        "from_attributes": True,
+        "validate_assignment": False,
+    }
 
 
 class BundleRead(BaseModel):
@@ -173,13 +322,18 @@ class BundleRead(BaseModel):
     id: UUID
     bundle_id: str
     semver: str
+    bundle_hash: str
     system_template_id: UUID
     personality_template_id: UUID
     activity_template_id: UUID
     task_template_id: UUID
     tags: list[str] = Field(default_factory=list)
 
-    model_config = {"extra": "forbid", "from_attributes": True, "validate_assignment": False}
+    model_config = {
+        "extra": "forbid",
+        "from_attributes": True,
+        "validate_assignment": False,
+    }
 
     @field_validator("tags", mode="before")
     @classmethod
@@ -191,14 +345,141 @@ class BundleRead(BaseModel):
         return []
 
 
-class AuditRead(BaseModel):
-    """Audit record as returned by API (read-only DTO)."""
+class BundleResolveResponse(BaseModel):
+    """
+    Bundles found for the requested hashes (request order).
+
+    Also the hashes no bundle has.
+    """
+
+    items: list[BundleRead]
+    not_found: list[str]
+
+    model_config = {"extra": "forbid", "validate_assignment": False}
+
+
+# ---- Registry listing (keyset pages) ----
+
+LIST_DEFAULT_LIMIT = 100
+LIST_MAX_LIMIT = 1000
+
+
+class TemplateListItem(BaseModel):
+    """Template in a listing; content and constraints only with include_content."""
+
+    id: UUID
+    template_id: str
+    semver: str
+    role: str
+    created_at: datetime
+    content: str | None = None
+    constraints: dict[str, Any] | None = None
+
+    model_config = {
+        "extra": "forbid",
+        "from_attributes": True,
+        "validate_assignment": False,
+    }
+
+
+class TemplateListResponse(BaseModel):
+    """
+    One page of templates ordered by (created_at, id).
+
+    next_cursor is None on the last page.
+    """
+
+    items: list[TemplateListItem]
+    next_cursor: str | None = None
+
+    model_config = {"extra": "forbid", "validate_assignment": False}
+
+
+class BundleListItem(BundleRead):
+    """Bundle in a listing."""
+
+    created_at: datetime
+
+
+class BundleListResponse(BaseModel):
+    """
+    One page of bundles ordered by (created_at, id).
+
+    next_cursor is None on the last page.
+    """
+
+    items: list[BundleListItem]
+    next_cursor: str | None = None
+
+    model_config = {"extra": "forbid", "validate_assignment": False}
+
+
+class AuditBase(BaseModel):
+    """
+    Fields shared by audit records and search items.
+
+    rendered_prompt is declared by each.
+    """
 
     id: UUID
     bundle_hash: str
     personality_hash: str
     engine_version: str | None
     adapter_version: str | None
+
+    model_config = {
+        "extra": "forbid",
+        "from_attributes": True,
+        "validate_assignment": False,
+    }
+
+    @model_validator(mode="before")
+    @classmethod
+    def decompress_rendered_prompt(cls, data: Any) -> Any:
+        """
+        Decompress or rebuild the rendered text of stored audit rows.
+
+        Texts stored zstd-compressed are decompressed and texts stored as render inputs
+        are rebuilt here, so the API returns identical bytes in every storage form.
+        """
+        content = getattr(data, "content", None)
+        if content is None or content.rendered_prompt is not None:
+            return data
+        if content.rendered_prompt_zstd is not None:
+            rendered_prompt = decompress_text(
+                content.dictionary_id, content.rendered_prompt_zstd
+            )
+        else:
+            rendered_prompt = reconstruct_text(content)
+        fields = {
+            name: getattr(data, name)
+            for name in cls.model_fields
+            if name != "rendered_prompt"
+        }
+        return fields | {"rendered_prompt": rendered_prompt}
+
+
+class AuditRead(AuditBase):
+    """Audit record as returned by API (read-only DTO)."""
+
     rendered_prompt: str
 
-    model_config = {"extra": "forbid", "from_attributes": True, "validate_assignment": False}
+
+class AuditListItem(AuditBase):
+    """Audit event in a search page; rendered_prompt only with include_prompt."""
+
+    created_at: datetime
+    rendered_prompt: str | None = None
+
+
+class AuditListResponse(BaseModel):
+    """
+    One page of audit events ordered by (created_at, id).
+
+    next_cursor is None on the last page.
+    """
+
+    items: list[AuditListItem]
+    next_cursor: str | None = None
+
+    model_config = {"extra": "forbid", "validate_assignment": False}
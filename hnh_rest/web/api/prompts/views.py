@@ -2,26 +2,81 @@
 
 import logging
 import time
+from datetime import datetime
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import ORJSONResponse
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
+from redis.asyncio import ConnectionPool
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from hnh_rest.db.dependencies import get_db_session
+from hnh_rest.db.dependencies import (
+    get_db_primary_read_session,
+    get_db_read_session,
+    get_db_write_session,
+)
 from hnh_rest.db.models.prompt_audit import PromptAudit
-from hnh_rest.services.prompts import AuditService, BundleService, RendererService, TemplateService
-from hnh_rest.services.prompts.renderer import BundleUnsupportedModelError
-from hnh_rest.web.api.prompts.metrics import prompt_render_latency_seconds, render_errors_total
+from hnh_rest.services.prompts import BundleService, RendererService, TemplateService
+from hnh_rest.services.prompts.audit.compression import load_dictionaries
+from hnh_rest.services.prompts.audit.dependency import get_audit_sink
+from hnh_rest.services.prompts.audit.reconstruct import (
+    AuditReconstructionError,
+    load_plans,
+)
+from hnh_rest.services.prompts.audit.service import AuditService
+from hnh_rest.services.prompts.bundle import TemplateNotFoundError
+from hnh_rest.services.prompts.importer import (
+    BundleImportRow,
+    ImportResult,
+    RegistryImporter,
+    TemplateImportRow,
+)
+from hnh_rest.services.prompts.pagination import Cursor, decode_cursor, encode_cursor
+from hnh_rest.services.prompts.protocols import AuditSink
+from hnh_rest.services.prompts.render_cache import RedisRenderCache
+from hnh_rest.services.prompts.renderer import (
+    BundleUnsupportedModelError,
+    RenderInput,
+    personality_payload,
+)
+from hnh_rest.services.prompts.sources.pg import PgBundleSource
+from hnh_rest.services.prompts.versions import VersionResolver
+from hnh_rest.services.redis.dependency import get_redis_pool
+from hnh_rest.settings import settings
+from hnh_rest.web.api.prompts.metrics import (
+    prompt_render_latency_seconds,
+    render_errors_total,
+)
 from hnh_rest.web.api.prompts.schema import (
+    IMPORT_CHUNK_SIZE,
+    IMPORT_MAX_ROWS,
+    IMPORT_ROW,
+    LIST_DEFAULT_LIMIT,
+    LIST_MAX_LIMIT,
+    AuditListItem,
+    AuditListResponse,
     AuditRead,
     BundleCreate,
+    BundleListItem,
+    BundleListResponse,
     BundleRead,
+    BundleResolveRequest,
+    BundleResolveResponse,
+    RenderBatchRequest,
+    RenderBatchResponse,
     RenderRequest,
     RenderResponse,
+    TemplateBulkDelete,
+    TemplateBulkDeleteResponse,
     TemplateCreate,
+    TemplateImport,
+    TemplateListItem,
+    TemplateListResponse,
     TemplateRead,
 )
 
@@ -31,20 +86,118 @@ router = APIRouter(prefix="/v1/prompts", tags=["prompts"])
 router_audit = APIRouter(prefix="/v1/audit", tags=["audit"])
 
 
-def _template_svc(session: AsyncSession = Depends(get_db_session)) -> TemplateService:
+def _template_svc(
+    session: AsyncSession = Depends(get_db_write_session),
+) -> TemplateService:
     return TemplateService(session)
 
 
-def _bundle_svc(session: AsyncSession = Depends(get_db_session)) -> BundleService:
+def _bundle_svc(session: AsyncSession = Depends(get_db_write_session)) -> BundleService:
     return BundleService(session)
 
 
-def _renderer_svc(session: AsyncSession = Depends(get_db_session)) -> RendererService:
-    return RendererService(session)
+def _renderer_svc(
+    request: Request,
+    session: AsyncSession = Depends(get_db_read_session),
+    primary: AsyncSession = Depends(get_db_primary_read_session),
+    redis_pool: ConnectionPool = Depends(get_redis_pool),
+) -> RendererService:
+    render_cache = None
+    if settings.render_cache_enabled:
+        render_cache = RedisRenderCache(
+            redis_pool,
+            ttl_seconds=settings.render_cache_ttl_seconds,
+            compress_level=settings.render_cache_compress_level,
+        )
+    pg_pool = getattr(request.app.state, "pg_pool", None)
+    fast_source = PgBundleSource(pg_pool) if pg_pool is not None else None
+    return RendererService(
+        session,
+        render_cache=render_cache,
+        fast_source=fast_source,
+        fallback_session=primary if session is not primary else None,
+    )
 
 
-def _audit_svc(session: AsyncSession = Depends(get_db_session)) -> AuditService:
-    return AuditService(session)
+def _version_resolver(
+    session: AsyncSession = Depends(get_db_read_session),
+    primary: AsyncSession = Depends(get_db_primary_read_session),
+) -> VersionResolver:
+    return VersionResolver(
+        session,
+        ttl_seconds=settings.version_index_ttl_seconds,
+        fallback_session=primary if session is not primary else None,
+    )
+
+
+def _routed_model(item: RenderRequest) -> str | None:
+    """model_type to route by, or None when routing is off or no model is given."""
+    if not item.model_routing or item.model_type is None:
+        return None
+    return item.model_type.strip() or None
+
+
+async def _resolve_version(
+    resolver: VersionResolver,
+    bundle_id: str,
+    spec: str | None,
+    model_type: str | None = None,
+) -> str:
+    """
+    Resolve a render's version spec; 404 if no published version matches.
+
+    With model_type (routing), BundleUnsupportedModelError if versions match but none is
+    tagged with it.
+    """
+    semver = await resolver.resolve(bundle_id, spec, model_type)
+    if semver is None and model_type is not None:
+        semver = await resolver.resolve(bundle_id, spec)
+        if semver is not None:
+            raise BundleUnsupportedModelError(bundle_id, semver, model_type)
+    if semver is None:
+        render_errors_total.inc()
+        raise HTTPException(
+            404, detail=f"No version of bundle {bundle_id} matches '{spec or 'stable'}'"
+        )
+    return semver
+
+
+def _cursor(
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+) -> Cursor | None:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e)) from e
+
+
+@router.get("/templates", response_model=TemplateListResponse)
+async def list_templates(
+    limit: int = Query(LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    cursor: Cursor | None = Depends(_cursor),
+    prefix: str | None = Query(None, max_length=255, description="template_id prefix"),
+    include_content: bool = False,
+    session: AsyncSession = Depends(get_db_read_session),
+) -> TemplateListResponse:
+    """
+    List templates in keyset pages ordered by (created_at, id).
+
+    Content and constraints only on request.
+    """
+    rows = await TemplateService(session).list_page(
+        limit + 1, cursor, prefix, include_content
+    )
+    next_cursor = (
+        encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id)
+        if len(rows) > limit
+        else None
+    )
+    return TemplateListResponse(
+        items=[TemplateListItem.model_validate(row) for row in rows[:limit]],
+        next_cursor=next_cursor,
+    )
 
 
 @router.post("/templates", response_model=TemplateRead, status_code=201)
@@ -52,20 +205,23 @@ async def create_template(
     body: TemplateCreate,
     svc: TemplateService = Depends(_template_svc),
 ) -> TemplateRead:
-    """Create a prompt template. Conflict if (template_id, semver) already exists."""
-    if await svc.get_by_template_id_semver(body.template_id, body.semver) is not None:
-        raise HTTPException(409, detail="Template with this template_id and semver already exists")
-    try:
-        template = await svc.create(
-            template_id=body.template_id,
-            semver=body.semver,
-            role=body.role,
-            content=body.content,
-            constraints=body.constraints,
+    """
+    Create a prompt template in one round trip.
+
+    Conflict if (template_id, semver) already exists.
+    """
+    template = await svc.create(
+        template_id=body.template_id,
+        semver=body.semver,
+        role=body.role,
+        content=body.content,
+        constraints=body.constraints,
+    )
+    if template is None:
+        raise HTTPException(
+            409, detail="Template with this template_id and semver already exists"
         )
-        return TemplateRead.model_validate(template)
-    except IntegrityError:
-        raise HTTPException(409, detail="Template with this template_id and semver already exists")
+    return TemplateRead.model_validate(template)
 
 
 @router.delete("/templates/{template_id}", status_code=204)
@@ -85,23 +241,45 @@ async def delete_template(
         raise HTTPException(404, detail="Template not found")
 
 
+@router.post("/templates:delete", response_model=TemplateBulkDeleteResponse)
+async def delete_templates(
+    body: TemplateBulkDelete,
+    svc: TemplateService = Depends(_template_svc),
+    bundle_svc: BundleService = Depends(_bundle_svc),
+) -> TemplateBulkDeleteResponse:
+    """
+    Delete many templates.
+
+    Templates referenced by a bundle are kept and reported as in_use.
+    """
+    ids = list(dict.fromkeys(body.ids))
+    in_use = await bundle_svc.used_template_ids(ids)
+    try:
+        deleted = await svc.delete_many([tid for tid in ids if tid not in in_use])
+    except IntegrityError as e:
+        raise HTTPException(
+            409,
+            detail="Cannot delete templates: "
+            "a bundle referencing one of them was created concurrently",
+        ) from e
+    return TemplateBulkDeleteResponse(
+        deleted=[tid for tid in ids if tid in deleted],
+        in_use=[tid for tid in ids if tid in in_use],
+        not_found=[tid for tid in ids if tid not in deleted and tid not in in_use],
+    )
+
+
 @router.post("/bundles", response_model=BundleRead, status_code=201)
 async def create_bundle(
     body: BundleCreate,
     svc: BundleService = Depends(_bundle_svc),
-    template_svc: TemplateService = Depends(_template_svc),
 ) -> BundleRead:
-    """Create a prompt bundle (immutable once created). All template IDs must exist. Conflict if (bundle_id, semver) exists."""
-    for tid in (
-        body.system_template_id,
-        body.personality_template_id,
-        body.activity_template_id,
-        body.task_template_id,
-    ):
-        if await template_svc.get_by_id(tid) is None:
-            raise HTTPException(404, detail=f"Template not found: {tid}")
-    if await svc.exists(body.bundle_id, body.semver):
-        raise HTTPException(409, detail="Bundle with this bundle_id and semver already exists")
+    """
+    Create a prompt bundle (immutable once created).
+
+    All template IDs must exist. Conflict if (bundle_id, semver) exists. Two round
+    trips: one template lookup, one insert of the bundle and its compiled row.
+    """
     try:
         bundle = await svc.create(
             bundle_id=body.bundle_id,
@@ -112,34 +290,225 @@ async def create_bundle(
             task_template_id=body.task_template_id,
             tags=body.tags,
         )
-        return BundleRead.model_validate(bundle)
-    except IntegrityError:
-        raise HTTPException(409, detail="Bundle with this bundle_id and semver already exists")
+    except TemplateNotFoundError as e:
+        raise HTTPException(404, detail=str(e)) from e
+    except IntegrityError as e:
+        # A referenced template was deleted between the lookup and the insert.
+        raise HTTPException(404, detail="Template not found") from e
+    if bundle is None:
+        raise HTTPException(
+            409, detail="Bundle with this bundle_id and semver already exists"
+        )
+    return BundleRead.model_validate(bundle)
+
+
+async def _ndjson_lines(
+    stream: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, bytes]]:
+    """
+    Split a streamed body into (line number, line).
+
+    Blank lines are skipped but counted.
+    """
+    buffer = b""
+    line_no = 0
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+    if buffer.strip():
+        yield line_no + 1, buffer
+
+
+def _validate_import_chunk(
+    chunk: list[tuple[int, bytes]],
+    templates: list[TemplateImportRow],
+    bundles: list[BundleImportRow],
+    results: list[ImportResult],
+) -> None:
+    """
+    Validate NDJSON lines.
+
+    Valid rows go to templates/bundles, invalid ones become results.
+    """
+    for line_no, raw in chunk:
+        try:
+            row = IMPORT_ROW.validate_json(raw)
+        except ValidationError as e:
+            errors = e.errors()
+            loc = errors[0]["loc"] if errors else ()
+            kind = loc[0] if loc and loc[0] in ("template", "bundle") else "unknown"
+            detail = "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'][1:])}: {err['msg']}"
+                for err in errors
+            )
+            results.append(ImportResult(line_no, str(kind), "invalid", detail=detail))
+            continue
+        if isinstance(row, TemplateImport):
+            templates.append(
+                TemplateImportRow(
+                    line_no,
+                    row.template_id,
+                    row.semver,
+                    row.role,
+                    row.content,
+                    row.constraints,
+                )
+            )
+        else:
+            bundles.append(
+                BundleImportRow(
+                    line_no,
+                    row.bundle_id,
+                    row.semver,
+                    (
+                        row.system_template,
+                        row.personality_template,
+                        row.activity_template,
+                        row.task_template,
+                    ),
+                    row.tags or [],
+                )
+            )
+
+
+@router.post("/import", response_class=StreamingResponse)
+async def import_registry(
+    request: Request,
+    session: AsyncSession = Depends(get_db_write_session),
+) -> StreamingResponse:
+    """
+    Bulk import templates and bundles from an NDJSON body.
+
+    Each line is {"kind": "template" | "bundle", ...}. Lines are validated in chunks as
+    the body streams in; bundles may reference templates of the same import as
+    "template_id@semver". All rows are inserted with multi-row INSERTs in one
+    transaction, then one NDJSON result per line is streamed back in input order.
+    """
+    templates: list[TemplateImportRow] = []
+    bundles: list[BundleImportRow] = []
+    results: list[ImportResult] = []
+    chunk: list[tuple[int, bytes]] = []
+    rows = 0
+    async for line in _ndjson_lines(request.stream()):
+        rows += 1
+        if rows > IMPORT_MAX_ROWS:
+            raise HTTPException(
+                413, detail=f"Import is limited to {IMPORT_MAX_ROWS} rows"
+            )
+        chunk.append(line)
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            _validate_import_chunk(chunk, templates, bundles, results)
+            chunk = []
+    _validate_import_chunk(chunk, templates, bundles, results)
+
+    try:
+        results.extend(await RegistryImporter(session).run(templates, bundles))
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        raise HTTPException(
+            409,
+            detail="Import conflicts with a concurrent registry change; "
+            "nothing was imported",
+        ) from e
+    results.sort(key=lambda r: r.line)
+    return StreamingResponse(
+        (orjson.dumps(r) + b"\n" for r in results), media_type="application/x-ndjson"
+    )
+
+
+@router.get("/bundles", response_model=BundleListResponse)
+async def list_bundles(
+    limit: int = Query(LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    cursor: Cursor | None = Depends(_cursor),
+    prefix: str | None = Query(None, max_length=255, description="bundle_id prefix"),
+    tag: str | None = Query(
+        None, max_length=64, description="only bundles tagged with this tag"
+    ),
+    session: AsyncSession = Depends(get_db_read_session),
+) -> BundleListResponse:
+    """
+    List bundles in keyset pages ordered by (created_at, id).
+
+    Optionally filtered by bundle_id prefix and tag.
+    """
+    rows = await BundleService(session).list_page(limit + 1, cursor, prefix, tag)
+    next_cursor = (
+        encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id)
+        if len(rows) > limit
+        else None
+    )
+    return BundleListResponse(
+        items=[BundleListItem.model_validate(row) for row in rows[:limit]],
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/bundles/{bundle_id}", response_model=BundleRead)
 async def get_bundle(
     bundle_id: str,
     semver: str,
-    svc: BundleService = Depends(_bundle_svc),
+    session: AsyncSession = Depends(get_db_read_session),
+    primary: AsyncSession = Depends(get_db_primary_read_session),
 ) -> BundleRead:
-    """Get a bundle by bundle_id and semver."""
-    bundle = await svc.get_by_bundle_id_semver(bundle_id, semver)
+    """
+    Get a bundle by bundle_id and semver.
+
+    Served from a replica; a miss is retried on the primary.
+    """
+    bundle = await BundleService(session).get_by_bundle_id_semver(bundle_id, semver)
+    if bundle is None and session is not primary:
+        bundle = await BundleService(primary).get_by_bundle_id_semver(bundle_id, semver)
     if bundle is None:
         raise HTTPException(404, detail="Bundle not found")
     return BundleRead.model_validate(bundle)
 
 
+@router.post("/bundles:resolve", response_model=BundleResolveResponse)
+async def resolve_bundles(
+    body: BundleResolveRequest,
+    session: AsyncSession = Depends(get_db_read_session),
+    primary: AsyncSession = Depends(get_db_primary_read_session),
+) -> BundleResolveResponse:
+    """
+    Resolve bundle hashes (e.g. from audit rows) to bundles in one query.
+
+    Misses on a replica are retried on the primary.
+    """
+    hashes = list(dict.fromkeys(body.bundle_hashes))
+    found = await BundleService(session).get_by_bundle_hashes(hashes)
+    missing = [h for h in hashes if h not in found]
+    if missing and session is not primary:
+        found.update(await BundleService(primary).get_by_bundle_hashes(missing))
+    return BundleResolveResponse(
+        items=[BundleRead.model_validate(found[h]) for h in hashes if h in found],
+        not_found=[h for h in hashes if h not in found],
+    )
+
+
 @router.post("/render", response_model=RenderResponse, response_class=ORJSONResponse)
 async def render_prompt(
     body: RenderRequest,
     renderer: RendererService = Depends(_renderer_svc),
-    audit_svc: AuditService = Depends(_audit_svc),
-) -> RenderResponse:
-    """Render a prompt: deterministic assembly (system → personality → activity → task), then audit."""
-    semver = body.bundle_version or "0.1.0"
+    resolver: VersionResolver = Depends(_version_resolver),
+    audit_sink: AuditSink = Depends(get_audit_sink),
+) -> RenderResponse | ORJSONResponse:
+    """
+    Render a prompt: deterministic assembly, then audit (write-behind queue).
+
+    Assembly order is system → personality → activity → task. The version may be exact,
+    a range or a channel; it is resolved first and returned as bundle_version. With
+    model_routing, the newest matching version tagged with model_type is rendered.
+    """
     t0 = time.perf_counter()
     try:
+        semver = await _resolve_version(
+            resolver, body.bundle_id, body.bundle_version, _routed_model(body)
+        )
         rendered_prompt, bundle_hash, personality_hash = await renderer.render(
             bundle_id=body.bundle_id,
             semver=semver,
@@ -159,32 +528,214 @@ async def render_prompt(
     except ValueError as e:
         render_errors_total.inc()
         logger.warning("Render failed: %s", e)
-        raise HTTPException(404, detail=str(e))
+        raise HTTPException(404, detail=str(e)) from e
     elapsed = time.perf_counter() - t0
     prompt_render_latency_seconds.observe(elapsed)
-    logger.info("Render completed in %.3fs bundle_id=%s semver=%s", elapsed, body.bundle_id, semver)
-    await audit_svc.create(
+    logger.info(
+        "Render completed in %.3fs bundle_id=%s semver=%s",
+        elapsed,
+        body.bundle_id,
+        semver,
+    )
+    await audit_sink.record(
         bundle_hash=bundle_hash,
         personality_hash=personality_hash,
         rendered_prompt=rendered_prompt,
+        personality_payload=personality_payload(
+            body.semantic_traits, body.activity_level, body.stress, body.task
+        ),
     )
     return RenderResponse(
         rendered_prompt=rendered_prompt,
+        bundle_version=semver,
+        bundle_hash=bundle_hash,
+        personality_hash=personality_hash,
+    )
+
+
+@router.post(
+    "/render/batch", response_model=RenderBatchResponse, response_class=ORJSONResponse
+)
+async def render_prompt_batch(
+    body: RenderBatchRequest,
+    renderer: RendererService = Depends(_renderer_svc),
+    resolver: VersionResolver = Depends(_version_resolver),
+    audit_sink: AuditSink = Depends(get_audit_sink),
+) -> RenderBatchResponse | ORJSONResponse:
+    """
+    Render several prompts in one call; cache lookups are pipelined.
+
+    Any failing item fails the batch.
+    """
+    t0 = time.perf_counter()
+    try:
+        semvers: dict[tuple[str, str | None, str | None], str] = {}
+        inputs: list[RenderInput] = []
+        for item in body.items:
+            key = (item.bundle_id, item.bundle_version, _routed_model(item))
+            if key not in semvers:
+                semvers[key] = await _resolve_version(resolver, *key)
+            inputs.append(
+                RenderInput(
+                    bundle_id=item.bundle_id,
+                    semver=semvers[key],
+                    semantic_traits=item.semantic_traits,
+                    activity_level=item.activity_level,
+                    stress=item.stress,
+                    task=item.task,
+                    model_type=item.model_type,
+                )
+            )
+        results = await renderer.render_many(inputs)
+    except BundleUnsupportedModelError as e:
+        render_errors_total.inc()
+        logger.warning("Batch render failed (unsupported model): %s", e)
+        return ORJSONResponse(
+            status_code=400,
+            content={"detail": str(e), "code": "bundle_unsupported_model"},
+        )
+    except ValueError as e:
+        render_errors_total.inc()
+        logger.warning("Batch render failed: %s", e)
+        raise HTTPException(404, detail=str(e)) from e
+    elapsed = time.perf_counter() - t0
+    prompt_render_latency_seconds.observe(elapsed)
+    logger.info("Batch render of %d items completed in %.3fs", len(inputs), elapsed)
+    for inp, (rendered_prompt, bundle_hash, personality_hash) in zip(
+        inputs, results, strict=True
+    ):
+        await audit_sink.record(
+            bundle_hash=bundle_hash,
+            personality_hash=personality_hash,
+            rendered_prompt=rendered_prompt,
+            personality_payload=personality_payload(
+                inp.semantic_traits, inp.activity_level, inp.stress, inp.task
+            ),
+        )
+    return RenderBatchResponse(
+        items=[
+            RenderResponse(
+                rendered_prompt=rendered_prompt,
+                bundle_version=inp.semver,
+                bundle_hash=bundle_hash,
+                personality_hash=personality_hash,
+            )
+            for inp, (rendered_prompt, bundle_hash, personality_hash) in zip(
+                inputs, results, strict=True
+            )
+        ],
+    )
+
+
+async def _load_stored_texts(
+    session: AsyncSession, rows: Sequence[PromptAudit]
+) -> None:
+    """
+    Load the dictionaries and compiled bundles needed to decode the texts of rows.
+
+    One query each at most.
+    """
+    await load_dictionaries(
+        session,
+        {r.content.dictionary_id for r in rows if r.content.dictionary_id is not None},
+    )
+    await load_plans(
+        session,
+        {
+            str(r.bundle_hash)
+            for r in rows
+            if r.content.rendered_prompt is None
+            and r.content.rendered_prompt_zstd is None
+        },
+    )
+
+
+def _reconstruction_failed(e: AuditReconstructionError) -> ORJSONResponse:
+    logger.error("Audit read failed: %s", e)
+    return ORJSONResponse(
+        status_code=409,
+        content={"detail": str(e), "code": "audit_reconstruction_failed"},
+    )
+
+
+@router_audit.get("", response_model=AuditListResponse)
+async def search_audit(
+    *,
+    limit: int = Query(LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    cursor: Cursor | None = Depends(_cursor),
+    bundle_hash: str | None = Query(None, max_length=64),
+    personality_hash: str | None = Query(None, max_length=64),
+    engine_version: str | None = Query(None, max_length=64),
+    adapter_version: str | None = Query(None, max_length=64),
+    created_from: datetime | None = Query(
+        None, description="inclusive lower bound on created_at"
+    ),
+    created_to: datetime | None = Query(
+        None, description="exclusive upper bound on created_at"
+    ),
+    include_prompt: bool = False,
+    session: AsyncSession = Depends(get_db_read_session),
+) -> AuditListResponse | ORJSONResponse:
+    """
+    Search audit events in keyset pages ordered by (created_at, id).
+
+    Filters are hashes, versions and a time range. rendered_prompt only on request;
+    texts stored compressed or as render inputs are decoded for the page at once.
+    """
+    rows = await AuditService(session).search_page(
+        limit + 1,
+        cursor,
         bundle_hash=bundle_hash,
         personality_hash=personality_hash,
+        engine_version=engine_version,
+        adapter_version=adapter_version,
+        created_from=created_from,
+        created_to=created_to,
+        include_prompt=include_prompt,
     )
+    page = rows[:limit]
+    if include_prompt:
+        await _load_stored_texts(
+            session, [row for row in page if isinstance(row, PromptAudit)]
+        )
+    try:
+        items = [AuditListItem.model_validate(row) for row in page]
+    except AuditReconstructionError as e:
+        return _reconstruction_failed(e)
+    # A next page exists only when the page is full, so its last item is the row the
+    # cursor points at.
+    next_cursor = (
+        encode_cursor(items[-1].created_at, items[-1].id) if len(rows) > limit else None
+    )
+    return AuditListResponse(items=items, next_cursor=next_cursor)
 
 
 @router_audit.get("/{bundle_hash}", response_model=AuditRead)
 async def get_audit_by_bundle_hash(
     bundle_hash: str,
-    session: AsyncSession = Depends(get_db_session),
-) -> AuditRead:
-    """Get latest audit record by bundle_hash (for replay)."""
-    result = await session.execute(
-        select(PromptAudit).where(PromptAudit.bundle_hash == bundle_hash).order_by(PromptAudit.created_at.desc()).limit(1)
+    session: AsyncSession = Depends(get_db_read_session),
+    primary: AsyncSession = Depends(get_db_primary_read_session),
+) -> AuditRead | ORJSONResponse:
+    """
+    Get latest audit record by bundle_hash (for replay).
+
+    Served from a replica; a miss is retried on the primary. Texts stored as render
+    inputs are rebuilt from the bundle; one that fails its checksum is a 409.
+    """
+    query = (
+        select(PromptAudit)
+        .where(PromptAudit.bundle_hash == bundle_hash)
+        .order_by(PromptAudit.created_at.desc())
+        .limit(1)
     )
-    row = result.scalar_one_or_none()
+    row = (await session.execute(query)).scalar_one_or_none()
+    if row is None and session is not primary:
+        session = primary
+        row = (await session.execute(query)).scalar_one_or_none()
     if row is None:
         raise HTTPException(404, detail="Audit record not found")
-    return AuditRead.model_validate(row)
+    await _load_stored_texts(session, [row])
+    try:
+        return AuditRead.model_validate(row)
+    except AuditReconstructionError as e:
+        return _reconstruction_failed(e)
@@ -1,15 +1,25 @@
+import itertools
 import logging
+from datetime import timedelta
 from typing import AsyncGenerator, Awaitable, Callable
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from hnh_rest.settings import settings
-from prometheus_fastapi_instrumentator.instrumentation import \
-    PrometheusFastApiInstrumentator
-from hnh_rest.services.redis.lifespan import (init_redis,
-                                                                   shutdown_redis)
+from prometheus_fastapi_instrumentator.instrumentation import (
+    PrometheusFastApiInstrumentator,
+)
+from hnh_rest.services.redis.lifespan import init_redis, shutdown_redis
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+import asyncpg
+from hnh_rest.services.prompts.audit.archive import ArchiveExporter
+from hnh_rest.services.prompts.audit.compression import active_compressor
+from hnh_rest.services.prompts.audit.spool import AuditSpool
+from hnh_rest.services.prompts.audit.writer import AuditWriter
+from hnh_rest.services.prompts.sources.pg import init_connection
+from hnh_rest.db.partitions import PartitionMaintainer
+from hnh_rest.db.pool import engine_options
 
 
 def _setup_db(app: FastAPI) -> None:  # pragma: no cover
@@ -19,14 +29,17 @@ def _setup_db(app: FastAPI) -> None:  # pragma: no cover
     This function creates SQLAlchemy engine instance,
     session_factory for creating sessions
     and stores them in the application's state property.
+    Audit writes get a separate engine with its own pool
+    and timeouts. Replica engines, if configured, get their
+    own session factories that read sessions rotate through.
+    Read session factories are bound to AUTOCOMMIT, so
+    read-only requests skip transaction round trips.
 
     :param app: fastAPI application.
     """
     engine = create_async_engine(
         str(settings.db_url),
-        echo=settings.db_echo,
-        pool_size=settings.db_pool_size,
-        max_overflow=settings.db_max_overflow,
+        **engine_options("primary", settings.db_pool_size, settings.db_max_overflow),
     )
     session_factory = async_sessionmaker(
         engine,
@@ -34,6 +47,179 @@ def _setup_db(app: FastAPI) -> None:  # pragma: no cover
     )
     app.state.db_engine = engine
     app.state.db_session_factory = session_factory
+    app.state.db_read_session_factory = async_sessionmaker(
+        engine.execution_options(isolation_level="AUTOCOMMIT"),
+        expire_on_commit=False,
+    )
+
+    audit_engine = create_async_engine(
+        str(settings.db_url),
+        **engine_options(
+            "audit",
+            settings.db_audit_pool_size,
+            settings.db_audit_max_overflow,
+            pool_timeout=settings.db_audit_pool_timeout,
+            connect_args={"command_timeout": settings.db_audit_command_timeout},
+        ),
+    )
+    app.state.db_audit_engine = audit_engine
+    app.state.db_audit_session_factory = async_sessionmaker(
+        audit_engine,
+        expire_on_commit=False,
+    )
+
+    replica_engines = [
+        create_async_engine(
+            url,
+            **engine_options(
+                f"replica-{i}", settings.db_pool_size, settings.db_max_overflow
+            ),
+        )
+        for i, url in enumerate(settings.db_replica_urls)
+    ]
+    replica_factories = [
+        async_sessionmaker(
+            replica_engine.execution_options(isolation_level="AUTOCOMMIT"),
+            expire_on_commit=False,
+        )
+        for replica_engine in replica_engines
+    ]
+    app.state.db_replica_engines = replica_engines
+    app.state.db_replica_session_factories = (
+        itertools.cycle(replica_factories) if replica_factories else None
+    )
+    app.state.db_last_write_at = float("-inf")
+
+
+async def _setup_audit_writer(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts the write-behind audit writer.
+
+    Renders enqueue audit records; the writer inserts them
+    in batches over the dedicated audit engine. Batches the
+    database fails or does not take in time are spooled
+    to local disk (when enabled, in the configured
+    persistent directory) and replayed once it recovers. With
+    compression enabled, texts are stored zstd-compressed
+    with the newest audit dictionary (trained on first use).
+    In reconstruct mode, texts of registry bundles are stored
+    as render inputs and rebuilt on read.
+
+    :param app: fastAPI application.
+    """
+    compressor = None
+    if settings.audit_compression_enabled:
+        async with app.state.db_audit_session_factory() as session:
+            compressor = await active_compressor(
+                session, settings.audit_compression_level
+            )
+            await session.commit()
+    spool = None
+    if settings.audit_spool_enabled:
+        if settings.audit_spool_dir is None:
+            raise RuntimeError(
+                "audit_spool_enabled requires audit_spool_dir on persistent storage"
+            )
+        spool = AuditSpool(
+            settings.audit_spool_dir, settings.audit_spool_segment_max_bytes
+        )
+    app.state.audit_writer = AuditWriter(
+        app.state.db_audit_session_factory,
+        batch_size=settings.audit_batch_size,
+        flush_interval=settings.audit_flush_interval_seconds,
+        max_pending=settings.audit_queue_max_size,
+        write_timeout=settings.audit_write_timeout_seconds,
+        spool=spool,
+        replay_interval=settings.audit_spool_replay_interval_seconds,
+        compressor=compressor,
+        reconstruct=settings.audit_reconstruct_enabled,
+    )
+    app.state.audit_writer.start()
+
+
+def _setup_audit_partitions(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts periodic prompt_audit partition maintenance.
+
+    Upcoming partitions are created ahead of time over the
+    primary engine; with a retention, expired partitions are
+    dropped whole. A pass is skipped while another worker holds
+    the maintenance lock. ``app.state.audit_partitions`` is None
+    when disabled.
+
+    :param app: fastAPI application.
+    """
+    app.state.audit_partitions = None
+    if not settings.audit_partition_maintenance_enabled:
+        return
+    retention = (
+        timedelta(days=settings.audit_retention_days)
+        if settings.audit_retention_days > 0
+        else None
+    )
+    app.state.audit_partitions = PartitionMaintainer(
+        app.state.db_engine,
+        interval=settings.audit_partition_interval,
+        ahead=settings.audit_partitions_ahead,
+        retention=retention,
+        run_interval=settings.audit_partition_maintenance_interval_seconds,
+    )
+    app.state.audit_partitions.start()
+
+
+def _setup_audit_archive(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Starts periodic Parquet export of closed audit periods.
+
+    Exports read through a server-side cursor on the first
+    replica when replicas are configured, else the primary.
+    ``app.state.audit_archive`` is None when disabled.
+
+    :param app: fastAPI application.
+    """
+    app.state.audit_archive = None
+    if settings.audit_archive_enabled:
+        engine = (
+            app.state.db_replica_engines[0]
+            if app.state.db_replica_engines
+            else app.state.db_engine
+        )
+        app.state.audit_archive = ArchiveExporter(
+            engine,
+            settings.audit_archive_dir,
+            batch_size=settings.audit_archive_batch_size,
+            run_interval=settings.audit_archive_interval_seconds,
+            grace=timedelta(seconds=settings.audit_archive_grace_seconds),
+        )
+        app.state.audit_archive.start()
+
+
+async def _setup_pg_pool(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Creates raw asyncpg pool for the render fast path.
+
+    The pool is created only when the fast path is enabled,
+    otherwise ``app.state.pg_pool`` is None and renders go
+    through SQLAlchemy. It reads from the first replica
+    when replicas are configured. In PgBouncer mode statements
+    are not cached server-side.
+
+    :param app: fastAPI application.
+    """
+    app.state.pg_pool = None
+    if settings.db_fast_path_enabled:
+        pgbouncer = settings.db_pgbouncer_mode
+        app.state.pg_pool = await asyncpg.create_pool(
+            str(settings.db_read_dsn),
+            min_size=1,
+            max_size=max(settings.db_pgbouncer_pool_size, 1)
+            if pgbouncer
+            else settings.db_pool_size,
+            statement_cache_size=0 if pgbouncer else 100,
+            init=init_connection,
+        )
+
+
 def setup_prometheus(app: FastAPI) -> None:  # pragma: no cover
     """
     Enables prometheus integration.
@@ -46,7 +232,9 @@ def setup_prometheus(app: FastAPI) -> None:  # pragma: no cover
 
 
 @asynccontextmanager
-async def lifespan_setup(app: FastAPI) -> AsyncGenerator[None, None]:  # pragma: no cover
+async def lifespan_setup(
+    app: FastAPI,
+) -> AsyncGenerator[None, None]:  # pragma: no cover
     """
     Actions to run on application startup.
 
@@ -59,11 +247,25 @@ async def lifespan_setup(app: FastAPI) -> AsyncGenerator[None, None]:  # pragma:
 
     app.middleware_stack = None
     _setup_db(app)
+    await _setup_audit_writer(app)
+    _setup_audit_partitions(app)
+    _setup_audit_archive(app)
+    await _setup_pg_pool(app)
     init_redis(app)
     setup_prometheus(app)
     app.middleware_stack = app.build_middleware_stack()
 
     yield
+    await app.state.audit_writer.stop()
+    if app.state.audit_partitions is not None:
+        await app.state.audit_partitions.stop()
+    if app.state.audit_archive is not None:
+        await app.state.audit_archive.stop()
     await app.state.db_engine.dispose()
-    
+    await app.state.db_audit_engine.dispose()
+    for replica_engine in app.state.db_replica_engines:
+        await replica_engine.dispose()
+    if app.state.pg_pool is not None:
+        await app.state.pg_pool.close()
+
     await shutdown_redis(app)
@@ -4,7 +4,7 @@ from typing import Any, AsyncGenerator
 from unittest.mock import Mock
 
 import pytest
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from httpx import AsyncClient, ASGITransport
 from fakeredis import FakeServer
 from fakeredis.aioredis import FakeConnection
@@ -13,10 +13,24 @@ from hnh_rest.services.redis.dependency import get_redis_pool
 
 from hnh_rest.settings import settings
 from hnh_rest.web.application import get_app
-from sqlalchemy.ext.asyncio import (AsyncConnection, AsyncEngine, AsyncSession,
-                                    async_sessionmaker, create_async_engine)
-from hnh_rest.db.dependencies import get_db_session
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from hnh_rest.db.dependencies import get_db_primary_read_session, get_db_session
 from hnh_rest.db.utils import create_database, drop_database
+from hnh_rest.services.prompts.audit.dependency import get_audit_sink
+from hnh_rest.services.prompts.audit.compression import clear_dictionaries
+from hnh_rest.services.prompts.audit.service import (
+    AuditRecord,
+    AuditService,
+    clear_known_texts,
+)
+from hnh_rest.services.prompts.plan_cache import clear_plans
+from hnh_rest.services.prompts.versions import clear_version_indexes
 
 
 @pytest.fixture(scope="session")
@@ -26,7 +40,25 @@ def anyio_backend() -> str:
 
     :return: backend name.
     """
-    return 'asyncio'
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _clear_process_caches() -> None:
+    """
+    Start every test with empty process caches.
+
+    These are the compiled plan, version index, known audit text and dictionary caches.
+
+    Tests roll back their bundles and audits, so a bundle_hash or bundle_id
+    may map to different rows in another test.
+    """
+    clear_plans()
+    clear_version_indexes()
+    clear_known_texts()
+    clear_dictionaries()
+
+
 @pytest.fixture(scope="session")
 async def _engine(anyio_backend: Any) -> AsyncGenerator[AsyncEngine, None]:
     """
@@ -51,6 +83,7 @@ async def _engine(anyio_backend: Any) -> AsyncGenerator[AsyncEngine, None]:
         await engine.dispose()
         await drop_database()
 
+
 @pytest.fixture
 async def dbsession(
     _engine: AsyncEngine,
@@ -80,6 +113,7 @@ async def dbsession(
         await trans.rollback()
         await connection.close()
 
+
 @pytest.fixture
 async def fake_redis_pool() -> AsyncGenerator[ConnectionPool, None]:
     """
@@ -95,6 +129,41 @@ async def fake_redis_pool() -> AsyncGenerator[ConnectionPool, None]:
 
     await pool.disconnect()
 
+
+class InlineAuditSink:
+    """
+    Audit sink writing through the given session at once.
+
+    Tests can thus read audits right after a render. With reconstruct, texts are stored
+    as render inputs (as the AuditWriter does in reconstruct mode).
+    """
+
+    def __init__(self, session: AsyncSession, reconstruct: bool = False) -> None:
+        self._service = AuditService(session, reconstruct=reconstruct)
+
+    async def record(
+        self,
+        bundle_hash: str,
+        personality_hash: str,
+        rendered_prompt: str,
+        engine_version: str | None = None,
+        adapter_version: str | None = None,
+        personality_payload: dict[str, Any] | None = None,
+    ) -> None:
+        await self._service.create_many(
+            [
+                AuditRecord(
+                    bundle_hash,
+                    personality_hash,
+                    rendered_prompt,
+                    engine_version,
+                    adapter_version,
+                    personality_payload,
+                )
+            ]
+        )
+
+
 @pytest.fixture
 def fastapi_app(
     dbsession: AsyncSession,
@@ -107,6 +176,10 @@ def fastapi_app(
     """
     application = get_app()
     application.dependency_overrides[get_db_session] = lambda: dbsession
+    application.dependency_overrides[get_db_primary_read_session] = lambda: dbsession
+    application.dependency_overrides[get_audit_sink] = lambda: InlineAuditSink(
+        dbsession
+    )
     application.dependency_overrides[get_redis_pool] = lambda: fake_redis_pool
     return application  # noqa: RET504
 
@@ -118,7 +191,8 @@ def fastapi_app_per_request_session(
 ) -> FastAPI:
     """
     App with a new DB session per request (for concurrency tests).
-    Each request commits and closes its own session.
+
+    Each request commits and closes its own session; read sessions only close.
     """
     session_factory = async_sessionmaker(
         _engine,
@@ -134,16 +208,25 @@ def fastapi_app_per_request_session(
                 await session.commit()
                 await session.close()
 
+    async def get_db_read_session_per_request() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            yield session
+
     application = get_app()
     application.dependency_overrides[get_db_session] = get_db_session_per_request
+    application.dependency_overrides[get_db_primary_read_session] = (
+        get_db_read_session_per_request
+    )
+    application.dependency_overrides[get_audit_sink] = (
+        lambda session=Depends(get_db_session_per_request): InlineAuditSink(session)
+    )
     application.dependency_overrides[get_redis_pool] = lambda: fake_redis_pool
     return application
 
 
 @pytest.fixture
 async def client(
-    fastapi_app: FastAPI,
-    anyio_backend: Any
+    fastapi_app: FastAPI, anyio_backend: Any
 ) -> AsyncGenerator[AsyncClient, None]:
     """
     Fixture that creates client for requesting server.
@@ -151,8 +234,10 @@ async def client(
     :param fastapi_app: the application.
     :yield: client for the app.
     """
-    async with AsyncClient(transport=ASGITransport(fastapi_app), base_url="http://test", timeout=2.0) as ac:
-            yield ac
+    async with AsyncClient(
+        transport=ASGITransport(fastapi_app), base_url="http://test", timeout=2.0
+    ) as ac:
+        yield ac
 
 
 @pytest.fixture
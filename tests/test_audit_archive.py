@@ -0,0 +1,113 @@
+"""
+Columnar audit archive — Parquet files with dictionary-encoded columns.
+
+Each streamed batch is one row group.
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hnh_rest.db.partitions import MONTH, partition_for
+from hnh_rest.services.prompts.audit.archive import export_period, write_parquet
+from hnh_rest.services.prompts.audit.service import AuditRecord, AuditService
+
+pq = pytest.importorskip("pyarrow.parquet")
+pa = pytest.importorskip("pyarrow")
+
+
+async def _batches(
+    *batches: list[tuple[Any, ...]],
+) -> AsyncIterator[list[tuple[Any, ...]]]:
+    for batch in batches:
+        yield batch
+
+
+@pytest.mark.anyio
+async def test_write_parquet_dictionary_encodes_hashes_and_versions(
+    tmp_path: Path,
+) -> None:
+    """
+    Each batch is a row group.
+
+    Hashes and versions read back dictionary-encoded, nulls preserved.
+    """
+    at = datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+    first = [
+        (uuid4(), "b1", "p1", "c1", "1.0", None, at),
+        (uuid4(), "b1", "p2", "c2", "1.0", None, at),
+    ]
+    second = [(uuid4(), "b2", "p1", "c1", None, "a", at)]
+    path = tmp_path / "prompt_audit_p202610.parquet"
+
+    assert await write_parquet(path, _batches(first, [], second)) == 3
+    assert list(tmp_path.glob("*.tmp")) == []
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert pa.types.is_dictionary(table.schema.field("bundle_hash").type)
+    assert pa.types.is_dictionary(table.schema.field("engine_version").type)
+    assert table.column("bundle_hash").to_pylist() == ["b1", "b1", "b2"]
+    assert table.column("engine_version").to_pylist() == ["1.0", "1.0", None]
+    assert table.column("created_at").to_pylist() == [at, at, at]
+
+
+@pytest.mark.anyio
+async def test_write_parquet_never_replaces_a_published_file(tmp_path: Path) -> None:
+    """
+    A file another exporter published first is kept.
+
+    Only an explicit overwrite replaces it.
+    """
+    at = datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+    path = tmp_path / "prompt_audit_p202610.parquet"
+    await write_parquet(path, _batches([(uuid4(), "b1", "p1", "c1", None, None, at)]))
+
+    with pytest.raises(FileExistsError):
+        await write_parquet(
+            path, _batches([(uuid4(), "b2", "p2", "c2", None, None, at)])
+        )
+    assert pq.read_table(path).column("bundle_hash").to_pylist() == ["b1"]
+    assert list(tmp_path.glob("*.tmp")) == []
+
+    await write_parquet(
+        path, _batches([(uuid4(), "b2", "p2", "c2", None, None, at)]), overwrite=True
+    )
+    assert pq.read_table(path).column("bundle_hash").to_pylist() == ["b2"]
+
+
+@pytest.mark.anyio
+async def test_export_period_streams_only_that_period(
+    dbsession: AsyncSession, tmp_path: Path
+) -> None:
+    """
+    A period export holds exactly the events created within the period.
+
+    It is not rewritten once archived.
+    """
+    inside = AuditRecord(
+        "arch-b",
+        "arch-p",
+        "t",
+        engine_version="e1",
+        created_at=datetime(2091, 2, 10, tzinfo=timezone.utc),
+    )
+    outside = AuditRecord(
+        "arch-b", "arch-p", "t", created_at=datetime(2091, 3, 1, tzinfo=timezone.utc)
+    )
+    await AuditService(dbsession).create_many([inside, outside])
+    conn = await dbsession.connection()
+    period = partition_for(datetime(2091, 2, 1, tzinfo=timezone.utc), MONTH)
+
+    path = await export_period(conn, period, tmp_path, batch_size=1)
+    assert path == tmp_path / "prompt_audit_p209102.parquet"
+    table = pq.read_table(path)
+    assert table.column("id").to_pylist() == [str(inside.id)]
+    assert table.column("engine_version").to_pylist() == ["e1"]
+
+    assert await export_period(conn, period, tmp_path, batch_size=1) is None
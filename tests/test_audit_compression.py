@@ -0,0 +1,91 @@
+"""
+Compressed audit text storage — zstd with registry dictionaries.
+
+The replay API returns identical text.
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from hnh_rest.services.prompts.audit.compression import (
+    AuditCompressor,
+    active_compressor,
+    build_dictionary,
+    decompress_text,
+)
+from hnh_rest.services.prompts.audit.service import AuditRecord, AuditService
+from hnh_rest.web.api.prompts.schema import AuditRead
+
+pytest.importorskip("zstandard")
+
+TEMPLATES = [
+    b"System: You are a helpful assistant. {{task}}",
+    b"Persona: calm, precise {{activity_level}}",
+]
+
+
+def test_dictionary_compresses_rendered_text_losslessly() -> None:
+    """
+    Texts built from the templates shrink with the dictionary.
+
+    They decompress byte-identically.
+    """
+    compressor = AuditCompressor(1, build_dictionary(TEMPLATES))
+    text = (
+        "System: You are a helpful assistant. summarise ✓\n\nPersona: calm, precise 0.5"
+    )
+    data = compressor.compress(text)
+    assert len(data) < len(text.encode())
+    assert decompress_text(1, data) == text
+
+
+def test_audit_read_decompresses_stored_text() -> None:
+    """AuditRead returns the plain text for rows stored compressed."""
+    compressor = AuditCompressor(7, build_dictionary(TEMPLATES))
+    row = SimpleNamespace(
+        id=uuid4(),
+        bundle_hash="b",
+        personality_hash="p",
+        engine_version=None,
+        adapter_version=None,
+        rendered_prompt=None,
+        content=SimpleNamespace(
+            rendered_prompt=None,
+            rendered_prompt_zstd=compressor.compress("héllo"),
+            dictionary_id=7,
+        ),
+    )
+    assert AuditRead.model_validate(row).rendered_prompt == "héllo"
+
+
+@pytest.mark.anyio
+async def test_compressed_audit_replays_identically(
+    client: AsyncClient, dbsession: AsyncSession
+) -> None:
+    """A compressed text is served unchanged by GET /v1/audit."""
+    r = await client.post(
+        "/api/v1/prompts/templates",
+        json={
+            "template_id": "zstd-sys",
+            "semver": "1.0.0",
+            "role": "system",
+            "content": TEMPLATES[0].decode(),
+        },
+    )
+    assert r.status_code == status.HTTP_201_CREATED, r.text
+    compressor = await active_compressor(dbsession)
+    assert compressor is not None
+
+    text = "System: You are a helpful assistant. compress me"
+    await AuditService(dbsession, compressor).create_many(
+        [AuditRecord("zstd-bundle", "zstd-p", text)]
+    )
+
+    audit_r = await client.get("/api/v1/audit/zstd-bundle")
+    assert audit_r.status_code == status.HTTP_200_OK
+    assert audit_r.json()["rendered_prompt"] == text
@@ -0,0 +1,103 @@
+"""
+prompt_audit range partitions.
+
+Period bounds and names, creation ahead of time, moves out of DEFAULT, retention.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from hnh_rest.db.partitions import (
+    _LOCK_KEY,
+    DAY,
+    DEFAULT_PARTITION,
+    MONTH,
+    PartitionMaintainer,
+    drop_expired_partitions,
+    ensure_partitions,
+    list_partitions,
+    parse_partition,
+    partition_for,
+    partitions_between,
+)
+from hnh_rest.services.prompts.audit.service import AuditRecord, AuditService
+
+
+def _utc(*args: int) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_partition_bounds_and_names_round_trip() -> None:
+    """
+    Monthly periods roll over the year.
+
+    Names encode the bounds and parse back; DEFAULT is not a range.
+    """
+    december = partition_for(_utc(2026, 12, 1), MONTH)
+    assert (december.name, december.end) == ("prompt_audit_p202612", _utc(2027, 1, 1))
+    day = partition_for(_utc(2026, 2, 28), DAY)
+    assert (day.name, day.end) == ("prompt_audit_p20260228", _utc(2026, 3, 1))
+    assert parse_partition(december.name) == december
+    assert parse_partition(day.name) == day
+    assert parse_partition(DEFAULT_PARTITION) is None
+
+    covered = partitions_between(_utc(2026, 11, 15, 12), _utc(2027, 1, 1), MONTH)
+    assert [p.name for p in covered] == [
+        "prompt_audit_p202611",
+        "prompt_audit_p202612",
+        "prompt_audit_p202701",
+    ]
+
+
+async def _partition_of(dbsession: AsyncSession, record: AuditRecord) -> str:
+    return await dbsession.scalar(
+        text("SELECT tableoid::regclass::text FROM prompt_audit WHERE id = :id"),
+        {"id": record.id},
+    )
+
+
+@pytest.mark.anyio
+async def test_partitions_created_ahead_move_default_rows_and_expire(
+    dbsession: AsyncSession,
+) -> None:
+    """
+    Rows land in their period's partition.
+
+    Stray DEFAULT rows move into a new partition; retention drops it.
+    """
+    conn = await dbsession.connection()
+    early = AuditRecord("part-b", "part-p", "text", created_at=_utc(2090, 3, 10))
+    await AuditService(dbsession).create_many([early])
+    assert await _partition_of(dbsession, early) == DEFAULT_PARTITION
+
+    created = await ensure_partitions(conn, _utc(2090, 3, 5), MONTH, ahead=1)
+    assert created == ["prompt_audit_p209003", "prompt_audit_p209004"]
+    assert await _partition_of(dbsession, early) == "prompt_audit_p209003"
+    assert await ensure_partitions(conn, _utc(2090, 3, 5), MONTH, ahead=1) == []
+
+    later = AuditRecord(
+        "part-b", "part-p", "text", created_at=_utc(2090, 4, 30, 23, 59)
+    )
+    await AuditService(dbsession).create_many([later])
+    assert await _partition_of(dbsession, later) == "prompt_audit_p209004"
+
+    dropped = await drop_expired_partitions(conn, _utc(2090, 5, 15), timedelta(days=30))
+    assert dropped == ["prompt_audit_p209003"]
+    assert "prompt_audit_p209003" not in [p.name for p in await list_partitions(conn)]
+    assert await _partition_of(dbsession, later) == "prompt_audit_p209004"
+
+
+@pytest.mark.anyio
+async def test_maintenance_pass_skipped_while_another_process_holds_the_lock(
+    _engine: AsyncEngine,
+    dbsession: AsyncSession,
+) -> None:
+    """A worker finding the maintenance lock taken skips its pass without waiting."""
+    await dbsession.execute(
+        text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY}
+    )
+    maintainer = PartitionMaintainer(_engine, MONTH, ahead=1)
+    assert await maintainer.run_once(_utc(2091, 1, 5)) == ([], [])
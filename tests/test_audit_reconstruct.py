@@ -0,0 +1,174 @@
+"""
+Reconstructive audit storage — texts kept as render inputs.
+
+Texts are rebuilt on read and verified by checksum.
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from hnh_rest.db.models.prompt_audit_content import PromptAuditContent
+from hnh_rest.services.prompts.audit.dependency import get_audit_sink
+from hnh_rest.services.prompts.audit.reconstruct import (
+    AuditReconstructionError,
+    prompt_checksum,
+    reconstruct_text,
+)
+from hnh_rest.services.prompts.audit.service import AuditRecord, AuditService
+from hnh_rest.services.prompts.plan_cache import CompiledPlan, clear_plans, put_plan
+from hnh_rest.services.prompts.renderer import assemble, personality_payload
+from hnh_rest.web.api.prompts.schema import AuditRead
+from tests.conftest import InlineAuditSink
+
+SEGMENTS = (
+    "System: {{task}}",
+    "Traits {{semantic_traits}}",
+    "Activity {{activity_level}}",
+    "Stress {{stress}}",
+)
+
+
+def _content(payload: dict, checksum: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        bundle_hash="rb",
+        personality_hash="rp",
+        rendered_prompt=None,
+        rendered_prompt_zstd=None,
+        dictionary_id=None,
+        personality_payload=payload,
+        prompt_checksum=checksum,
+    )
+
+
+def test_reconstruct_text_verifies_checksum() -> None:
+    """
+    The plan and payload rebuild the exact text.
+
+    A text that no longer matches its checksum is rejected.
+    """
+    put_plan("rb", CompiledPlan("plan", SEGMENTS, frozenset()))
+    payload = personality_payload(
+        {"b": 1, "a": {"y": 2, "x": 1}}, 0.5, 0.25, "summarise ✓"
+    )
+    text = assemble(SEGMENTS, **payload)
+
+    assert reconstruct_text(_content(payload, prompt_checksum(text))) == text
+    with pytest.raises(AuditReconstructionError, match="checksum mismatch"):
+        reconstruct_text(_content(payload, prompt_checksum(text + "!")))
+
+    clear_plans()
+    with pytest.raises(AuditReconstructionError, match="not loaded"):
+        reconstruct_text(_content(payload, prompt_checksum(text)))
+
+
+def test_audit_read_rebuilds_reconstructive_row() -> None:
+    """AuditRead returns the rebuilt text for rows stored as render inputs."""
+    put_plan("rb", CompiledPlan("plan", SEGMENTS, frozenset()))
+    payload = personality_payload({}, 1.0, 0.0, "go")
+    text = assemble(SEGMENTS, **payload)
+    row = SimpleNamespace(
+        id=uuid4(),
+        bundle_hash="rb",
+        personality_hash="rp",
+        engine_version=None,
+        adapter_version=None,
+        rendered_prompt=None,
+        content=_content(payload, prompt_checksum(text)),
+    )
+    assert AuditRead.model_validate(row).rendered_prompt == text
+
+
+@pytest.mark.anyio
+async def test_reconstructive_audit_replays_identically(
+    fastapi_app: FastAPI,
+    client: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    """
+    A render audited as inputs stores no text.
+
+    GET /v1/audit rebuilds the exact prompt from the bundle.
+    """
+    fastapi_app.dependency_overrides[get_audit_sink] = lambda: InlineAuditSink(
+        dbsession, reconstruct=True
+    )
+    ids = []
+    for role, content in zip(("system", "user", "user", "user"), SEGMENTS, strict=True):
+        r = await client.post(
+            "/api/v1/prompts/templates",
+            json={
+                "template_id": f"rec-{len(ids)}",
+                "semver": "1.0.0",
+                "role": role,
+                "content": content,
+            },
+        )
+        assert r.status_code == status.HTTP_201_CREATED, r.text
+        ids.append(r.json()["id"])
+    r = await client.post(
+        "/api/v1/prompts/bundles",
+        json={
+            "bundle_id": "rec-bundle",
+            "semver": "1.0.0",
+            "system_template_id": ids[0],
+            "personality_template_id": ids[1],
+            "activity_template_id": ids[2],
+            "task_template_id": ids[3],
+        },
+    )
+    assert r.status_code == status.HTTP_201_CREATED, r.text
+
+    render_r = await client.post(
+        "/api/v1/prompts/render",
+        json={
+            "bundle_id": "rec-bundle",
+            "semver": "1.0.0",
+            "semantic_traits": {"z": [1, 2], "a": "x"},
+            "task": "t",
+        },
+    )
+    assert render_r.status_code == status.HTTP_200_OK, render_r.text
+    bundle_hash = render_r.json()["bundle_hash"]
+
+    content = await dbsession.scalar(
+        select(PromptAuditContent).where(PromptAuditContent.bundle_hash == bundle_hash)
+    )
+    assert content.rendered_prompt is None and content.rendered_prompt_zstd is None
+    assert content.bundle_pk is not None and content.personality_payload is not None
+
+    clear_plans()  # the read loads the compiled bundle itself
+    audit_r = await client.get(f"/api/v1/audit/{bundle_hash}")
+    assert audit_r.status_code == status.HTTP_200_OK, audit_r.text
+    assert audit_r.json()["rendered_prompt"] == render_r.json()["rendered_prompt"]
+
+
+@pytest.mark.anyio
+async def test_text_not_rebuilt_by_registry_is_stored_plain(
+    dbsession: AsyncSession,
+) -> None:
+    """
+    Inputs are stored only when the registry bundle reproduces the text.
+
+    Others keep the text itself.
+    """
+    payload = personality_payload({}, 0.5, 0.5, "inline")
+    record = AuditRecord(
+        "no-such-bundle", "rec-p", "inline text", personality_payload=payload
+    )
+    await AuditService(dbsession, reconstruct=True).create_many([record])
+
+    content = await dbsession.scalar(
+        select(PromptAuditContent).where(
+            PromptAuditContent.bundle_hash == "no-such-bundle"
+        )
+    )
+    assert content.rendered_prompt == "inline text"
+    assert content.bundle_pk is None
+    assert content.personality_payload == payload
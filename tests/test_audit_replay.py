@@ -0,0 +1,169 @@
+"""
+Audit replay verification — stored texts re-rendered with shared plans.
+
+Only mismatches are reported.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from hnh_rest.db.models.prompt_audit_content import PromptAuditContent
+from hnh_rest.services.prompts.audit.reconstruct import prompt_checksum
+from hnh_rest.services.prompts.audit.replay import (
+    BUNDLE_MISSING,
+    PERSONALITY_HASH,
+    TEXT,
+    ReplayGroup,
+    replay,
+    verify_chunk,
+)
+from hnh_rest.services.prompts.audit.service import AuditRecord, AuditService
+from hnh_rest.services.prompts.renderer import assemble_and_hash, personality_payload
+
+SEGMENTS = (
+    "System: {{task}}",
+    "Traits {{semantic_traits}}",
+    "Activity {{activity_level}}",
+    "Stress {{stress}}",
+)
+
+
+def test_verify_chunk_reports_only_mismatches() -> None:
+    """
+    Reproduced rows count as verified.
+
+    A changed text or personality hash is reported with both values.
+    """
+    rows = []
+    for task in ("a", "b", "c"):
+        payload = personality_payload({"k": task}, 0.5, 0.5, task)
+        text, bundle_hash, p_hash = assemble_and_hash(
+            "rp-bundle", "1.0.0", list(SEGMENTS), **payload
+        )
+        rows.append((p_hash, payload, prompt_checksum(text)))
+    rows[1] = (rows[1][0], rows[1][1], prompt_checksum("older engine output"))
+    rows[2] = ("stale-hash", rows[2][1], rows[2][2])
+
+    verified, mismatches = verify_chunk(
+        [ReplayGroup(bundle_hash, "rp-bundle", "1.0.0", SEGMENTS, tuple(rows))]
+    )
+
+    assert verified == 3
+    assert [(m.personality_hash, m.reason) for m in mismatches] == [
+        (rows[1][0], TEXT),
+        ("stale-hash", PERSONALITY_HASH),
+    ]
+    assert mismatches[0].expected == prompt_checksum("older engine output")
+
+
+@pytest.mark.anyio
+async def test_replay_verifies_audited_renders(
+    client: AsyncClient, dbsession: AsyncSession
+) -> None:
+    """
+    Renders audited through the API replay cleanly.
+
+    A text whose checksum no longer matches is reported.
+    """
+    ids = []
+    for role, content in zip(("system", "user", "user", "user"), SEGMENTS, strict=True):
+        r = await client.post(
+            "/api/v1/prompts/templates",
+            json={
+                "template_id": f"rp-{len(ids)}",
+                "semver": "1.0.0",
+                "role": role,
+                "content": content,
+            },
+        )
+        assert r.status_code == status.HTTP_201_CREATED, r.text
+        ids.append(r.json()["id"])
+    r = await client.post(
+        "/api/v1/prompts/bundles",
+        json={
+            "bundle_id": "rp-bundle",
+            "semver": "1.0.0",
+            "system_template_id": ids[0],
+            "personality_template_id": ids[1],
+            "activity_template_id": ids[2],
+            "task_template_id": ids[3],
+        },
+    )
+    assert r.status_code == status.HTTP_201_CREATED, r.text
+    renders = []
+    for task in ("one", "two", "three"):
+        r = await client.post(
+            "/api/v1/prompts/render",
+            json={
+                "bundle_id": "rp-bundle",
+                "semver": "1.0.0",
+                "semantic_traits": {"t": task},
+                "task": task,
+            },
+        )
+        assert r.status_code == status.HTTP_200_OK, r.text
+        renders.append(r.json())
+    bundle_hash = renders[0]["bundle_hash"]
+    conn = await dbsession.connection()
+
+    with ThreadPoolExecutor(2) as executor:
+        report = await replay(conn, executor, chunk_size=2, bundle_hash=bundle_hash)
+    assert report.verified == 3 and report.mismatches == []
+
+    tampered = renders[1]["personality_hash"]
+    await dbsession.execute(
+        update(PromptAuditContent)
+        .where(
+            PromptAuditContent.bundle_hash == bundle_hash,
+            PromptAuditContent.personality_hash == tampered,
+        )
+        .values(
+            personality_payload=personality_payload({"t": "changed"}, 0.5, 0.5, "two")
+        )
+    )
+    report = await replay(conn, chunk_size=2, bundle_hash=bundle_hash)
+    assert report.verified == 3
+    assert [(m.personality_hash, m.reason) for m in report.mismatches] == [
+        (tampered, PERSONALITY_HASH)
+    ]
+
+    # A text the bundle did not reproduce when written (e.g. an older engine) has no
+    # bundle_pk and is still verified.
+    stale = renders[0]["personality_hash"]
+    payload = personality_payload({"t": "one"}, 0.0, 0.0, "one")
+    await AuditService(dbsession).create_many(
+        [
+            AuditRecord(
+                bundle_hash, stale, "older engine output", personality_payload=payload
+            )
+        ]
+    )
+    report = await replay(conn, chunk_size=2, bundle_hash=bundle_hash)
+    assert report.verified == 4
+    assert {(m.personality_hash, m.reason) for m in report.mismatches} == {
+        (tampered, PERSONALITY_HASH),
+        (stale, TEXT),
+    }
+
+
+@pytest.mark.anyio
+async def test_replay_reports_texts_of_bundles_not_in_registry(
+    dbsession: AsyncSession,
+) -> None:
+    """Texts of bundles missing from the registry are reported."""
+    payload = personality_payload({}, 0.5, 0.5, "inline")
+    await AuditService(dbsession).create_many(
+        [AuditRecord("rp-unknown", "rp-p", "inline text", personality_payload=payload)]
+    )
+    conn = await dbsession.connection()
+
+    report = await replay(conn, bundle_hash="rp-unknown")
+    assert report.verified == 1
+    assert [(m.bundle_hash, m.reason) for m in report.mismatches] == [
+        ("rp-unknown", BUNDLE_MISSING)
+    ]
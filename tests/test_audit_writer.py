@@ -0,0 +1,250 @@
+"""
+Write-behind audit writer.
+
+Batching, backpressure, full flush on stop, failed batches, local spool.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from hnh_rest.services.prompts.audit.bloom import BloomFilter
+from hnh_rest.services.prompts.audit.service import AuditRecord
+from hnh_rest.services.prompts.audit.spool import AuditSpool
+from hnh_rest.services.prompts.audit.writer import AuditWriter
+
+
+class _FakeSession:
+    """
+    Async session stand-in.
+
+    It records the number of audit events of each multi-row INSERT.
+    """
+
+    def __init__(self, batches: list[int], fail: list[bool]) -> None:
+        self._batches = batches
+        self._fail = fail
+
+    async def __aenter__(self) -> "_FakeSession":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    def begin_nested(self) -> "_FakeSession":
+        return self
+
+    async def execute(self, stmt: Any) -> None:
+        if self._fail and self._fail.pop(0):
+            raise OperationalError(
+                "INSERT", {}, ConnectionError("audit database unavailable")
+            )
+        if stmt.table.name == "prompt_audit":
+            self._batches.append(
+                sum(1 for key in stmt.compile().params if key.startswith("id_m"))
+            )
+
+    async def commit(self) -> None:
+        return None
+
+
+def _writer(
+    batches: list[int], fail: list[bool] | None = None, **kwargs: Any
+) -> AuditWriter:
+    return AuditWriter(lambda: _FakeSession(batches, fail or []), **kwargs)  # type: ignore[arg-type]
+
+
+async def _record(writer: AuditWriter, i: int) -> None:
+    await writer.record(f"b{i}", f"p{i}", f"prompt {i}")
+
+
+@pytest.mark.anyio
+async def test_writer_batches_and_flushes_on_stop() -> None:
+    """
+    Queued records are written in multi-row batches of at most batch_size.
+
+    Stop writes the rest.
+    """
+    batches: list[int] = []
+    writer = _writer(batches, batch_size=3, flush_interval=0.01)
+    writer.start()
+    for i in range(7):
+        await _record(writer, i)
+    await writer.stop()
+
+    assert sum(batches) == 7
+    assert max(batches) <= 3
+    assert writer.pending() == 0
+
+
+@pytest.mark.anyio
+async def test_writer_applies_backpressure_when_full() -> None:
+    """
+    With max_pending records queued, record() waits for room.
+
+    The queue does not grow.
+    """
+    batches: list[int] = []
+    writer = _writer(batches, max_pending=2)
+    await _record(writer, 0)
+    await _record(writer, 1)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(_record(writer, 2), timeout=0.05)
+
+    await writer.stop()
+    assert sum(batches) == 2
+
+
+@pytest.mark.anyio
+async def test_writer_survives_failed_batch() -> None:
+    """A failed INSERT drops its batch; later records are still written."""
+    batches: list[int] = []
+    writer = _writer(batches, fail=[True], batch_size=10, flush_interval=0.01)
+    writer.start()
+    await _record(writer, 0)
+    await asyncio.sleep(0.05)
+    await _record(writer, 1)
+    await writer.stop()
+
+    assert batches == [1]
+
+
+@pytest.mark.anyio
+async def test_spool_survives_restart_and_drains_in_order(tmp_path: Path) -> None:
+    """
+    Spooled records outlive the process.
+
+    Drain replays them oldest first and empties the spool.
+    """
+    spool = AuditSpool(tmp_path, segment_max_bytes=200)
+    records = [AuditRecord(f"b{i}", f"p{i}", f"prompt {i}") for i in range(5)]
+    await spool.append(records[:2])
+    await spool.append(records[2:])
+    spool.close()
+
+    restarted = AuditSpool(tmp_path)
+    restarted.open()
+    assert restarted.depth() == 5
+    replayed: list[AuditRecord] = []
+
+    async def write(batch: list[AuditRecord]) -> None:
+        replayed.extend(batch)
+
+    assert await restarted.drain(write, batch_size=2) == 5
+    assert replayed == records
+    assert restarted.depth() == 0
+    assert not list(tmp_path.glob("worker-*/*.ndjson"))
+
+
+@pytest.mark.anyio
+async def test_spool_skips_torn_tail_and_keeps_segment_on_failure(
+    tmp_path: Path,
+) -> None:
+    """
+    A torn last line (crash mid-write) is skipped.
+
+    A failing write keeps the segment for the next drain.
+    """
+    spool = AuditSpool(tmp_path)
+    await spool.append([AuditRecord("b", "p", "prompt")])
+    segment = next(tmp_path.glob("worker-*/*.ndjson"))
+    with segment.open("ab") as f:
+        f.write(b'{"bundle_hash": "tor')
+
+    async def failing(batch: list[AuditRecord]) -> None:
+        raise ConnectionError("still down")
+
+    with pytest.raises(ConnectionError):
+        await spool.drain(failing, batch_size=10)
+    assert segment.exists()
+
+    replayed: list[AuditRecord] = []
+
+    async def write(batch: list[AuditRecord]) -> None:
+        replayed.extend(batch)
+
+    assert await spool.drain(write, batch_size=10) == 1
+    assert [r.bundle_hash for r in replayed] == ["b"]
+
+
+@pytest.mark.anyio
+async def test_writer_spools_failed_batches_and_replays(tmp_path: Path) -> None:
+    """
+    With a spool, a failed INSERT loses nothing.
+
+    The batch is spooled and replayed when the database is back.
+    """
+    batches: list[int] = []
+    spool = AuditSpool(tmp_path)
+    writer = _writer(
+        batches,
+        fail=[True],
+        batch_size=10,
+        flush_interval=0.01,
+        spool=spool,
+        replay_interval=0.02,
+    )
+    writer.start()
+    await _record(writer, 0)
+    await asyncio.sleep(0.01)
+    await _record(writer, 1)
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if sum(batches) == 2:
+            break
+    await writer.stop()
+
+    assert sum(batches) == 2
+    assert not list(tmp_path.glob("worker-*/*.ndjson"))
+
+
+@pytest.mark.anyio
+async def test_writer_survives_unspoolable_batch(tmp_path: Path) -> None:
+    """
+    A batch the spool cannot serialise is dropped.
+
+    The drain task keeps running, so later records are written and stop returns.
+    """
+    batches: list[int] = []
+    writer = _writer(
+        batches,
+        fail=[True],
+        batch_size=10,
+        flush_interval=0.01,
+        spool=AuditSpool(tmp_path),
+        replay_interval=0.02,
+    )
+    writer.start()
+    await writer.record("b0", "p0", "prompt 0", personality_payload={"x": object()})
+    await asyncio.sleep(0.05)
+    await _record(writer, 1)
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if sum(batches) == 1:
+            break
+    await asyncio.wait_for(writer.stop(), timeout=1)
+
+    assert batches == [1]
+    assert writer.pending() == 0
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives() -> None:
+    """
+    Every added key is found.
+
+    Unseen keys are rarely reported present; a full filter starts over.
+    """
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"b{i}:p{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+    bloom.add("one-more")
+    assert "one-more" in bloom
+    assert sum(key in bloom for key in keys) < 100
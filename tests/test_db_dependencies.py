@@ -0,0 +1,102 @@
+"""
+Session routing dependencies — replicas for reads, primary for writes.
+
+Reads right after a write stay on the primary.
+"""
+
+import itertools
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from hnh_rest.db.dependencies import (
+    get_db_primary_read_session,
+    get_db_read_session,
+    get_db_write_session,
+)
+
+
+def _request(**state: object) -> Mock:
+    request = Mock()
+    request.app.state = SimpleNamespace(**state)
+    return request
+
+
+@pytest.mark.anyio
+async def test_read_session_uses_replica_then_primary_after_write() -> None:
+    """
+    Reads go to replicas in rotation.
+
+    Right after a registry write they stay on the primary.
+    """
+    primary = Mock(name="primary")
+    replicas = [AsyncMock(name="replica-1"), AsyncMock(name="replica-2")]
+    factories = [Mock(return_value=r) for r in replicas]
+    request = _request(
+        db_replica_session_factories=itertools.cycle(factories),
+        db_last_write_at=float("-inf"),
+    )
+
+    used = []
+    for _ in range(3):
+        gen = get_db_read_session(request, primary)
+        used.append(await gen.__anext__())
+        await gen.aclose()
+    assert used == [replicas[0], replicas[1], replicas[0]]
+    replicas[0].close.assert_awaited()
+
+    write_gen = get_db_write_session(request, primary)
+    assert await write_gen.__anext__() is primary
+    await write_gen.aclose()
+    assert time.monotonic() - request.app.state.db_last_write_at < 1
+
+    gen = get_db_read_session(request, primary)
+    assert await gen.__anext__() is primary
+    await gen.aclose()
+
+
+@pytest.mark.anyio
+async def test_read_session_without_replicas_is_primary() -> None:
+    """Without replicas (or lifespan state, as in tests) reads use the primary."""
+    primary = Mock(name="primary")
+    gen = get_db_read_session(_request(), primary)
+    assert await gen.__anext__() is primary
+    await gen.aclose()
+
+
+@pytest.mark.anyio
+async def test_primary_read_session_closes_without_commit() -> None:
+    """Read-only sessions are closed, never committed."""
+    read_session = AsyncMock(name="read")
+    gen = get_db_primary_read_session(
+        _request(db_read_session_factory=Mock(return_value=read_session))
+    )
+    assert await gen.__anext__() is read_session
+    await gen.aclose()
+    read_session.commit.assert_not_awaited()
+    read_session.close.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_unused_read_session_never_checks_out_a_connection() -> None:
+    """
+    A request that never queries completes without connecting.
+
+    This holds even for an unreachable database.
+    """
+    engine = create_async_engine("postgresql+asyncpg://nobody@127.0.0.1:1/none")
+    factory = async_sessionmaker(engine.execution_options(isolation_level="AUTOCOMMIT"))
+    request = _request(db_read_session_factory=factory)
+
+    primary_gen = get_db_primary_read_session(request)
+    primary = await primary_gen.__anext__()
+    read_gen = get_db_read_session(request, primary)
+    assert await read_gen.__anext__() is primary
+    await read_gen.aclose()
+    await primary_gen.aclose()
+
+    assert engine.pool.checkedout() == 0
+    await engine.dispose()
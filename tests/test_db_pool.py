@@ -0,0 +1,71 @@
+"""
+Engine options and pool instrumentation.
+
+Covers regular and PgBouncer (transaction pooler) modes.
+"""
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from hnh_rest.db import pool
+from hnh_rest.settings import settings
+
+
+def test_engine_options_regular_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Outside PgBouncer mode the pool is an instrumented queue pool."""
+    monkeypatch.setattr(settings, "db_pgbouncer_mode", False)
+    options = pool.engine_options("primary", 5, 10)
+    assert options["poolclass"] is pool.TimedAsyncAdaptedQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (5, 10)
+    assert "connect_args" not in options
+
+
+def test_engine_options_pgbouncer_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    PgBouncer mode disables statement caches and pooling.
+
+    Caller connect_args are kept.
+    """
+    monkeypatch.setattr(settings, "db_pgbouncer_mode", True)
+    monkeypatch.setattr(settings, "db_pgbouncer_pool_size", 0)
+    options = pool.engine_options(
+        "audit", 5, 10, pool_timeout=3.0, connect_args={"command_timeout": 2.0}
+    )
+    assert options["poolclass"] is pool.TimedNullPool
+    assert "pool_size" not in options and "pool_timeout" not in options
+    connect_args = options["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["command_timeout"] == 2.0
+    assert (
+        connect_args["prepared_statement_name_func"]()
+        != connect_args["prepared_statement_name_func"]()
+    )
+    create_async_engine(str(settings.db_url), **options).sync_engine.dispose()
+
+    monkeypatch.setattr(settings, "db_pgbouncer_pool_size", 2)
+    options = pool.engine_options("primary", 5, 10)
+    assert options["poolclass"] is pool.TimedAsyncAdaptedQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (2, 0)
+
+
+def test_checkout_wait_is_recorded_per_pool() -> None:
+    """Every checkout observes its wait time under the pool's logging name."""
+
+    class _Pool:
+        def _do_get(self) -> str:
+            return "connection"
+
+    class _TimedPool(pool._TimedCheckoutMixin, _Pool):
+        logging_name = "test-pool"
+
+    labels = {"pool": "test-pool"}
+    before = (
+        REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count", labels) or 0
+    )
+    assert _TimedPool()._do_get() == "connection"
+    assert (
+        REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count", labels)
+        == before + 1
+    )
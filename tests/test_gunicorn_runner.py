@@ -0,0 +1,50 @@
+import gc
+
+import pytest
+from fastapi import FastAPI
+
+from hnh_rest.gunicorn_runner import GunicornApplication
+from hnh_rest.web.api.monitoring.metrics import read_process_memory
+
+
+def test_preload_builds_app_in_master_and_freezes_gc() -> None:
+    """Preload mode returns a warmed app and freezes the heap for copy-on-write."""
+    application = GunicornApplication(
+        "hnh_rest.web.application:get_app",
+        host="127.0.0.1",
+        port=0,
+        workers=2,
+        preload=True,
+        factory=True,
+    )
+    assert application.cfg.preload_app
+    assert application.cfg.worker_class_str.endswith("PreloadedUvicornWorker")
+    try:
+        app = application.load()
+        assert isinstance(app, FastAPI)
+        assert app.openapi_schema is not None
+        assert gc.get_freeze_count() > 0
+        assert gc.isenabled()
+    finally:
+        gc.unfreeze()
+
+
+def test_preload_reenables_gc_when_the_app_fails_to_load() -> None:
+    """A failing app import in preload mode leaves the master's GC enabled."""
+    application = GunicornApplication(
+        "hnh_rest.web.missing_module:get_app",
+        host="127.0.0.1",
+        port=0,
+        workers=2,
+        preload=True,
+        factory=True,
+    )
+    with pytest.raises(ImportError):
+        application.load()
+    assert gc.isenabled()
+
+
+def test_read_process_memory_reports_rss() -> None:
+    """Resident memory of the current process is reported in bytes."""
+    memory = read_process_memory()
+    assert memory["rss"] > 0
@@ -0,0 +1,129 @@
+"""
+Alembic migrations against a seeded database.
+
+Each test migrates its own database, apart from the one the suite builds with
+``create_all``, by running alembic in a subprocess as deployments do.
+"""
+
+import os
+import subprocess
+import sys
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from hnh_rest.settings import settings
+
+ROOT = Path(__file__).resolve().parent.parent
+DB_BASE = f"{settings.db_base}_migrations"
+
+
+def _alembic(*args: str) -> None:
+    subprocess.run(  # noqa: S603
+        [sys.executable, "-m", "alembic", *args],
+        cwd=ROOT,
+        env={**os.environ, "HNH_REST_DB_BASE": DB_BASE},
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+async def migration_engine(anyio_backend: Any) -> AsyncGenerator[AsyncEngine]:
+    """
+    Create an empty database for alembic to migrate.
+
+    :yield: engine bound to that database.
+    """
+    admin = create_async_engine(
+        str(settings.db_url.with_path("/postgres")),
+        isolation_level="AUTOCOMMIT",
+    )
+    async with admin.connect() as conn:
+        await conn.execute(text(f'DROP DATABASE IF EXISTS "{DB_BASE}"'))
+        await conn.execute(text(f'CREATE DATABASE "{DB_BASE}" TEMPLATE template1'))
+    engine = create_async_engine(str(settings.db_url.with_path(f"/{DB_BASE}")))
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+        async with admin.connect() as conn:
+            await conn.execute(text(f'DROP DATABASE IF EXISTS "{DB_BASE}"'))
+        await admin.dispose()
+
+
+@pytest.mark.anyio
+async def test_migrations_upgrade_and_downgrade_empty_database(
+    migration_engine: AsyncEngine,
+) -> None:
+    """Every revision applies and reverts on an empty database."""
+    _alembic("upgrade", "head")
+    _alembic("downgrade", "base")
+    async with migration_engine.connect() as conn:
+        tables = await conn.execute(
+            text(
+                "SELECT count(*) FROM pg_tables "
+                "WHERE schemaname = 'public' AND tablename LIKE 'prompt_%'",
+            ),
+        )
+        assert tables.scalar_one() == 0
+
+
+@pytest.mark.anyio
+async def test_audit_content_migration_round_trips_seeded_texts(
+    migration_engine: AsyncEngine,
+) -> None:
+    """
+    Moving audit texts into prompt_audit_content keeps every event's text.
+
+    More distinct texts than one backfill page, an empty text and a text shared
+    by two events; the downgrade puts each text back on its events.
+    """
+    _alembic("upgrade", "2c3d4e5f6a7b")
+    async with migration_engine.begin() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO prompt_audit (id, bundle_hash, personality_hash, "
+                "rendered_prompt) "
+                "SELECT gen_random_uuid(), 'b' || (n % 3), 'p', 'prompt ' || n "
+                "FROM generate_series(1, 1500) AS n",
+            ),
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO prompt_audit (id, bundle_hash, personality_hash, "
+                "rendered_prompt) "
+                "VALUES (gen_random_uuid(), 'b1', 'p', 'prompt 1'), "
+                "(gen_random_uuid(), 'b0', 'p', '')",
+            ),
+        )
+        seeded = await conn.execute(
+            text("SELECT id, rendered_prompt FROM prompt_audit"),
+        )
+        texts = dict(seeded.tuples().all())
+
+    _alembic("upgrade", "3d4e5f6a7b8c")
+    async with migration_engine.connect() as conn:
+        contents = await conn.execute(
+            text("SELECT count(*) FROM prompt_audit_content"),
+        )
+        assert contents.scalar_one() == len(texts) - 1
+        joined = await conn.execute(
+            text(
+                "SELECT a.id, c.rendered_prompt FROM prompt_audit a "
+                "JOIN prompt_audit_content c USING "
+                "(bundle_hash, personality_hash, prompt_checksum)",
+            ),
+        )
+        assert dict(joined.tuples().all()) == texts
+
+    _alembic("downgrade", "2c3d4e5f6a7b")
+    async with migration_engine.connect() as conn:
+        restored = await conn.execute(
+            text("SELECT id, rendered_prompt FROM prompt_audit"),
+        )
+        assert dict(restored.tuples().all()) == texts
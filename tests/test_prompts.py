@@ -1,12 +1,28 @@
 """Phase 5 — Determinism & Replay tests for Prompt Spec v1."""
 
 import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
 
+import orjson
 import pytest
-from httpx import AsyncClient
+from httpx import AsyncClient, Response
 from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
+from hnh_rest.db.models.prompt_audit import PromptAudit
+from hnh_rest.db.models.prompt_audit_content import PromptAuditContent
+from hnh_rest.db.models.prompt_bundle_compiled import PromptBundleCompiled
+from hnh_rest.db.models.prompt_template_content import PromptTemplateContent
+from hnh_rest.services.prompts.audit.service import AuditRecord, AuditService
+from hnh_rest.services.prompts.pagination import decode_cursor, encode_cursor
+from hnh_rest.services.prompts.renderer import (
+    compute_bundle_hash,
+    compute_content_hash,
+    compute_plan_hash,
+)
 from hnh_rest.web.api.prompts.schema import (
     BundleCreate,
     TemplateCreate,
@@ -15,12 +31,36 @@ from hnh_rest.web.api.prompts.schema import (
 
 
 async def _create_templates(client: AsyncClient) -> list[str]:
-    """Create 4 templates (system, personality, activity, task); return list of template IDs."""
+    """
+    Create 4 templates (system, personality, activity, task).
+
+    Return list of template IDs.
+    """
     templates = [
-        {"template_id": "sys", "semver": "1.0.0", "role": "system", "content": "System: {{task}}"},
-        {"template_id": "persona", "semver": "1.0.0", "role": "user", "content": "Persona {{activity_level}}"},
-        {"template_id": "activity", "semver": "1.0.0", "role": "user", "content": "Activity {{stress}}"},
-        {"template_id": "task", "semver": "1.0.0", "role": "user", "content": "Task: {{task}}"},
+        {
+            "template_id": "sys",
+            "semver": "1.0.0",
+            "role": "system",
+            "content": "System: {{task}}",
+        },
+        {
+            "template_id": "persona",
+            "semver": "1.0.0",
+            "role": "user",
+            "content": "Persona {{activity_level}}",
+        },
+        {
+            "template_id": "activity",
+            "semver": "1.0.0",
+            "role": "user",
+            "content": "Activity {{stress}}",
+        },
+        {
+            "template_id": "task",
+            "semver": "1.0.0",
+            "role": "user",
+            "content": "Task: {{task}}",
+        },
     ]
     ids = []
     for t in templates:
@@ -38,6 +78,7 @@ async def _create_bundle(
     task_id: str,
     bundle_id: str = "test-bundle",
     semver: str = "1.0.0",
+    tags: list[str] | None = None,
 ) -> None:
     """Create one bundle referencing the four template IDs."""
     r = await client.post(
@@ -49,6 +90,7 @@ async def _create_bundle(
             "personality_template_id": personality_id,
             "activity_template_id": activity_id,
             "task_template_id": task_id,
+            "tags": tags or [],
         },
     )
     assert r.status_code == status.HTTP_201_CREATED, r.text
@@ -86,7 +128,15 @@ async def test_deterministic_render_snapshot(client: AsyncClient) -> None:
 async def test_bundle_immutability(client: AsyncClient) -> None:
     """Creating the same (bundle_id, semver) twice must return 409."""
     ids = await _create_templates(client)
-    await _create_bundle(client, ids[0], ids[1], ids[2], ids[3], bundle_id="immutable-bundle", semver="2.0.0")
+    await _create_bundle(
+        client,
+        ids[0],
+        ids[1],
+        ids[2],
+        ids[3],
+        bundle_id="immutable-bundle",
+        semver="2.0.0",
+    )
 
     r = await client.post(
         "/api/v1/prompts/bundles",
@@ -105,10 +155,30 @@ async def test_bundle_immutability(client: AsyncClient) -> None:
 async def _create_templates_race(client: AsyncClient) -> list[str]:
     """Create 4 templates with unique ids for race test (avoids polluting DB for other tests)."""
     templates = [
-        {"template_id": "race-sys", "semver": "1.0.0", "role": "system", "content": "System: {{task}}"},
-        {"template_id": "race-persona", "semver": "1.0.0", "role": "user", "content": "Persona {{activity_level}}"},
-        {"template_id": "race-activity", "semver": "1.0.0", "role": "user", "content": "Activity {{stress}}"},
-        {"template_id": "race-task", "semver": "1.0.0", "role": "user", "content": "Task: {{task}}"},
+        {
+            "template_id": "race-sys",
+            "semver": "1.0.0",
+            "role": "system",
+            "content": "System: {{task}}",
+        },
+        {
+            "template_id": "race-persona",
+            "semver": "1.0.0",
+            "role": "user",
+            "content": "Persona {{activity_level}}",
+        },
+        {
+            "template_id": "race-activity",
+            "semver": "1.0.0",
+            "role": "user",
+            "content": "Activity {{stress}}",
+        },
+        {
+            "template_id": "race-task",
+            "semver": "1.0.0",
+            "role": "user",
+            "content": "Task: {{task}}",
+        },
     ]
     ids = []
     for t in templates:
@@ -141,7 +211,9 @@ async def test_no_race_when_publishing_bundle_version(
     concurrency = 10
     results = await asyncio.gather(*[post_bundle() for _ in range(concurrency)])
 
-    assert results.count(status.HTTP_201_CREATED) == 1, f"Expected exactly one 201, got {results}"
+    assert results.count(status.HTTP_201_CREATED) == 1, (
+        f"Expected exactly one 201, got {results}"
+    )
     assert results.count(status.HTTP_409_CONFLICT) == concurrency - 1
 
     get_r = await client.get("/api/v1/prompts/bundles/race-bundle?semver=3.0.0")
@@ -168,7 +240,15 @@ async def test_constraint_validation_rejects_invalid(client: AsyncClient) -> Non
 async def test_replay_consistency(client: AsyncClient) -> None:
     """After render, GET audit by bundle_hash must return the same rendered_prompt."""
     ids = await _create_templates(client)
-    await _create_bundle(client, ids[0], ids[1], ids[2], ids[3], bundle_id="replay-bundle", semver="0.1.0")
+    await _create_bundle(
+        client,
+        ids[0],
+        ids[1],
+        ids[2],
+        ids[3],
+        bundle_id="replay-bundle",
+        semver="0.1.0",
+    )
 
     payload = {"bundle_id": "replay-bundle", "semver": "0.1.0", "task": "replay-me"}
     render_r = await client.post("/api/v1/prompts/render", json=payload)
@@ -181,11 +261,63 @@ async def test_replay_consistency(client: AsyncClient) -> None:
     assert audit_r.json()["rendered_prompt"] == rendered
 
 
+@pytest.mark.anyio
+async def test_repeated_renders_store_text_once(
+    client: AsyncClient, dbsession: AsyncSession
+) -> None:
+    """
+    Each render adds an audit event.
+
+    Each distinct rendered text of a pair is stored once.
+    """
+    ids = await _create_templates(client)
+    await _create_bundle(client, *ids, bundle_id="dedup-audit", semver="1.0.0")
+    payload = {"bundle_id": "dedup-audit", "semver": "1.0.0", "task": "same"}
+    for _ in range(3):
+        r = await client.post("/api/v1/prompts/render", json=payload)
+        assert r.status_code == status.HTTP_200_OK, r.text
+    bundle_hash = r.json()["bundle_hash"]
+
+    events = await dbsession.scalar(
+        select(func.count()).where(PromptAudit.bundle_hash == bundle_hash)
+    )
+    texts = await dbsession.scalar(
+        select(func.count()).where(PromptAuditContent.bundle_hash == bundle_hash)
+    )
+    assert (events, texts) == (3, 1)
+
+    audit_r = await client.get(f"/api/v1/audit/{bundle_hash}")
+    assert audit_r.json()["rendered_prompt"] == r.json()["rendered_prompt"]
+
+
+@pytest.mark.anyio
+async def test_pair_with_changed_text_keeps_both_texts(dbsession: AsyncSession) -> None:
+    """
+    A pair rendered with another text (e.g. after an engine change) stores it.
+
+    Each event keeps its own.
+    """
+    service = AuditService(dbsession)
+    old = AuditRecord("changed-b", "changed-p", "old text")
+    new = AuditRecord("changed-b", "changed-p", "new text")
+    await service.create_many([old])
+    await service.create_many([new, AuditRecord("changed-b", "changed-p", "old text")])
+
+    texts = await dbsession.scalar(
+        select(func.count()).where(PromptAuditContent.bundle_hash == "changed-b")
+    )
+    assert texts == 2
+    assert (await service.get_by_id(old.id)).rendered_prompt == "old text"
+    assert (await service.get_by_id(new.id)).rendered_prompt == "new text"
+
+
 @pytest.mark.anyio
 async def test_hash_stability(client: AsyncClient) -> None:
     """Rendered prompt hash identical across runs for same input (bundle_hash + personality_hash stable)."""
     ids = await _create_templates(client)
-    await _create_bundle(client, ids[0], ids[1], ids[2], ids[3], bundle_id="hash-bundle", semver="1.0.0")
+    await _create_bundle(
+        client, ids[0], ids[1], ids[2], ids[3], bundle_id="hash-bundle", semver="1.0.0"
+    )
 
     payload = {
         "bundle_id": "hash-bundle",
@@ -264,7 +396,9 @@ def test_semver_validation_strict() -> None:
 
 
 @pytest.mark.anyio
-async def test_bundle_create_with_tags_and_read_includes_tags(client: AsyncClient) -> None:
+async def test_bundle_create_with_tags_and_read_includes_tags(
+    client: AsyncClient,
+) -> None:
     """Create bundle with tags and without; GET returns tags."""
     ids = await _create_templates(client)
     # Without tags
@@ -311,7 +445,9 @@ async def test_bundle_create_with_tags_and_read_includes_tags(client: AsyncClien
 async def test_render_without_model_type_unchanged(client: AsyncClient) -> None:
     """Render without model_type works as before; bundle with tags=[] also works."""
     ids = await _create_templates(client)
-    await _create_bundle(client, ids[0], ids[1], ids[2], ids[3], bundle_id="no-mt-bundle", semver="1.0.0")
+    await _create_bundle(
+        client, ids[0], ids[1], ids[2], ids[3], bundle_id="no-mt-bundle", semver="1.0.0"
+    )
 
     r = await client.post(
         "/api/v1/prompts/render",
@@ -351,7 +487,9 @@ async def test_render_with_model_type_matching_tag_success(client: AsyncClient)
 
 
 @pytest.mark.anyio
-async def test_render_with_model_type_not_in_tags_returns_400(client: AsyncClient) -> None:
+async def test_render_with_model_type_not_in_tags_returns_400(
+    client: AsyncClient,
+) -> None:
     """Render with model_type not in bundle.tags returns 400 with detail and code."""
     ids = await _create_templates(client)
     await client.post(
@@ -382,10 +520,20 @@ async def test_render_with_model_type_not_in_tags_returns_400(client: AsyncClien
 
 
 @pytest.mark.anyio
-async def test_render_with_empty_string_model_type_skips_check(client: AsyncClient) -> None:
+async def test_render_with_empty_string_model_type_skips_check(
+    client: AsyncClient,
+) -> None:
     """Empty string model_type is treated as absent — no tag check, render succeeds."""
     ids = await _create_templates(client)
-    await _create_bundle(client, ids[0], ids[1], ids[2], ids[3], bundle_id="empty-mt-bundle", semver="1.0.0")
+    await _create_bundle(
+        client,
+        ids[0],
+        ids[1],
+        ids[2],
+        ids[3],
+        bundle_id="empty-mt-bundle",
+        semver="1.0.0",
+    )
 
     r = await client.post(
         "/api/v1/prompts/render",
@@ -397,3 +545,642 @@ async def test_render_with_empty_string_model_type_skips_check(client: AsyncClie
         },
     )
     assert r.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.anyio
+async def test_render_batch_matches_single_renders(client: AsyncClient) -> None:
+    """Batch render returns one result per item, in order, equal to single renders."""
+    ids = await _create_templates(client)
+    await _create_bundle(
+        client, ids[0], ids[1], ids[2], ids[3], bundle_id="batch-bundle", semver="1.0.0"
+    )
+
+    items = [
+        {"bundle_id": "batch-bundle", "semver": "1.0.0", "task": "first"},
+        {
+            "bundle_id": "batch-bundle",
+            "semver": "1.0.0",
+            "task": "second",
+            "stress": 0.3,
+        },
+    ]
+    r = await client.post("/api/v1/prompts/render/batch", json={"items": items})
+    assert r.status_code == status.HTTP_200_OK, r.text
+    batch = r.json()["items"]
+    assert len(batch) == 2
+
+    for item, result in zip(items, batch, strict=True):
+        single = await client.post("/api/v1/prompts/render", json=item)
+        assert single.json() == result
+
+    missing = await client.post(
+        "/api/v1/prompts/render/batch",
+        json={"items": [{"bundle_id": "no-such-bundle", "semver": "1.0.0"}]},
+    )
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.anyio
+async def test_bulk_template_delete_reports_in_use_and_not_found(
+    client: AsyncClient,
+) -> None:
+    """
+    Bulk delete removes unreferenced templates and keeps the ones a bundle uses.
+
+    Results are in request order.
+    """
+    ids = await _create_templates(client)
+    await _create_bundle(
+        client, ids[0], ids[1], ids[2], ids[3], bundle_id="bulk-delete-bundle"
+    )
+    r = await client.post(
+        "/api/v1/prompts/templates",
+        json={
+            "template_id": "orphan",
+            "semver": "1.0.0",
+            "role": "user",
+            "content": "Unused",
+        },
+    )
+    orphan = r.json()["id"]
+    missing = "00000000-0000-0000-0000-000000000000"
+
+    r = await client.post(
+        "/api/v1/prompts/templates:delete",
+        json={"ids": [orphan, ids[1], missing, ids[3]]},
+    )
+    assert r.status_code == status.HTTP_200_OK, r.text
+    assert r.json() == {
+        "deleted": [orphan],
+        "in_use": [ids[1], ids[3]],
+        "not_found": [missing],
+    }
+
+    again = await client.post(
+        "/api/v1/prompts/templates:delete", json={"ids": [orphan]}
+    )
+    assert again.json() == {"deleted": [], "in_use": [], "not_found": [orphan]}
+
+
+@pytest.mark.anyio
+async def test_resolve_bundle_hashes(client: AsyncClient) -> None:
+    """
+    Audit bundle hashes resolve back to their bundles in one call.
+
+    Unknown hashes are reported.
+    """
+    ids = await _create_templates(client)
+    await _create_bundle(
+        client,
+        ids[0],
+        ids[1],
+        ids[2],
+        ids[3],
+        bundle_id="resolve-bundle",
+        semver="1.0.0",
+    )
+    await _create_bundle(
+        client,
+        ids[0],
+        ids[1],
+        ids[2],
+        ids[3],
+        bundle_id="resolve-bundle",
+        semver="1.1.0",
+    )
+
+    r = await client.post(
+        "/api/v1/prompts/render",
+        json={"bundle_id": "resolve-bundle", "semver": "1.1.0"},
+    )
+    rendered_hash = r.json()["bundle_hash"]
+    other_hash = compute_bundle_hash("resolve-bundle", "1.0.0")
+
+    r = await client.post(
+        "/api/v1/prompts/bundles:resolve",
+        json={"bundle_hashes": [rendered_hash, "unknown", other_hash]},
+    )
+    assert r.status_code == status.HTTP_200_OK, r.text
+    data = r.json()
+    assert [(b["semver"], b["bundle_hash"]) for b in data["items"]] == [
+        ("1.1.0", rendered_hash),
+        ("1.0.0", other_hash),
+    ]
+    assert data["not_found"] == ["unknown"]
+
+
+@pytest.mark.anyio
+async def test_create_conflicts_and_missing_templates(client: AsyncClient) -> None:
+    """
+    Duplicate template (template_id, semver) is 409.
+
+    A bundle naming an unknown template is 404 with its id.
+    """
+    ids = await _create_templates(client)
+    r = await client.post(
+        "/api/v1/prompts/templates",
+        json={
+            "template_id": "sys",
+            "semver": "1.0.0",
+            "role": "system",
+            "content": "Other",
+        },
+    )
+    assert r.status_code == status.HTTP_409_CONFLICT
+
+    missing = "00000000-0000-0000-0000-000000000001"
+    r = await client.post(
+        "/api/v1/prompts/bundles",
+        json={
+            "bundle_id": "missing-template-bundle",
+            "semver": "1.0.0",
+            "system_template_id": ids[0],
+            "personality_template_id": missing,
+            "activity_template_id": ids[2],
+            "task_template_id": ids[3],
+        },
+    )
+    assert r.status_code == status.HTTP_404_NOT_FOUND
+    assert missing in r.json()["detail"]
+
+
+@pytest.mark.anyio
+async def test_import_ndjson_lines_split_across_chunks() -> None:
+    """
+    NDJSON lines are reassembled across body chunks.
+
+    Invalid lines become results, valid ones rows.
+    """
+    from hnh_rest.web.api.prompts.views import _ndjson_lines, _validate_import_chunk
+
+    async def body():
+        yield (
+            b'{"kind": "template", "template_id": "t", "semver": "1.0.0", '
+            b'"role": "user", "con'
+        )
+        yield (
+            b'tent": "x"}\n\n{"kind": "bundle", "bundle_id": "b", "semver": "1.0.0", '
+            b'"system_template": "t@1.0.0",'
+        )
+        yield (
+            b' "personality_template": "t@1.0.0", "activity_template": "t@1.0.0", '
+            b'"task_template": "t@1.0.0"}\n'
+        )
+        yield b'{"kind": "template", "template_id": "t"}'
+
+    lines = [line async for line in _ndjson_lines(body())]
+    assert [n for n, _ in lines] == [1, 3, 4]
+
+    templates, bundles, results = [], [], []
+    _validate_import_chunk(lines, templates, bundles, results)
+    assert [t.line for t in templates] == [1]
+    assert bundles[0].templates == (("t", "1.0.0"),) * 4
+    assert [(r.line, r.kind, r.status) for r in results] == [(4, "template", "invalid")]
+
+
+@pytest.mark.anyio
+async def test_import_ndjson_creates_registry_rows(client: AsyncClient) -> None:
+    """
+    Bulk import creates templates and bundles (with in-batch references).
+
+    One result is reported per line.
+    """
+    rows = [
+        {
+            "kind": "template",
+            "template_id": "imp-sys",
+            "semver": "1.0.0",
+            "role": "system",
+            "content": "S {{task}}",
+        },
+        {
+            "kind": "template",
+            "template_id": "imp-p",
+            "semver": "1.0.0",
+            "role": "user",
+            "content": "P",
+        },
+        {
+            "kind": "template",
+            "template_id": "imp-p",
+            "semver": "1.0.0",
+            "role": "user",
+            "content": "P again",
+        },
+        {
+            "kind": "bundle",
+            "bundle_id": "imp-bundle",
+            "semver": "1.0.0",
+            "system_template": "imp-sys@1.0.0",
+            "personality_template": "imp-p@1.0.0",
+            "activity_template": "imp-p@1.0.0",
+            "task_template": "imp-p@1.0.0",
+            "tags": ["gpt-4o"],
+        },
+        {
+            "kind": "bundle",
+            "bundle_id": "imp-missing",
+            "semver": "1.0.0",
+            "system_template": "imp-sys@1.0.0",
+            "personality_template": "nope@1.0.0",
+            "activity_template": "imp-p@1.0.0",
+            "task_template": "imp-p@1.0.0",
+        },
+        {"kind": "bundle", "bundle_id": "imp-bad"},
+    ]
+    body = b"\n".join(orjson.dumps(r) for r in rows)
+    r = await client.post(
+        "/api/v1/prompts/import",
+        content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert r.status_code == status.HTTP_200_OK, r.text
+    results = [orjson.loads(line) for line in r.text.splitlines()]
+    assert [(x["line"], x["status"]) for x in results] == [
+        (1, "created"),
+        (2, "created"),
+        (3, "duplicate"),
+        (4, "created"),
+        (5, "not_found"),
+        (6, "invalid"),
+    ]
+    assert "nope@1.0.0" in results[4]["detail"]
+
+    render = await client.post(
+        "/api/v1/prompts/render",
+        json={"bundle_id": "imp-bundle", "semver": "1.0.0", "task": "go"},
+    )
+    assert render.json()["rendered_prompt"] == "S go\n\nP\n\nP\n\nP"
+
+    again = await client.post("/api/v1/prompts/import", content=body)
+    assert [orjson.loads(line)["status"] for line in again.text.splitlines()][:4] == [
+        "exists",
+        "exists",
+        "duplicate",
+        "exists",
+    ]
+
+
+@pytest.mark.anyio
+async def test_render_resolves_ranges_and_channels(client: AsyncClient) -> None:
+    """
+    Render accepts ranges and channels and returns the resolved bundle_version.
+
+    Newly published versions are seen.
+    """
+    ids = await _create_templates(client)
+    for semver in ("1.0.0", "1.2.0", "2.0.0-beta.1"):
+        await _create_bundle(
+            client,
+            ids[0],
+            ids[1],
+            ids[2],
+            ids[3],
+            bundle_id="ranged-bundle",
+            semver=semver,
+        )
+
+    async def resolved(spec: str | None) -> str:
+        payload = {
+            "bundle_id": "ranged-bundle",
+            **({"semver": spec} if spec is not None else {}),
+        }
+        r = await client.post("/api/v1/prompts/render", json=payload)
+        assert r.status_code == status.HTTP_200_OK, r.text
+        return r.json()["bundle_version"]
+
+    assert await resolved("^1.0") == "1.2.0"
+    assert await resolved(None) == "1.2.0"
+    assert await resolved("latest") == "2.0.0-beta.1"
+    assert await resolved("beta") == "2.0.0-beta.1"
+
+    await _create_bundle(
+        client,
+        ids[0],
+        ids[1],
+        ids[2],
+        ids[3],
+        bundle_id="ranged-bundle",
+        semver="1.3.0",
+    )
+    assert await resolved("stable") == "1.3.0"
+
+    r = await client.post(
+        "/api/v1/prompts/render", json={"bundle_id": "ranged-bundle", "semver": "^3"}
+    )
+    assert r.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.anyio
+async def test_render_routes_by_model_type(client: AsyncClient) -> None:
+    """
+    With model_routing, the newest version tagged with model_type renders.
+
+    Untagged matches give 400.
+    """
+    ids = await _create_templates(client)
+    for semver, tags in (
+        ("1.0.0", ["gpt-4o", "claude-3"]),
+        ("1.1.0", ["claude-3"]),
+        ("1.2.0", []),
+    ):
+        await _create_bundle(
+            client, *ids, bundle_id="routed-bundle", semver=semver, tags=tags
+        )
+
+    async def routed(model_type: str) -> Response:
+        return await client.post(
+            "/api/v1/prompts/render",
+            json={
+                "bundle_id": "routed-bundle",
+                "model_type": model_type,
+                "model_routing": True,
+            },
+        )
+
+    assert (await routed("claude-3")).json()["bundle_version"] == "1.1.0"
+    assert (await routed("gpt-4o")).json()["bundle_version"] == "1.0.0"
+    r = await routed("llama")
+    assert r.status_code == status.HTTP_400_BAD_REQUEST
+    assert r.json()["code"] == "bundle_unsupported_model"
+
+
+@pytest.mark.anyio
+async def test_bundle_create_writes_compiled_row(
+    client: AsyncClient, dbsession: AsyncSession
+) -> None:
+    """
+    Creating a bundle stores its render-ready row, keyed by bundle_hash.
+
+    The row holds the contents in assembly order and the tags.
+    """
+    ids = await _create_templates(client)
+    r = await client.post(
+        "/api/v1/prompts/bundles",
+        json={
+            "bundle_id": "compiled-bundle",
+            "semver": "1.0.0",
+            "system_template_id": ids[0],
+            "personality_template_id": ids[1],
+            "activity_template_id": ids[2],
+            "task_template_id": ids[3],
+            "tags": ["gpt-4o"],
+        },
+    )
+    assert r.status_code == status.HTTP_201_CREATED, r.text
+
+    row = await dbsession.get(
+        PromptBundleCompiled, compute_bundle_hash("compiled-bundle", "1.0.0")
+    )
+    assert row is not None
+    assert str(row.bundle_pk) == r.json()["id"]
+    assert row.segments == [
+        "System: {{task}}",
+        "Persona {{activity_level}}",
+        "Activity {{stress}}",
+        "Task: {{task}}",
+    ]
+    assert row.plan_hash == compute_plan_hash(
+        [compute_content_hash(c) for c in row.segments]
+    )
+    assert row.tags == ["gpt-4o"]
+
+
+@pytest.mark.anyio
+async def test_template_versions_share_content_blob(
+    client: AsyncClient, dbsession: AsyncSession
+) -> None:
+    """
+    A new semver with unchanged content reuses the stored blob.
+
+    Reads still return the full content.
+    """
+    body = {"template_id": "dedup", "role": "user", "content": "Same text {{task}}"}
+    first = await client.post(
+        "/api/v1/prompts/templates", json={**body, "semver": "1.0.0"}
+    )
+    second = await client.post(
+        "/api/v1/prompts/templates", json={**body, "semver": "1.0.1"}
+    )
+    assert first.status_code == second.status_code == status.HTTP_201_CREATED, (
+        second.text
+    )
+    assert first.json()["content"] == second.json()["content"] == "Same text {{task}}"
+
+    result = await dbsession.execute(
+        select(func.count()).where(
+            PromptTemplateContent.content_hash
+            == compute_content_hash("Same text {{task}}")
+        )
+    )
+    assert result.scalar_one() == 1
+
+
+@pytest.mark.anyio
+async def test_pg_fast_path_matches_orm_sources(
+    client_per_request_session: AsyncClient,
+    dbsession: AsyncSession,
+) -> None:
+    """
+    asyncpg fast-path sources return the same rows as the ORM sources.
+
+    Compared are the bundle, its templates and its compiled row.
+    """
+    import asyncpg
+
+    from hnh_rest.services.prompts.renderer import ASSEMBLY_ORDER
+    from hnh_rest.services.prompts.sources import (
+        DbBundleSource,
+        DbTemplateSource,
+        PgBundleSource,
+        PgTemplateSource,
+    )
+    from hnh_rest.services.prompts.sources.pg import init_connection
+    from hnh_rest.settings import settings
+
+    client = client_per_request_session
+    ids = []
+    for role, content in (
+        ("system", "S {{task}}"),
+        ("user", "P"),
+        ("user", "A"),
+        ("user", "T"),
+    ):
+        r = await client.post(
+            "/api/v1/prompts/templates",
+            json={
+                "template_id": f"fast-{content[0]}",
+                "semver": "1.0.0",
+                "role": role,
+                "content": content,
+            },
+        )
+        assert r.status_code == status.HTTP_201_CREATED, r.text
+        ids.append(r.json()["id"])
+    r = await client.post(
+        "/api/v1/prompts/bundles",
+        json={
+            "bundle_id": "fast-bundle",
+            "semver": "1.0.0",
+            "system_template_id": ids[0],
+            "personality_template_id": ids[1],
+            "activity_template_id": ids[2],
+            "task_template_id": ids[3],
+            "tags": ["gpt-4o"],
+        },
+    )
+    assert r.status_code == status.HTTP_201_CREATED, r.text
+
+    pool = await asyncpg.create_pool(
+        str(settings.db_dsn), min_size=1, max_size=1, init=init_connection
+    )
+    try:
+        fast = await PgBundleSource(pool).get_bundle("fast-bundle", "1.0.0")
+        orm = await DbBundleSource(dbsession).get_bundle("fast-bundle", "1.0.0")
+        assert fast is not None and orm is not None
+        template_ids = [getattr(fast, a) for a in ASSEMBLY_ORDER]
+        assert template_ids == [getattr(orm, a) for a in ASSEMBLY_ORDER]
+        assert fast.tags == orm.tags == ["gpt-4o"]
+
+        fast_templates = await PgTemplateSource(pool).get_templates_by_ids(template_ids)
+        orm_templates = await DbTemplateSource(dbsession).get_templates_by_ids(
+            template_ids
+        )
+        assert {k: v.content for k, v in fast_templates.items()} == {
+            k: v.content for k, v in orm_templates.items()
+        }
+
+        bundle_hash = compute_bundle_hash("fast-bundle", "1.0.0")
+        compiled = await PgBundleSource(pool).get_compiled(bundle_hash)
+        assert compiled == await DbBundleSource(dbsession).get_compiled(bundle_hash)
+        assert compiled is not None and compiled[1:] == (
+            ["S {{task}}", "P", "A", "T"],
+            ["gpt-4o"],
+        )
+        assert await PgBundleSource(pool).get_bundle("fast-bundle", "9.9.9") is None
+    finally:
+        await pool.close()
+
+
+def test_list_cursor_round_trip() -> None:
+    """Cursors are opaque and URL-safe; a tampered cursor is rejected."""
+    created_at, id = (
+        datetime(2026, 10, 19, 12, 0, 0, 123456, tzinfo=timezone.utc),
+        uuid4(),
+    )
+    cursor = encode_cursor(created_at, id)
+    assert cursor.isascii() and "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, id)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.anyio
+async def test_list_bundles_pages_by_cursor(client: AsyncClient) -> None:
+    """
+    Paging with next_cursor visits every matching bundle once.
+
+    Prefix and tag filter the listing.
+    """
+    ids = await _create_templates(client)
+    for i in range(5):
+        await _create_bundle(
+            client, *ids, bundle_id=f"list-{i}", tags=["gpt-4o"] if i % 2 else []
+        )
+    await _create_bundle(client, *ids, bundle_id="other-bundle")
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"prefix": "list-", "limit": 2}
+    while True:
+        r = await client.get("/api/v1/prompts/bundles", params=params)
+        assert r.status_code == status.HTTP_200_OK, r.text
+        page = r.json()
+        assert len(page["items"]) <= 2
+        seen.extend(item["bundle_id"] for item in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert sorted(seen) == [f"list-{i}" for i in range(5)]
+
+    r = await client.get(
+        "/api/v1/prompts/bundles", params={"prefix": "list-", "tag": "gpt-4o"}
+    )
+    assert sorted(item["bundle_id"] for item in r.json()["items"]) == [
+        "list-1",
+        "list-3",
+    ]
+
+    r = await client.get("/api/v1/prompts/bundles", params={"cursor": "garbage"})
+    assert r.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+async def test_list_templates_projects_content(client: AsyncClient) -> None:
+    """
+    Templates list without content by default.
+
+    include_content adds content and constraints.
+    """
+    await _create_templates(client)
+
+    r = await client.get("/api/v1/prompts/templates", params={"prefix": "sys"})
+    assert r.status_code == status.HTTP_200_OK, r.text
+    [item] = r.json()["items"]
+    assert item["template_id"] == "sys"
+    assert item["content"] is None
+
+    r = await client.get(
+        "/api/v1/prompts/templates", params={"prefix": "sys", "include_content": True}
+    )
+    assert r.json()["items"][0]["content"] == "System: {{task}}"
+
+
+@pytest.mark.anyio
+async def test_audit_search_pages_and_filters(
+    client: AsyncClient, dbsession: AsyncSession
+) -> None:
+    """
+    Audit search pages by (created_at, id) under filters.
+
+    The prompt text is returned only on request.
+    """
+    records = [
+        AuditRecord(
+            "search-b",
+            f"search-p{i % 2}",
+            f"text {i % 2}",
+            engine_version="e1" if i < 4 else "e2",
+            created_at=datetime(2092, 1, 1, i, tzinfo=timezone.utc),
+        )
+        for i in range(5)
+    ]
+    await AuditService(dbsession).create_many(records)
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"bundle_hash": "search-b", "limit": 2}
+    while True:
+        r = await client.get("/api/v1/audit", params=params)
+        assert r.status_code == status.HTTP_200_OK, r.text
+        page = r.json()
+        assert len(page["items"]) <= 2
+        assert all(item["rendered_prompt"] is None for item in page["items"])
+        seen.extend(item["id"] for item in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert seen == [str(r.id) for r in records]
+
+    r = await client.get(
+        "/api/v1/audit",
+        params={
+            "personality_hash": "search-p0",
+            "engine_version": "e1",
+            "created_from": "2092-01-01T01:00:00Z",
+            "created_to": "2092-01-01T04:00:00Z",
+            "include_prompt": True,
+        },
+    )
+    assert r.status_code == status.HTTP_200_OK, r.text
+    assert [(item["id"], item["rendered_prompt"]) for item in r.json()["items"]] == [
+        (str(records[2].id), "text 0")
+    ]
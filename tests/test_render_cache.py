@@ -0,0 +1,116 @@
+"""
+Distributed render cache (Redis).
+
+Round trip, pipelined batch lookups, DB-free hits, content-keyed sharing.
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from redis.asyncio import ConnectionPool, Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hnh_rest.services.prompts.plan_cache import CompiledPlan, put_plan
+from hnh_rest.services.prompts.render_cache import RedisRenderCache
+from hnh_rest.services.prompts.renderer import (
+    BundleUnsupportedModelError,
+    RendererService,
+    compute_bundle_hash,
+    compute_content_hash,
+    compute_plan_hash,
+    render_hashes,
+)
+
+
+@pytest.mark.anyio
+async def test_render_cache_round_trip_and_batch_order(
+    fake_redis_pool: ConnectionPool,
+) -> None:
+    """
+    Stored renders come back intact.
+
+    get_many preserves order and reports misses as None.
+    """
+    cache = RedisRenderCache(fake_redis_pool, ttl_seconds=60)
+    await cache.set_many([("plan1", "p1", "prompt one"), ("plan2", "p2", "prompt two")])
+
+    assert await cache.get_many(
+        [("plan2", "p2"), ("missing", "p"), ("plan1", "p1")]
+    ) == [
+        "prompt two",
+        None,
+        "prompt one",
+    ]
+    assert await cache.get("plan1", "p1") == "prompt one"
+
+
+@pytest.mark.anyio
+async def test_renderer_cache_hit_skips_database(
+    fake_redis_pool: ConnectionPool,
+) -> None:
+    """
+    With the plan cached in process, a cached render never queries the session.
+
+    It is returned with its hashes.
+    """
+    cache = RedisRenderCache(fake_redis_pool, ttl_seconds=60)
+    b_hash, p_hash = render_hashes(
+        "cached-b",
+        "1.0.0",
+        semantic_traits={"a": 1},
+        activity_level=0.5,
+        stress=0.2,
+        task="t",
+    )
+    put_plan(
+        b_hash, CompiledPlan("plan", ("s", "p", "a", "t"), frozenset({"claude-3"}))
+    )
+    await cache.set("plan", p_hash, "from cache")
+
+    session = Mock(spec=AsyncSession)
+    session.execute = AsyncMock(
+        side_effect=AssertionError("cache hit must not query the database")
+    )
+    renderer = RendererService(session, render_cache=cache)
+
+    out = await renderer.render(
+        "cached-b", "1.0.0", {"a": 1}, 0.5, 0.2, "t", model_type="claude-3"
+    )
+    assert out == ("from cache", b_hash, p_hash)
+
+    with pytest.raises(BundleUnsupportedModelError):
+        await renderer.render(
+            "cached-b", "1.0.0", {"a": 1}, 0.5, 0.2, "t", model_type="gpt-4o"
+        )
+
+
+@pytest.mark.anyio
+async def test_identical_contents_share_one_cache_entry(
+    fake_redis_pool: ConnectionPool,
+) -> None:
+    """
+    Two bundle versions with the same template texts share the cached prompt.
+
+    The prompt is rendered once.
+    """
+    segments = ["S {{task}}", "P", "A", "T"]
+    plan_hash = compute_plan_hash([compute_content_hash(s) for s in segments])
+    rows = {
+        compute_bundle_hash("shared", "1.0.0"): (plan_hash, segments, []),
+        compute_bundle_hash("shared", "1.0.1"): (plan_hash, segments, []),
+    }
+    source = Mock()
+    source.get_compiled = AsyncMock(side_effect=rows.get)
+    renderer = RendererService(
+        Mock(spec=AsyncSession),
+        RedisRenderCache(fake_redis_pool, 60),
+        fast_source=source,
+    )
+
+    first = await renderer.render("shared", "1.0.0", {}, 0.5, 0.2, "go")
+    second = await renderer.render("shared", "1.0.1", {}, 0.5, 0.2, "go")
+    assert first[0] == second[0] == "S go\n\nP\n\nA\n\nT"
+    assert first[1] != second[1]
+
+    async with Redis(connection_pool=fake_redis_pool) as redis:
+        assert len(await redis.keys("hnh:render:*")) == 1
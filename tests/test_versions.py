@@ -0,0 +1,114 @@
+"""Semver keys, ranges and channels — version index resolution without a database."""
+
+import random
+
+import pytest
+
+from hnh_rest.services.prompts.versions import VersionIndex, parse_range, semver_key
+
+_ORDERED = [
+    "0.9.0",
+    "1.0.0-alpha",
+    "1.0.0-alpha.1",
+    "1.0.0-alpha.beta",
+    "1.0.0-beta",
+    "1.0.0-beta.2",
+    "1.0.0-beta.11",
+    "1.0.0-rc.1",
+    "1.0.0",
+    "1.2.0",
+    "1.2.9",
+    "1.2.10",
+    "1.10.0",
+    "2.0.0-rc.1",
+    "2.0.0",
+    "10.0.0",
+]
+
+
+def _index(
+    versions: list[str], tags: dict[str, set[str]] | None = None
+) -> VersionIndex:
+    return VersionIndex(
+        [(semver_key(v), v, frozenset((tags or {}).get(v, ()))) for v in versions]
+    )
+
+
+def test_semver_key_orders_by_semver_precedence() -> None:
+    """
+    Sorting by key gives semver precedence.
+
+    Numeric parts compare numerically; prerelease rules follow semver.org §11.
+    """
+    shuffled = _ORDERED[:]
+    random.Random(0).shuffle(shuffled)
+    assert sorted(shuffled, key=semver_key) == _ORDERED
+    assert semver_key("1.0.0+build.5") == semver_key("1.0.0")
+    with pytest.raises(ValueError):
+        semver_key("1.0")
+
+
+@pytest.mark.parametrize(
+    ("spec", "expected"),
+    [
+        ("^1.2", "1.10.0"),
+        ("^1.2.10", "1.10.0"),
+        ("~1.2", "1.2.10"),
+        ("1.2.x", "1.2.10"),
+        ("1", "1.10.0"),
+        ("^0.9", "0.9.0"),
+        (">=2.0.0", "10.0.0"),
+        ("^3", None),
+        ("stable", "10.0.0"),
+        ("latest", "10.0.0"),
+        ("rc", "2.0.0-rc.1"),
+        ("beta", "1.0.0-beta.11"),
+        ("1.0.0-alpha", "1.0.0-alpha"),
+        ("1.0.1", None),
+        ("gamma", None),
+    ],
+)
+def test_version_index_resolves_ranges_and_channels(
+    spec: str, expected: str | None
+) -> None:
+    """
+    Ranges pick the highest release inside them.
+
+    Channels pick stable, latest or a prerelease line.
+    """
+    assert _index(_ORDERED).resolve(spec) == expected
+
+
+def test_prereleases_only_match_ranges_written_with_one() -> None:
+    """
+    A plain range skips prereleases.
+
+    Latest includes them; a prerelease range admits them.
+    """
+    index = _index(["1.0.0", "1.1.0-beta.1"])
+    assert index.resolve("^1") == "1.0.0"
+    assert index.resolve("latest") == "1.1.0-beta.1"
+    assert index.resolve("^1.1.0-beta.0") == "1.1.0-beta.1"
+    assert parse_range("1.2.3") is None
+
+
+def test_model_routing_picks_newest_version_with_tag() -> None:
+    """
+    With a model_type, resolution skips versions whose tags lack it.
+
+    Exact versions must carry it.
+    """
+    index = _index(
+        ["1.0.0", "1.1.0", "1.2.0", "2.0.0-beta.1"],
+        {
+            "1.0.0": {"gpt-4o"},
+            "1.1.0": {"gpt-4o", "claude-3"},
+            "2.0.0-beta.1": {"claude-3"},
+        },
+    )
+    assert index.resolve("stable", "gpt-4o") == "1.1.0"
+    assert index.resolve("^1.0", "claude-3") == "1.1.0"
+    assert index.resolve("latest", "claude-3") == "2.0.0-beta.1"
+    assert index.resolve("1.0.0", "claude-3") is None
+    assert index.resolve("stable", "llama") is None
+    assert index.resolve("stable") == "1.2.0"